@@ -1,4 +1,22 @@
-from .base import FactorBase
-from .data_loader import DataLoader
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
 
 __all__ = ["FactorBase", "DataLoader"]
+
+# Resolved on first access so `import quantlab_factor_library` does not pull in pandas
+_LAZY = {"FactorBase": ".base", "DataLoader": ".data_loader"}
+
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if TYPE_CHECKING:
+    from .base import FactorBase
+    from .data_loader import DataLoader
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import logging
+import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Tuple
 
 import numpy as np
 import pandas as pd
 
-from .paths import factors_dir, repo_root
+from . import vectorized
+from .engine import use_fast
+from .panel import block_slices, date_blocks, newey_west_lags, panel_axes, stack_frames
+from .paths import diagnostics_dir, factors_dir
+from .profiling import stage
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +65,8 @@ def _spearman(x: pd.Series, y: pd.Series) -> float:
 
 
 def information_coefficient(factor: pd.DataFrame, fwd_returns: pd.DataFrame) -> pd.Series:
+    if use_fast():
+        return vectorized.information_coefficient(factor, fwd_returns)
     common_dates = factor.index.intersection(fwd_returns.index)
     ic = []
     for dt in common_dates:
@@ -65,12 +74,24 @@ def information_coefficient(factor: pd.DataFrame, fwd_returns: pd.DataFrame) ->
     return pd.Series(ic, index=common_dates).dropna()
 
 
+def ic_term_structure(factor: pd.DataFrame, fwd_by_horizon: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Spearman IC of one factor against several forward-return horizons (see
+    DataLoader.forward_returns_multi). The factor is aligned and ranked once and the ranks are
+    reused for every horizon. Returns a Date x horizon frame; each column matches
+    information_coefficient against that horizon's returns.
+    """
+    return vectorized.ic_term_structure(factor, fwd_by_horizon)
+
+
 def factor_autocorrelation(factor: pd.DataFrame) -> pd.Series:
     """
     Computes the lag-1 autocorrelation of the factor across time.
     Measuring how stable the factor rankings are over time.
     Lower values indicate more turnover in rankings and higher values indicate more stability.
     """
+    if use_fast():
+        return vectorized.factor_autocorrelation(factor)
     dates = factor.index
     ac = []
     ac_dates = []
@@ -85,6 +106,8 @@ def factor_monotonicity(factor: pd.DataFrame, fwd_returns: pd.DataFrame, buckets
     """
     Returns: decile_spreads (Series) and average_decile_returns (Series of mean across time per decile)
     """
+    if use_fast():
+        return vectorized.factor_monotonicity(factor, fwd_returns, buckets=buckets)
     common_dates = factor.index.intersection(fwd_returns.index)
     spreads = []
     spread_dates = []
@@ -130,36 +153,185 @@ def summarize_analytics(ic: pd.Series, ac: pd.Series, decile_spread: pd.Series,
     return summary
 
 
+def summarize_ic_term_structure(ic_ts: pd.DataFrame) -> Dict[str, float]:
+    """Registry columns mean_ic_h{n}, one per horizon."""
+    return {f"mean_ic_h{h}": ic_ts[h].mean() if ic_ts[h].notna().any() else np.nan for h in ic_ts.columns}
+
+
+def rolling_ic_stats(
+    ic_by_factor: Dict[str, pd.Series],
+    windows=(252,),
+    step: int = 21,
+) -> pd.DataFrame:
+    """
+    Rolling mean IC and IC IR (mean / std, ddof=1) over the last `window` IC observations of
+    every factor, sampled every `step` observations, for several windows in one pass.
+    Equivalent to ic.rolling(window).mean() / .std() then .iloc[::step] per factor, but all
+    factors are packed into one matrix and each window is O(n) via cumulative sums.
+    Returns a tidy frame: factor, date, window, rolling_mean_ic, rolling_ic_ir.
+    """
+    columns = ["factor", "date", "window", "rolling_mean_ic", "rolling_ic_ir"]
+    series = {name: ic.dropna() for name, ic in ic_by_factor.items() if ic is not None and not ic.dropna().empty}
+    if not series:
+        return pd.DataFrame(columns=columns)
+    names = list(series)
+    lengths = np.array([len(s) for s in series.values()])
+    n_obs = int(lengths.max())
+    vals = np.zeros((n_obs, len(names)))
+    for j, s in enumerate(series.values()):
+        vals[: len(s), j] = s.to_numpy(dtype=float)
+    # All IC dates back to back; factor j's i-th observation sits at offsets[j] + i
+    all_dates = series[names[0]].index.append([s.index for s in list(series.values())[1:]])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    observed = np.arange(n_obs)[:, None] < lengths[None, :]
+    # Centre each factor before the running sums so the variance does not cancel catastrophically
+    center = vals.sum(axis=0) / lengths
+    dev = np.where(observed, vals - center, 0.0)
+    c1 = np.vstack([np.zeros(len(names)), np.cumsum(dev, axis=0)])
+    c2 = np.vstack([np.zeros(len(names)), np.cumsum(dev * dev, axis=0)])
+    sampled = np.arange(0, n_obs, step)
+    frames = []
+    for window in windows:
+        pos = sampled[sampled >= window - 1]
+        if not len(pos):
+            continue
+        s1 = c1[pos + 1] - c1[pos + 1 - window]
+        s2 = c2[pos + 1] - c2[pos + 1 - window]
+        mean = center + s1 / window
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.maximum(s2 - s1 * s1 / window, 0.0) / (window - 1) if window > 1 else np.full_like(s1, np.nan)
+            ic_ir = mean / np.sqrt(var)
+        j, k = np.nonzero(observed[pos].T)  # factor-major, dates ascending
+        frames.append(
+            pd.DataFrame(
+                {
+                    "factor": np.asarray(names, dtype=object)[j],
+                    "date": all_dates.take(offsets[j] + pos[k]),
+                    "window": window,
+                    "rolling_mean_ic": mean[k, j],
+                    "rolling_ic_ir": ic_ir[k, j],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """
+    Exclusive advisory lock on a sidecar .lock file (no-op where fcntl is unavailable).
+    """
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - non-POSIX
+        yield
+        return
+    lock_path = path.with_name(path.name + ".lock")
+    with open(lock_path, "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _atomic_write(df: pd.DataFrame, path: Path, fmt: str = "parquet") -> None:
+    """Write to a temp file in the target directory, then rename over the target."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "csv":
+            df.to_csv(tmp, index=False)
+        else:
+            df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class RegistryWriter:
+    """
+    Buffers factor summaries and commits them to the registry in one transaction:
+    under a file lock, re-read the current registry, upsert all buffered rows, write via atomic
+    rename, then refresh the diagnostics mirrors (Parquet + CSV) once.
+    Usable as a context manager (commits on clean exit).
+    """
+
+    def __init__(self, registry_path: Path | None = None, mirror_diagnostics: bool = True):
+        self.registry_path = registry_path or factors_dir() / "factor_analytics_summary.parquet"
+        self.mirror_diagnostics = mirror_diagnostics
+        self._rows: Dict[str, dict] = {}
+
+    def add(self, factor_name: str, summary: Dict[str, float]) -> None:
+        self._rows[factor_name] = {"factor": factor_name, **summary}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def commit(self) -> Path:
+        registry = self.registry_path
+        if not self._rows:
+            return registry
+        registry.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(registry):
+            if registry.exists():
+                df = pd.read_parquet(registry)
+                df = df[~df["factor"].isin(list(self._rows))]
+            else:
+                df = pd.DataFrame(columns=["factor"])
+            new_rows = pd.DataFrame(list(self._rows.values()))
+            df = pd.concat([df, new_rows], ignore_index=True) if not df.empty else new_rows
+            _atomic_write(df, registry)
+            if self.mirror_diagnostics:
+                # Keep an in-repo reference copy for visibility/versioning (overwrites with latest).
+                # Written under the registry lock so a concurrent commit cannot leave it older.
+                ref_dir = diagnostics_dir()
+                ref_dir.mkdir(parents=True, exist_ok=True)
+                ref_parquet = ref_dir / "factor_analytics_summary.parquet"
+                ref_csv = ref_dir / "factor_analytics_summary.csv"
+                _atomic_write(df, ref_parquet)
+                _atomic_write(df, ref_csv, fmt="csv")
+                logger.info("Updated diagnostics reference registry at %s and %s", ref_parquet, ref_csv)
+        logger.info("Committed %d rows to factor registry at %s", len(self._rows), registry)
+        self._rows = {}
+        return registry
+
+    def __enter__(self) -> "RegistryWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+
 def update_registry(factor_name: str, summary: Dict[str, float], registry_path: Path | None = None) -> Path:
-    registry = registry_path or factors_dir() / "factor_analytics_summary.parquet"
-    registry.parent.mkdir(parents=True, exist_ok=True)
-    if registry.exists():
-        df = pd.read_parquet(registry)
-        df = df[df["factor"] != factor_name]
-    else:
-        df = pd.DataFrame(columns=["factor"])
-    row = {"factor": factor_name, **summary}
-    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
-    df.to_parquet(registry, index=False)
-    logger.info("Updated factor registry at %s", registry)
-
-    # Keep an in-repo reference copy for visibility/versioning (overwrites with latest).
-    ref_dir = repo_root() / "diagnostics"
-    ref_dir.mkdir(parents=True, exist_ok=True)
-    ref_parquet = ref_dir / "factor_analytics_summary.parquet"
-    ref_csv = ref_dir / "factor_analytics_summary.csv"
-    df.to_parquet(ref_parquet, index=False)
-    df.to_csv(ref_csv, index=False)
-    logger.info("Updated diagnostics reference registry at %s and %s", ref_parquet, ref_csv)
-    return registry
+    """
+    Upsert a single factor row. Prefer RegistryWriter when writing many factors in one run.
+    """
+    writer = RegistryWriter(registry_path=registry_path)
+    writer.add(factor_name, summary)
+    return writer.commit()
 
 
 def save_diagnostics(diagnostics: list[dict], path: Path | None = None) -> Path:
     """
-    Legacy helper (no-op now). Kept for backward compatibility.
+    Write per-stage instrumentation records (see profiling.RECORDER) to factor_step_diagnostics,
+    with diagnostics copies (Parquet + CSV). Nothing is written when there are no records, so an
+    uninstrumented run leaves the previous file in place.
     """
     out_path = path or factors_dir() / "factor_step_diagnostics.parquet"
-    logger.info("save_diagnostics skipped (step diagnostics disabled).")
+    if not diagnostics:
+        logger.info("save_diagnostics skipped (no step records; enable instrumentation to collect them).")
+        return out_path
+    df = pd.DataFrame(diagnostics)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(out_path, index=False)
+    ref_dir = diagnostics_dir()
+    ref_dir.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(ref_dir / out_path.name, index=False)
+    df.to_csv(ref_dir / f"{out_path.stem}.csv", index=False)
+    logger.info("Saved %d step diagnostics to %s and diagnostics/%s.(parquet,csv)", len(df), out_path, out_path.stem)
     return out_path
 
 
@@ -174,31 +346,51 @@ def compute_all_analytics(
     top_pct: float = 0.1,
     bottom_pct: float = 0.1,
     ff_factors: pd.DataFrame | None = None,
+    registry_writer: RegistryWriter | None = None,
+    horizon_returns: Dict[int, pd.DataFrame] | None = None,
 ) -> dict:
     """
     Convenience wrapper: compute IC, autocorrelation, monotonicity and summary.
+    With horizon_returns ({horizon: fwd returns}), also the IC term structure (mean_ic_h{n}).
     Optionally run a simple long-short diagnostic portfolio (equal-weighted top/bottom percentiles).
-    Optionally write summary to registry if factor_name is provided and write_registry=True.
+    Optionally write summary to registry if factor_name is provided and write_registry=True
+    (buffered into registry_writer when given, committed by the caller).
     """
-    ic = information_coefficient(factor, fwd_returns)
-    ac = factor_autocorrelation(factor)
-    decile_spread, avg_decile = factor_monotonicity(factor, fwd_returns, buckets=buckets)
+    # Fast engine: one aligned (factor, fwd_return) pair, rank matrix and sort shared by all steps
+    panel = vectorized.AnalyticsPanel(factor, fwd_returns) if use_fast() else None
+    with stage("information_coefficient", factor_name):
+        ic = panel.information_coefficient() if panel is not None else information_coefficient(factor, fwd_returns)
+    with stage("factor_autocorrelation", factor_name):
+        ac = panel.factor_autocorrelation() if panel is not None else factor_autocorrelation(factor)
+    with stage("factor_monotonicity", factor_name):
+        if panel is not None:
+            decile_spread, avg_decile = panel.factor_monotonicity(buckets)
+        else:
+            decile_spread, avg_decile = factor_monotonicity(factor, fwd_returns, buckets=buckets)
     summary = summarize_analytics(ic, ac, decile_spread, avg_decile)
-    summary.update(_data_quality_stats(factor))
+    with stage("data_quality", factor_name):
+        summary.update(_data_quality_stats(factor))
     # Add longer-window IC (12m ~ 252d) for weighting diagnostics
     ic_12m = ic.rolling(252).mean()
     summary["ic_mean_12m"] = ic_12m.iloc[-1] if len(ic_12m) else None
     summary["recent_ic_mean_60d"] = ic.rolling(60).mean().iloc[-1] if len(ic) else None
+    ic_ts = None
+    if horizon_returns:
+        with stage("ic_term_structure", factor_name):
+            ic_ts = panel.ic_term_structure(horizon_returns) if panel is not None else ic_term_structure(factor, horizon_returns)
+        summary.update(summarize_ic_term_structure(ic_ts))
 
     ls_diag: dict = {}
     if run_ls_ptf:
-        ls_diag = diagnostic_ls_backtest(
-            factor,
-            fwd_returns,
-            top_pct=top_pct,
-            bottom_pct=bottom_pct,
-            ff_factors=ff_factors,
-        )
+        with stage("diagnostic_ls_backtest", factor_name):
+            ls_diag = diagnostic_ls_backtest(
+                factor,
+                fwd_returns,
+                top_pct=top_pct,
+                bottom_pct=bottom_pct,
+                ff_factors=ff_factors,
+                ls_returns=panel.long_short_returns(top_pct, bottom_pct) if panel is not None else None,
+            )
         summary["ls_return_mean"] = ls_diag.get("ls_return_mean")
         summary["ls_return_std"] = ls_diag.get("ls_return_std")
         summary["ls_sharpe"] = ls_diag.get("ls_sharpe")
@@ -210,9 +402,13 @@ def compute_all_analytics(
             summary[f"ff_{k}"] = v
 
     if write_registry and factor_name:
-        update_registry(factor_name, summary, registry_path=registry_path)
+        if registry_writer is not None:
+            registry_writer.add(factor_name, summary)
+        else:
+            update_registry(factor_name, summary, registry_path=registry_path)
     return {
         "ic": ic,
+        "ic_term_structure": ic_ts,
         "autocorr": ac,
         "decile_spread": decile_spread,
         "avg_decile": avg_decile,
@@ -222,28 +418,163 @@ def compute_all_analytics(
     }
 
 
-def compute_factor_correlation(scores: dict[str, pd.DataFrame], method: str = "pearson") -> pd.DataFrame:
+# Streamed over date blocks in one pass
+CORRELATION_METHODS = ("pearson", "spearman_cs", "cross_sectional")
+# Need global ranks: correlated on the stacked (date, ticker) panel as before
+STACKED_CORRELATION_METHODS = ("spearman", "kendall")
+
+
+class _PairwiseMoments:
+    """
+    Running pairwise sums for K series: counts, sums, sums of squares and cross-products,
+    each restricted to rows where both members of a pair are observed.
+    """
+
+    def __init__(self, k: int):
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def update(self, x: np.ndarray, m: np.ndarray) -> None:
+        """x: (rows, K) values with 0 where missing; m: (rows, K) 0/1 observation mask."""
+        self.n += m.T @ m
+        self.sx += x.T @ m
+        self.sxx += (x * x).T @ m
+        self.sxy += x.T @ x
+
+    def corr(self) -> np.ndarray:
+        return _corr_from_moments(self.n, self.sx, self.sxx, self.sxy)
+
+
+def _corr_from_moments(n, sx, sxx, sxy) -> np.ndarray:
+    """Pearson correlation from pairwise moments; works on (K, K) or stacked (..., K, K) inputs."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_i = sx / n
+        mean_j = np.swapaxes(sx, -1, -2) / n
+        cov = sxy / n - mean_i * mean_j
+        var_i = sxx / n - mean_i**2
+        var_j = np.swapaxes(sxx, -1, -2) / n - mean_j**2
+        corr = cov / np.sqrt(var_i * var_j)
+    corr = np.where((n >= 2) & (var_i > 0) & (var_j > 0), corr, np.nan)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _percentile_ranks(x: np.ndarray) -> np.ndarray:
+    """Per-row (date) average ranks scaled to (0, 1); NaN stays NaN. x: (dates, tickers, K)."""
+    from scipy.stats import rankdata
+
+    ranks = rankdata(x, axis=1, nan_policy="omit")
+    counts = np.sum(~np.isnan(x), axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (ranks - 0.5) / counts
+
+
+def compute_factor_correlations(
+    scores: dict[str, pd.DataFrame],
+    methods: tuple[str, ...] = ("pearson",),
+    pairwise: bool = False,
+    block_size: int = 63,
+) -> Dict[str, pd.DataFrame]:
     """
-    Compute factor correlation matrix by stacking each factor (date x ticker) and correlating overlaps.
+    Streaming factor correlation matrices over (date, ticker) observations.
+    Walks date blocks, stacking only the block slice of each factor, and accumulates sums,
+    cross-products and pairwise counts, so peak memory is O(block_size * tickers * K).
+    methods (all computed in the same pass):
+      - pearson: pooled Pearson over all (date, ticker) cells
+      - spearman_cs: pooled Pearson over per-date percentile ranks
+      - cross_sectional: mean over dates of the per-date cross-sectional Pearson correlation
+      - spearman, kendall: pandas rank correlations over all pooled (date, ticker) cells; these
+        need global ranks, so they stack the full panels (not streamed)
+    pairwise=False keeps only cells where every factor is observed (complete cases, as the stacked
+    inner join did); pairwise=True uses every cell where both factors of a pair are observed.
+    Returns {method: factor x factor DataFrame}.
     """
+    supported = CORRELATION_METHODS + STACKED_CORRELATION_METHODS
+    unknown = [m for m in methods if m not in supported]
+    if unknown:
+        raise ValueError(f"Unsupported correlation methods {unknown}; choose from {supported}")
     if not scores:
-        return pd.DataFrame()
-    stacked = []
-    for name, df in scores.items():
-        series = df.stack().rename(name)
-        stacked.append(series)
-    aligned = pd.concat(stacked, axis=1, join="inner").dropna(how="all")
+        return {m: pd.DataFrame() for m in methods}
+    requested = tuple(methods)
+    stacked = {m: _stacked_correlation(scores, m, pairwise) for m in methods if m in STACKED_CORRELATION_METHODS}
+    methods = tuple(m for m in methods if m not in STACKED_CORRELATION_METHODS)
+    if not methods:
+        return stacked
+    names = list(scores)
+    k = len(names)
+    dates, tickers = panel_axes(scores)
+    pooled = {m: _PairwiseMoments(k) for m in methods if m in ("pearson", "spearman_cs")}
+    cs_sum = np.zeros((k, k))
+    cs_count = np.zeros((k, k))
+
+    for block in date_blocks(dates, block_size):
+        x = stack_frames(block_slices(scores, block), block, tickers)
+        obs = ~np.isnan(x)
+        if not pairwise:
+            obs &= obs.all(axis=2, keepdims=True)
+            x = np.where(obs, x, np.nan)
+        if not obs.any():
+            continue
+        m = obs.astype(float)
+        xz = np.where(obs, x, 0.0)
+        if "pearson" in pooled:
+            pooled["pearson"].update(xz.reshape(-1, k), m.reshape(-1, k))
+        if "spearman_cs" in pooled:
+            rz = np.nan_to_num(_percentile_ranks(x))
+            pooled["spearman_cs"].update(rz.reshape(-1, k), m.reshape(-1, k))
+        if "cross_sectional" in methods:
+            mt = m.transpose(0, 2, 1)
+            xt = xz.transpose(0, 2, 1)
+            per_date = _corr_from_moments(mt @ m, xt @ m, (xt * xt) @ m, xt @ xz)
+            ok = ~np.isnan(per_date)
+            cs_sum += np.where(ok, per_date, 0.0).sum(axis=0)
+            cs_count += ok.sum(axis=0)
+
+    out: Dict[str, pd.DataFrame] = dict(stacked)
+    for method in methods:
+        if method == "cross_sectional":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mat = np.where(cs_count > 0, cs_sum / cs_count, np.nan)
+        else:
+            mat = pooled[method].corr()
+        if np.isnan(mat).all():
+            out[method] = pd.DataFrame()
+            continue
+        np.fill_diagonal(mat, np.where(np.isnan(np.diag(mat)), np.nan, 1.0))
+        out[method] = pd.DataFrame(mat, index=names, columns=names)
+    return {m: out[m] for m in requested}
+
+
+def _stacked_correlation(scores: dict[str, pd.DataFrame], method: str, pairwise: bool) -> pd.DataFrame:
+    """DataFrame.corr(method) over each factor's stacked (date, ticker) cells (complete cases unless pairwise)."""
+    stacked = [df.stack().rename(name) for name, df in scores.items()]
+    aligned = pd.concat(stacked, axis=1, join="outer" if pairwise else "inner").dropna(how="all")
     if aligned.empty:
         return pd.DataFrame()
     return aligned.corr(method=method)
 
 
+def compute_factor_correlation(
+    scores: dict[str, pd.DataFrame],
+    method: str = "pearson",
+    pairwise: bool = False,
+    block_size: int = 63,
+) -> pd.DataFrame:
+    """
+    Compute factor correlation matrix over overlapping (date, ticker) observations.
+    Streams date blocks instead of stacking full panels for the methods that allow it; see
+    compute_factor_correlations.
+    """
+    return compute_factor_correlations(scores, methods=(method,), pairwise=pairwise, block_size=block_size)[method]
+
+
 def save_correlation_matrix(corr: pd.DataFrame, path: Path | None = None, ref_name: str = "factor_correlation") -> Path:
     out_path = path or factors_dir() / f"{ref_name}.parquet"
     out_path.parent.mkdir(parents=True, exist_ok=True)
     corr.to_parquet(out_path)
     # Reference copies for quick inspection (Parquet + CSV) in diagnostics
-    ref_dir = repo_root() / "diagnostics"
+    ref_dir = diagnostics_dir()
     ref_dir.mkdir(parents=True, exist_ok=True)
     corr.to_parquet(ref_dir / f"{ref_name}.parquet")
     corr.to_csv(ref_dir / f"{ref_name}.csv")
@@ -263,6 +594,8 @@ def long_short_returns(
     """
     if top_pct <= 0 or bottom_pct <= 0 or top_pct + bottom_pct >= 1:
         raise ValueError("top_pct and bottom_pct must be > 0 and sum to < 1.")
+    if use_fast():
+        return vectorized.long_short_returns(factor, fwd_returns, top_pct=top_pct, bottom_pct=bottom_pct)
 
     common_dates = factor.index.intersection(fwd_returns.index)
     ls_ret: list[float] = []
@@ -320,12 +653,16 @@ def diagnostic_ls_backtest(
     top_pct: float = 0.1,
     bottom_pct: float = 0.1,
     ff_factors: pd.DataFrame | None = None,
+    ls_returns: pd.Series | None = None,
 ) -> dict:
     """
     Lightweight diagnostic: equal-weighted long-short portfolio using percentiles.
     Returns LS time series, Sharpe, max drawdown, and optional FF regression.
+    ls_returns: precomputed long_short_returns(factor, fwd_returns, top_pct, bottom_pct).
     """
-    ls = long_short_returns(factor, fwd_returns, top_pct=top_pct, bottom_pct=bottom_pct)
+    ls = ls_returns
+    if ls is None:
+        ls = long_short_returns(factor, fwd_returns, top_pct=top_pct, bottom_pct=bottom_pct)
     ls_mean = ls.mean()
     ls_std = ls.std(ddof=1)
     ls_sharpe = sharpe_ratio(ls)
@@ -346,55 +683,136 @@ def diagnostic_ls_backtest(
     }
 
 
+FF_REGRESSORS = ["mktrf", "smb", "hml", "rmw", "cma", "umd"]
+
+
+def _ff_design(ff_factors: pd.DataFrame) -> pd.DataFrame:
+    """
+    Numeric FF regressor frame (lowercased columns, rows with any NaN dropped), built once per call.
+    """
+    ff = ff_factors.rename(columns=str.lower)
+    cols = [c for c in FF_REGRESSORS if c in ff.columns]
+    if not cols:
+        return pd.DataFrame()
+    return ff[cols].apply(pd.to_numeric, errors="coerce").dropna().sort_index()
+
+
+def _hac_cov(X: np.ndarray, resid: np.ndarray, xtx_inv: np.ndarray, lags: int) -> np.ndarray:
+    """Newey-West (Bartlett) sandwich covariance for one series."""
+    Z = X * resid[:, None]
+    S = Z.T @ Z
+    for lag in range(1, lags + 1):
+        w = 1.0 - lag / (lags + 1.0)
+        G = Z[lag:].T @ Z[:-lag]
+        S += w * (G + G.T)
+    return xtx_inv @ S @ xtx_inv
+
+
+def regress_on_ff_batch(
+    ls_returns: Dict[str, pd.Series],
+    ff_factors: pd.DataFrame,
+    hac: bool = False,
+    hac_lags: int | None = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Regress many long-short series on the same FF factors (mktrf, smb, hml, rmw, cma, umd) at once.
+    The series are stacked into a matrix Y over the shared design X. Series with identical NaN
+    patterns are grouped; each group's design is QR-factorized once and solved for all its columns.
+    hac=True replaces OLS standard errors with Newey-West HAC errors (hac_lags defaults to the
+    Newey-West plug-in lag length).
+    Returns {name: {alpha, t_alpha, p_alpha, beta_<f>, t_<f>, p_<f>, ...}} ({} when no overlap).
+    """
+    out: Dict[str, Dict[str, float]] = {name: {} for name in ls_returns}
+    if not ls_returns or ff_factors is None or ff_factors.empty:
+        return out
+    design = _ff_design(ff_factors)
+    if design.empty:
+        return out
+    series = {n: pd.to_numeric(s, errors="coerce") for n, s in ls_returns.items() if s is not None and not s.empty}
+    if not series:
+        return out
+    Y = pd.concat(series, axis=1)
+    Y = Y.loc[Y.index.intersection(design.index)].sort_index()
+    if Y.empty:
+        return out
+    X_all = np.column_stack([np.ones(len(Y)), design.loc[Y.index].to_numpy(dtype=float)])
+    Y_all = Y.to_numpy(dtype=float)
+    cols = list(design.columns)
+    mask = ~np.isnan(Y_all)
+
+    from scipy import stats  # expect scipy to be available; surface error if not
+
+    groups: Dict[bytes, list[int]] = {}
+    for j in range(Y_all.shape[1]):
+        if mask[:, j].any():
+            groups.setdefault(np.packbits(mask[:, j]).tobytes(), []).append(j)
+
+    for idx in groups.values():
+        rows = mask[:, idx[0]]
+        X = X_all[rows]
+        Yg = Y_all[rows][:, idx]
+        n, k = X.shape
+        Q, R = np.linalg.qr(X)
+        diag = np.abs(np.diag(R))
+        if n >= k and diag.min() > diag.max() * 1e-12:
+            beta = np.linalg.solve(R, Q.T @ Yg)
+            r_inv = np.linalg.inv(R)
+            xtx_inv = r_inv @ r_inv.T
+        else:
+            beta = np.linalg.lstsq(X, Yg, rcond=None)[0]
+            xtx_inv = np.linalg.pinv(X.T @ X)
+        resids = Yg - X @ beta
+        dof = max(n - k, 1)
+        if hac:
+            lags = newey_west_lags(n) if hac_lags is None else int(hac_lags)
+            se = np.column_stack([np.sqrt(np.diag(_hac_cov(X, resids[:, c], xtx_inv, lags))) for c in range(len(idx))])
+        else:
+            sigma2 = (resids**2).sum(axis=0) / dof
+            se = np.sqrt(np.diag(xtx_inv)[:, None] * sigma2[None, :])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tstats = beta / se
+        pvals = 2 * stats.t.sf(np.abs(tstats), df=dof)
+        for c, j in enumerate(idx):
+            res = {"alpha": beta[0, c], "t_alpha": tstats[0, c], "p_alpha": pvals[0, c]}
+            for i, col in enumerate(cols, start=1):
+                res[f"beta_{col}"] = beta[i, c]
+                res[f"t_{col}"] = tstats[i, c]
+                res[f"p_{col}"] = pvals[i, c]
+            out[Y.columns[j]] = res
+    return out
+
+
 def regress_on_ff(ls_returns: pd.Series, ff_factors: pd.DataFrame) -> Dict[str, float]:
     """
     Regress long-short returns on FF factors (mktrf, smb, hml, rmw, cma, umd).
     Returns alpha, betas, and t-stats (p-values when scipy is available).
+    Single-series wrapper around regress_on_ff_batch.
     """
     if ls_returns.empty or ff_factors.empty:
         return {}
-    y = pd.to_numeric(ls_returns, errors="coerce").dropna().sort_index()
-    ff = ff_factors.copy()
-    ff.columns = [c.lower() for c in ff.columns]
-    cols = [c for c in ["mktrf", "smb", "hml", "rmw", "cma", "umd"] if c in ff.columns]
-    if not cols:
-        return {}
-    df = ff[cols].apply(pd.to_numeric, errors="coerce")
-    df = df.loc[df.index.intersection(y.index)]
-    y = y.loc[y.index.intersection(df.index)]
-    if y.empty or df.empty:
-        return {}
-    # Drop any remaining rows with NaNs to avoid dtype issues
-    aligned = pd.concat([y, df], axis=1, join="inner").dropna()
-    if aligned.empty:
-        return {}
-    y = aligned.iloc[:, 0]
-    X = aligned.iloc[:, 1:].values.astype(float)
-    X = np.column_stack([np.ones(len(X)), X]).astype(float)  # add intercept
-    beta, *_ = np.linalg.lstsq(X, y.values, rcond=None)
-
-    # Compute standard errors and t-stats
-    n, k = X.shape
-    resids = y.values - X @ beta
-    dof = max(n - k, 1)
-    sigma2 = np.dot(resids, resids) / dof
-    xtx_inv = np.linalg.pinv(X.T @ X)
-    se = np.sqrt(np.diag(sigma2 * xtx_inv))
-    tstats = beta / se
+    return regress_on_ff_batch({"ls": ls_returns}, ff_factors)["ls"]
 
-    from scipy import stats  # expect scipy to be available; surface error if not
-    pvals = 2 * (1 - stats.t.cdf(np.abs(tstats), df=dof))
 
-    res = {
-        "alpha": beta[0],
-        "t_alpha": tstats[0],
-        "p_alpha": pvals[0],
-    }
-    for i, col in enumerate(cols, start=1):
-        res[f"beta_{col}"] = beta[i]
-        res[f"t_{col}"] = tstats[i]
-        res[f"p_{col}"] = pvals[i]
-    return res
+def attach_ff_regressions(
+    analytics: Dict[str, dict],
+    ff_factors: pd.DataFrame | None,
+    hac: bool = False,
+) -> Dict[str, dict]:
+    """
+    Run one batched FF regression over the LS series of many compute_all_analytics results
+    (computed with ff_factors=None) and merge ff_* keys into each summary in place.
+    """
+    if ff_factors is None:
+        return analytics
+    ls = {name: res.get("ls_returns") for name, res in analytics.items() if res.get("ls_returns") is not None}
+    regs = regress_on_ff_batch(ls, ff_factors, hac=hac)
+    for name, reg in regs.items():
+        res = analytics[name]
+        res["ff_regression"] = reg
+        summary = res.setdefault("summary", {})
+        for k, v in reg.items():
+            summary[f"ff_{k}"] = v
+    return analytics
 
 
 def corr_with_ff(ls_returns: dict[str, pd.Series], ff_factors: pd.DataFrame, method: str = "pearson") -> pd.DataFrame:
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 import abc
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import lru_cache
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import pandas as pd
 
 from . import transforms
+from .profiling import factor_scope, stage
 from .paths import repo_root
+from .scheduler import MemoryBudget, iter_post_processed
 
 
 @lru_cache(maxsize=1)
@@ -42,12 +47,51 @@ def factor_setting(name: str, cls_name: str, key: str, default=None):
     return ov.get(key, defaults.get(key, default))
 
 
+# Post-processed raw panels keyed by (factor class, parameters, data fingerprint); LRU-bounded
+_POST_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_POST_CACHE_LOCK = threading.Lock()
+
+CLEAN_SETTINGS = ("winsor_limits", "min_coverage", "fill_method", "neutralize_method")
+
+
+def clear_post_process_cache() -> None:
+    with _POST_CACHE_LOCK:
+        _POST_CACHE.clear()
+
+
+def _post_cache_size() -> int:
+    return int(_factor_config().get("post_process_cache_size", 4))
+
+
+def _ticker_partition() -> tuple[int, int | None, str]:
+    """(block_size, max_workers, executor) from "ticker_partition" in config; block_size 0 disables it."""
+    cfg = _factor_config().get("ticker_partition") or {}
+    return int(cfg.get("block_size", 0) or 0), cfg.get("max_workers"), cfg.get("executor", "thread")
+
+
+def _post_process_block(factor: "FactorBase", data_loader) -> pd.DataFrame:
+    """compute_raw_factor + post_process on one restricted loader (module level so processes can run it)."""
+    with stage("compute_raw_factor"):
+        raw = factor.compute_raw_factor(data_loader)
+    with stage("post_process"):
+        return factor.post_process(raw)
+
+
 class FactorBase(abc.ABC):
     """
     Base class enforcing compute_raw_factor + post_process contract.
     """
 
     name: str = "factor_base"
+    # True when each ticker's raw values depend only on its own history (rolling time-series
+    # kernels), so compute_raw_factor + post_process can run on ticker blocks independently
+    ticker_partitionable: bool = False
+    # Shared intermediates compute_raw_factor reads via intermediates.intermediate(loader, key);
+    # the scheduler computes each once per run and frees it after its last consumer
+    inputs: tuple = ()
+    # Peak working memory of compute_raw_factor + post_process in Date x Ticker float64 panels,
+    # used by memory-budgeted scheduling (override per factor with "memory_multiplier" in config)
+    memory_multiplier: float = 4.0
 
     @abc.abstractmethod
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
@@ -57,6 +101,84 @@ class FactorBase(abc.ABC):
     def post_process(self, raw_factor: pd.DataFrame) -> pd.DataFrame:
         """Optional shifting/smoothing specific to the factor."""
 
+    def cache_key(self, data_loader) -> Optional[tuple]:
+        """
+        Identity of the post-processed panel: factor class, constructor parameters and the
+        loader's data fingerprint. None (no caching) when the loader has no fingerprint().
+        """
+        fingerprint = getattr(data_loader, "fingerprint", None)
+        if fingerprint is None:
+            return None
+        params = tuple(sorted((k, repr(v)) for k, v in vars(self).items()))
+        return (type(self).__module__, type(self).__qualname__, params, fingerprint())
+
+    def post_processed(self, data_loader, use_cache: bool = True) -> pd.DataFrame:
+        """
+        compute_raw_factor + post_process, cached (post_process_cache_size in config, default 4
+        panels) so repeated cleaning runs reuse it. Treat the returned panel as read-only.
+        """
+        key = self.cache_key(data_loader) if use_cache and _post_cache_size() > 0 else None
+        if key is not None:
+            with _POST_CACHE_LOCK:
+                if key in _POST_CACHE:
+                    _POST_CACHE.move_to_end(key)
+                    return _POST_CACHE[key]
+        if self._partitioned(data_loader):
+            block_size, max_workers, executor = _ticker_partition()
+            post = self.post_processed_by_tickers(data_loader, block_size, max_workers, executor)
+        else:
+            with stage("compute_raw_factor"):
+                raw = self.compute_raw_factor(data_loader)
+            with stage("post_process"):
+                post = self.post_process(raw)
+        if key is not None:
+            with _POST_CACHE_LOCK:
+                _POST_CACHE[key] = post
+                while len(_POST_CACHE) > _post_cache_size():
+                    _POST_CACHE.popitem(last=False)
+        return post
+
+    def _partitioned(self, data_loader) -> bool:
+        return self.ticker_partitionable and _ticker_partition()[0] > 0 and hasattr(data_loader, "restrict")
+
+    def memory_panels(self) -> float:
+        name_key = getattr(self, "name", None) or self.__class__.__name__
+        return float(factor_setting(name_key, self.__class__.__name__, "memory_multiplier", self.memory_multiplier))
+
+    def required_inputs(self, data_loader=None) -> tuple:
+        """Intermediates the scheduler should share for this factor (none when it runs on ticker blocks)."""
+        if data_loader is not None and self._partitioned(data_loader):
+            return ()
+        return tuple(self.inputs)
+
+    def post_processed_by_tickers(
+        self,
+        data_loader,
+        block_size: int,
+        max_workers: int | None = None,
+        executor: str = "thread",
+    ) -> pd.DataFrame:
+        """
+        compute_raw_factor + post_process on blocks of block_size tickers (data_loader.restrict),
+        concatenated on the ticker axis. max_workers=1 runs the blocks one after another so only
+        one block's intermediates are alive; otherwise they run in a pool, executor "thread" or
+        "process" (for kernels that hold the GIL, e.g. rolling().apply). Only valid for
+        ticker_partitionable factors; the result equals the unpartitioned panel.
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor {executor!r}; expected 'thread' or 'process'")
+        universe = data_loader.universe()
+        blocks = [universe[start : start + block_size] for start in range(0, len(universe), block_size)] or [universe]
+        loaders = [data_loader.restrict(tickers) for tickers in blocks]
+        if max_workers == 1 or len(blocks) <= 1:
+            parts = [_post_process_block(self, loader) for loader in loaders]
+        else:
+            pool = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+            with pool(max_workers=max_workers) as ex:
+                parts = list(ex.map(_post_process_block, [self] * len(loaders), loaders))
+        parts = [part for part in parts if not part.columns.empty] or parts[:1]
+        return pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+
     def compute(
         self,
         data_loader,
@@ -65,9 +187,54 @@ class FactorBase(abc.ABC):
         min_coverage: Optional[float] = None,
         fill_method: Optional[str] = None,
         neutralize_method: Optional[str] = None,
+        use_cache: bool = True,
     ) -> pd.DataFrame:
-        raw = self.compute_raw_factor(data_loader)
-        post = self.post_process(raw)
+        name_key = getattr(self, "name", None) or self.__class__.__name__
+        with factor_scope(name_key):
+            post = self.post_processed(data_loader, use_cache=use_cache)
+            with stage("clean_factor"):
+                return self._clean(post, sector_map, winsor_limits, min_coverage, fill_method, neutralize_method)
+
+    def compute_variants(
+        self,
+        data_loader,
+        settings_list: Iterable[dict],
+        sector_map: Optional[pd.Series] = None,
+        parallel: bool = False,
+        max_workers: int | None = None,
+    ) -> list[pd.DataFrame]:
+        """
+        Clean one post-processed panel under several settings, e.g.
+        [{"neutralize_method": "sector"}, {"neutralize_method": "global"}, {"winsor_limits": (0.05, 0.95)}].
+        Keys are CLEAN_SETTINGS; missing keys fall back to overrides/defaults like compute(), and
+        neutralize_method "none" / fill_method "none" disable that step. Results keep input order.
+        """
+        settings_list = [dict(s) for s in settings_list]
+        for settings in settings_list:
+            unknown = set(settings) - set(CLEAN_SETTINGS)
+            if unknown:
+                raise ValueError(f"Unknown cleaning settings {sorted(unknown)}; expected {CLEAN_SETTINGS}")
+        name_key = getattr(self, "name", None) or self.__class__.__name__
+        with factor_scope(name_key):
+            post = self.post_processed(data_loader)
+
+            def _variant(settings: dict) -> pd.DataFrame:
+                with factor_scope(name_key), stage("clean_factor"):
+                    return self._clean(post, sector_map, **{k: settings.get(k) for k in CLEAN_SETTINGS})
+
+            if parallel and len(settings_list) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as ex:
+                    return list(ex.map(_variant, settings_list))
+            return [_variant(settings) for settings in settings_list]
+
+    def clean_settings(
+        self,
+        winsor_limits: Optional[tuple[float, float]] = None,
+        min_coverage: Optional[float] = None,
+        fill_method: Optional[str] = None,
+        neutralize_method: Optional[str] = None,
+    ) -> dict:
+        """Resolve cleaning settings: arguments, then factor_overrides, then factor_defaults."""
         cfg = _factor_config()
         defaults = cfg.get("factor_defaults", {})
         overrides = cfg.get("factor_overrides", {})
@@ -90,12 +257,98 @@ class FactorBase(abc.ABC):
             if neutralize_method is not None
             else (ov or {}).get("neutralize_method", defaults.get("neutralize_method", "sector"))
         )
-        cleaned = transforms.clean_factor(
-            post,
-            sector_map=sector_map,
-            winsor_limits=wl,
-            min_coverage=mc,
-            fill_method=fm,
-            neutralize_method=nm,
-        )
-        return cleaned
+        return {"winsor_limits": wl, "min_coverage": mc, "fill_method": fm, "neutralize_method": nm}
+
+    def _clean(
+        self,
+        post: pd.DataFrame,
+        sector_map: Optional[pd.Series],
+        winsor_limits: Optional[tuple[float, float]],
+        min_coverage: Optional[float],
+        fill_method: Optional[str],
+        neutralize_method: Optional[str],
+    ) -> pd.DataFrame:
+        settings = self.clean_settings(winsor_limits, min_coverage, fill_method, neutralize_method)
+        return transforms.clean_factor(post, sector_map=sector_map, **settings)
+
+
+# Panels a finished factor holds until its cleaned panel has been consumed: the post-processed
+# panel, its slice of the stacked clean tensor (the K slices together are the whole tensor, freed
+# when clean_factors returns since the cleaned panels are copies) and the cleaned output
+_CLEAN_HOLD_PANELS = 3.0
+
+
+def iter_compute_batch(
+    factors: Iterable[FactorBase],
+    data_loader,
+    sector_map: Optional[pd.Series] = None,
+    parallel: bool = False,
+    max_workers: int | None = None,
+    batch_size: int | None = None,
+    budget_bytes: int | None = None,
+    use_cache: bool = True,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    compute() for several factors with batched cleaning (transforms.clean_factors). Post-processed
+    panels come from scheduler.iter_post_processed (shared intermediates computed once; threaded
+    when parallel=True; admitted within budget_bytes when given) and are cleaned batch_size at a
+    time as they complete (all at once when None), each with its resolved clean_settings().
+    Yields (factor name, cleaned panel) batch by batch.
+
+    Under budget_bytes each finished factor stays charged _CLEAN_HOLD_PANELS panels until the
+    caller has taken its cleaned panel (the generator resumed), so panels waiting for their batch
+    and the clean tensor count against the budget. use_cache=False bypasses the post-process
+    cache, whose panels are not budgeted.
+    """
+    factors = list(factors)
+    by_name = {getattr(f, "name", None) or f.__class__.__name__: f for f in factors}
+    budget = MemoryBudget(budget_bytes)
+    panel_bytes = None
+    if budget_bytes is not None:
+        n_dates, n_tickers = data_loader.panel_shape()
+        panel_bytes = n_dates * n_tickers * 8
+    hold_bytes = _CLEAN_HOLD_PANELS * (panel_bytes or 0)
+    pending: dict[str, pd.DataFrame] = {}
+
+    def _flush() -> Iterator[tuple[str, pd.DataFrame]]:
+        with stage("clean_factors"):
+            cleaned = transforms.clean_factors(
+                pending,
+                settings={name: by_name[name].clean_settings() for name in pending},
+                sector_map=sector_map,
+            )
+        pending.clear()
+        while cleaned:
+            name = next(iter(cleaned))
+            yield name, cleaned.pop(name)
+            budget.release(hold_bytes)
+
+    posts = iter_post_processed(
+        factors,
+        data_loader,
+        max_workers=max_workers if parallel else 1,
+        budget=budget,
+        panel_bytes=panel_bytes,
+        hold_panels=_CLEAN_HOLD_PANELS,
+        use_cache=use_cache,
+    )
+    for name, post in posts:
+        pending[name] = post
+        if batch_size and len(pending) >= batch_size:
+            yield from _flush()
+    if pending:
+        yield from _flush()
+
+
+def compute_batch(
+    factors: Iterable[FactorBase],
+    data_loader,
+    sector_map: Optional[pd.Series] = None,
+    parallel: bool = False,
+    max_workers: int | None = None,
+    batch_size: int | None = None,
+) -> dict[str, pd.DataFrame]:
+    """iter_compute_batch collected into {factor name: cleaned panel} in factor order."""
+    factors = list(factors)
+    cleaned = dict(iter_compute_batch(factors, data_loader, sector_map, parallel, max_workers, batch_size))
+    return {name: cleaned[name] for name in (getattr(f, "name", None) or f.__class__.__name__ for f in factors)}
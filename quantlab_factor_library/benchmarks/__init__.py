@@ -0,0 +1,11 @@
+from .synthetic import SyntheticSpec, generate_synthetic_data
+from .suite import BenchmarkResult, BenchmarkSuite, compare_results, run_benchmarks
+
+__all__ = [
+    "SyntheticSpec",
+    "generate_synthetic_data",
+    "BenchmarkResult",
+    "BenchmarkSuite",
+    "compare_results",
+    "run_benchmarks",
+]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from .suite import GROUPS, compare_results, run_benchmarks
+from .synthetic import SyntheticSpec
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m quantlab_factor_library.benchmarks",
+        description="Run the synthetic-data benchmark suite and write JSON results.",
+    )
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path, default=None, help="reuse existing (synthetic or real) data")
+    parser.add_argument("--groups", nargs="+", default=list(GROUPS), choices=GROUPS)
+    parser.add_argument("--factors", nargs="+", default=None, help="subset of default factor names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--factor-repeat", type=int, default=1)
+    parser.add_argument("--out", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--compare", type=Path, default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    report = run_benchmarks(
+        out_path=args.out,
+        groups=args.groups,
+        spec=SyntheticSpec(n_tickers=args.tickers, n_years=args.years, seed=args.seed),
+        data_dir=args.data_dir,
+        repeat=args.repeat,
+        factor_repeat=args.factor_repeat,
+        factor_names=args.factors,
+    )
+    if args.compare is not None:
+        cmp = compare_results(args.compare, report, threshold=args.threshold)
+        print(cmp.to_string(float_format=lambda v: f"{v:.4f}"))
+        n_reg = int(cmp["regression"].sum())
+        if n_reg:
+            raise SystemExit(f"{n_reg} scenario(s) slower than baseline by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .. import analytics, transforms
+from ..data_loader import DataLoader
+from ..engine import use_engine
+from ..factor_definitions import get_default_factors
+from ..paths import diagnostics_dir, final_data_dir
+from .synthetic import SyntheticSpec, generate_synthetic_data
+
+logger = logging.getLogger(__name__)
+
+
+def _as_float_frame(obj) -> pd.DataFrame:
+    df = obj.to_frame() if isinstance(obj, pd.Series) else obj
+    return df.astype(object).where(df.notna(), np.nan).astype(float)
+
+
+def compare_outputs(ref, fast, rtol: float = 1e-9, atol: float = 1e-12) -> dict:
+    """
+    Compare two outputs (DataFrame, Series or a tuple of them) cell by cell on the reference
+    labels: label mismatches, NaN-mask mismatches and max abs/relative differences on cells
+    finite in both. `passed` requires identical labels and NaN masks and |d| <= atol + rtol*|ref|.
+    """
+    if isinstance(ref, tuple):
+        parts = [compare_outputs(r, f, rtol=rtol, atol=atol) for r, f in zip(ref, fast)]
+        return {
+            "labels_match": all(p["labels_match"] for p in parts),
+            "n_cells": sum(p["n_cells"] for p in parts),
+            "nan_mismatch": sum(p["nan_mismatch"] for p in parts),
+            "max_abs_diff": max(p["max_abs_diff"] for p in parts),
+            "max_rel_diff": max(p["max_rel_diff"] for p in parts),
+            "passed": all(p["passed"] for p in parts),
+        }
+    r, f = _as_float_frame(ref), _as_float_frame(fast)
+    labels_match = r.index.equals(f.index) and r.columns.equals(f.columns)
+    f = f.reindex(index=r.index, columns=r.columns)
+    a, b = r.to_numpy(), f.to_numpy()
+    nan_mismatch = int((np.isnan(a) != np.isnan(b)).sum())
+    both = np.isfinite(a) & np.isfinite(b)
+    diff = np.abs(a - b)[both]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rel = diff / np.abs(a[both])
+    rel = rel[np.isfinite(rel)]
+    max_abs = float(diff.max()) if diff.size else 0.0
+    max_rel = float(rel.max()) if rel.size else 0.0
+    within = bool((diff <= atol + rtol * np.abs(a[both])).all())
+    return {
+        "labels_match": labels_match,
+        "n_cells": int(a.size),
+        "nan_mismatch": nan_mismatch,
+        "max_abs_diff": max_abs,
+        "max_rel_diff": max_rel,
+        "passed": labels_match and nan_mismatch == 0 and within,
+    }
+
+
+def _all_analytics(factor: pd.DataFrame, fwd: pd.DataFrame) -> tuple:
+    """compute_all_analytics outputs as a tuple of frames/series compare_outputs understands."""
+    res = analytics.compute_all_analytics(factor, fwd)
+    summary = pd.Series(res["summary"], dtype=float)
+    return res["ic"], res["autocorr"], res["decile_spread"], res["avg_decile"], res["ls_returns"], summary
+
+
+def _check(rows: list, dataset: str, factor: str, function: str, fn: Callable, rtol: float, atol: float) -> None:
+    """Run fn under both engines and append the comparison; failures are reported, not raised."""
+    try:
+        with use_engine("reference"):
+            ref = fn()
+        with use_engine("fast"):
+            fast = fn()
+        res = compare_outputs(ref, fast, rtol=rtol, atol=atol)
+        res["error"] = None
+    except Exception as exc:
+        logger.warning("Equivalence check %s/%s failed: %s", factor, function, exc)
+        res = {"passed": False, "error": repr(exc)}
+    rows.append({"dataset": dataset, "factor": factor, "function": function, **res})
+
+
+def check_panels(
+    loader: DataLoader,
+    dataset: str,
+    factor_names: Optional[Iterable[str]] = None,
+    rtol: float = 1e-9,
+    atol: float = 1e-12,
+) -> pd.DataFrame:
+    """
+    For every default factor (or the named subset): each transform on the factor's post-processed
+    panel, the full compute(), and the analytics on the cleaned factor, reference vs fast.
+    """
+    sector_map = loader.load_sector_map()
+    fwd = loader.forward_returns(loader.load_price_wide(dataset="price_daily"))
+    rows: list[dict] = []
+    for factor in get_default_factors(factor_names):
+        name = factor.name
+        logger.info("Checking %s (%s)", name, dataset)
+        try:
+            raw = factor.post_process(factor.compute_raw_factor(loader))
+        except Exception as exc:
+            rows.append({"dataset": dataset, "factor": name, "function": "compute_raw_factor", "passed": False, "error": repr(exc)})
+            continue
+        checks = {
+            "winsorize": lambda: transforms.winsorize(raw),
+            "zscore": lambda: transforms.zscore(raw),
+            "sector_neutralize": lambda: transforms.sector_neutralize(raw, sector_map),
+            "neutralize_global": lambda: transforms.neutralize_factor(raw, "global"),
+            "fill_factor_median": lambda: transforms.fill_factor(raw, "median"),
+            "fill_factor_sector_median": lambda: transforms.fill_factor(raw, "sector_median", sector_map=sector_map),
+            "compute": lambda: factor.compute(loader, sector_map=sector_map),
+        }
+        for fn_name, fn in checks.items():
+            _check(rows, dataset, name, fn_name, fn, rtol, atol)
+
+        with use_engine("reference"):
+            cleaned = factor.compute(loader, sector_map=sector_map)
+        analytic_checks = {
+            "information_coefficient": lambda: analytics.information_coefficient(cleaned, fwd),
+            "factor_autocorrelation": lambda: analytics.factor_autocorrelation(cleaned),
+            "factor_monotonicity": lambda: analytics.factor_monotonicity(cleaned, fwd),
+            "long_short_returns": lambda: analytics.long_short_returns(cleaned, fwd),
+            "compute_all_analytics": lambda: _all_analytics(cleaned, fwd),
+        }
+        for fn_name, fn in analytic_checks.items():
+            _check(rows, dataset, name, fn_name, fn, rtol, atol)
+    return pd.DataFrame(rows)
+
+
+def sample_real_data(
+    out_dir: Path,
+    src_dir: Optional[Path] = None,
+    n_tickers: int = 200,
+    start_date=None,
+    end_date=None,
+    seed: int = 0,
+) -> Path:
+    """
+    Copy every dataset in final_data_dir() restricted to a random ticker sample (and, for daily
+    tables, a date window) so real-data equivalence runs stay small. Tables without a ticker
+    column (e.g. FAMA_FRENCH_FACTORS) are copied whole.
+    """
+    src = Path(src_dir) if src_dir is not None else final_data_dir()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prices = pd.read_parquet(src / "price_daily.parquet", columns=["ticker"])
+    universe = np.sort(prices["ticker"].dropna().unique())
+    rng = np.random.default_rng(seed)
+    sample = set(rng.choice(universe, size=min(n_tickers, len(universe)), replace=False))
+    for path in sorted(src.glob("*.parquet")):
+        df = pd.read_parquet(path)
+        key = "ticker" if "ticker" in df.columns else "Symbol" if "Symbol" in df.columns else None
+        if key is not None:
+            df = df[df[key].isin(sample)]
+        if path.stem == "price_daily" and (start_date is not None or end_date is not None):
+            d = pd.to_datetime(df["date"])
+            keep = pd.Series(True, index=df.index)
+            if start_date is not None:
+                keep &= d >= pd.Timestamp(start_date)
+            if end_date is not None:
+                keep &= d <= pd.Timestamp(end_date)
+            df = df[keep]
+        df.to_parquet(out_dir / path.name, index=False)
+    logger.info("Sampled %d tickers from %s into %s", len(sample), src, out_dir)
+    return out_dir
+
+
+def run_equivalence(
+    spec: Optional[SyntheticSpec] = None,
+    real: bool = False,
+    real_tickers: int = 200,
+    factor_names: Optional[Iterable[str]] = None,
+    rtol: float = 1e-9,
+    atol: float = 1e-12,
+    save: bool = True,
+) -> pd.DataFrame:
+    """
+    Reference vs fast engine report on synthetic data (and sampled real data when real=True).
+    Saved to diagnostics/engine_equivalence.(parquet,csv) when save=True.
+    """
+    spec = spec or SyntheticSpec(n_tickers=60, n_years=2)
+    frames = []
+    with tempfile.TemporaryDirectory(prefix="quantlab_equiv_") as tmp:
+        syn = generate_synthetic_data(Path(tmp) / "synthetic", spec)
+        frames.append(check_panels(DataLoader(data_dir=str(syn)), "synthetic", factor_names, rtol, atol))
+        if real:
+            sampled = sample_real_data(Path(tmp) / "real", n_tickers=real_tickers, seed=spec.seed)
+            frames.append(check_panels(DataLoader(data_dir=str(sampled)), "real_sample", factor_names, rtol, atol))
+    report = pd.concat(frames, ignore_index=True)
+    if save and not report.empty:
+        out = diagnostics_dir()
+        out.mkdir(parents=True, exist_ok=True)
+        report.to_parquet(out / "engine_equivalence.parquet", index=False)
+        report.to_csv(out / "engine_equivalence.csv", index=False)
+        logger.info("Saved engine equivalence report to %s/engine_equivalence.(parquet,csv)", out)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m quantlab_factor_library.benchmarks.equivalence",
+        description="Compare the fast engine against the reference implementations.",
+    )
+    parser.add_argument("--tickers", type=int, default=60)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--factors", nargs="+", default=None)
+    parser.add_argument("--real", action="store_true", help="also check a ticker sample of final_data_dir()")
+    parser.add_argument("--real-tickers", type=int, default=200)
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    parser.add_argument("--atol", type=float, default=1e-12)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    report = run_equivalence(
+        spec=SyntheticSpec(n_tickers=args.tickers, n_years=args.years, seed=args.seed),
+        real=args.real,
+        real_tickers=args.real_tickers,
+        factor_names=args.factors,
+        rtol=args.rtol,
+        atol=args.atol,
+    )
+    summary = report.groupby("function")[["max_abs_diff", "max_rel_diff", "nan_mismatch"]].max()
+    summary["failed"] = report.groupby("function")["passed"].apply(lambda s: int((~s.astype(bool)).sum()))
+    print(summary.to_string())
+    if summary["failed"].sum():
+        raise SystemExit(f"{int(summary['failed'].sum())} check(s) differ beyond tolerance; keep engine='reference'")
+
+
+if __name__ == "__main__":
+    main()
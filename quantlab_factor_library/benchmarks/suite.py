@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .. import analytics, transforms
+from ..data_loader import DataLoader
+from ..factor_definitions import DEFAULT_FACTORS, get_default_factors
+from ..paths import repo_root
+from ..profiling import RECORDER
+from .synthetic import SyntheticSpec, generate_synthetic_data
+
+logger = logging.getLogger(__name__)
+
+GROUPS = ("startup", "loader", "factors", "transforms", "analytics", "run_all")
+
+# Fresh-interpreter cold starts: bare package, one factor, the full default set
+STARTUP_SCENARIOS = {
+    "import_package": "import quantlab_factor_library",
+    "single_factor": (
+        "from quantlab_factor_library.factor_definitions import get_default_factors; "
+        "get_default_factors(['momentum_12m'])"
+    ),
+    "all_factors": (
+        "from quantlab_factor_library.factor_definitions import get_default_factors; "
+        "get_default_factors()"
+    ),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    group: str
+    name: str
+    times_s: list[float]
+    best_s: float
+    median_s: float
+    mean_s: float
+    error: Optional[str] = None
+    stages: dict = field(default_factory=dict)
+
+
+def _time(group: str, name: str, fn: Callable[[], object], repeat: int = 3, warmup: int = 0) -> BenchmarkResult:
+    """Best/median/mean wall time of fn over `repeat` runs; errors are recorded, not raised."""
+    try:
+        for _ in range(warmup):
+            fn()
+        times = []
+        for _ in range(max(repeat, 1)):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+    except Exception as exc:  # one broken scenario should not sink the suite
+        logger.warning("Benchmark %s/%s failed: %s", group, name, exc)
+        return BenchmarkResult(group, name, [], np.nan, np.nan, np.nan, error=repr(exc))
+    return BenchmarkResult(group, name, times, min(times), statistics.median(times), statistics.fmean(times))
+
+
+def _python(statement: str, *flags: str) -> subprocess.CompletedProcess:
+    """Run statement in a fresh interpreter with the repo importable."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(repo_root()), os.environ.get("PYTHONPATH")]))}
+    return subprocess.run([sys.executable, *flags, "-c", statement], capture_output=True, text=True, check=True, env=env)
+
+
+def import_profile(statement: str) -> pd.DataFrame:
+    """
+    Per-module import cost of statement in a fresh interpreter (python -X importtime):
+    module, depth (0 = imported directly by the statement), self_us, cumulative_us.
+    """
+    rows = []
+    for line in _python(statement, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append(
+            {
+                "module": module.strip(),
+                "depth": (len(module) - len(module.lstrip()) - 1) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return pd.DataFrame(rows, columns=["module", "depth", "self_us", "cumulative_us"])
+
+
+@contextmanager
+def _env(**overrides: str):
+    old = {k: os.environ.get(k) for k in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for k, v in old.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+class BenchmarkSuite:
+    """
+    Timed scenarios: cold-start imports, then on synthetic data the DataLoader, each default
+    factor (with a per-stage breakdown from profiling), each transforms step, each analytics
+    function and run_all.
+    Scenario names are stable so results from different commits can be compared with
+    compare_results.
+    """
+
+    def __init__(self, data_dir: Path, repeat: int = 3, factor_repeat: int = 1):
+        self.data_dir = Path(data_dir)
+        self.repeat = repeat
+        self.factor_repeat = factor_repeat
+        self.loader = DataLoader(data_dir=str(self.data_dir))
+        self._inputs: Optional[dict] = None
+
+    # ------------------------------------------------------------------ shared inputs
+    def inputs(self) -> dict:
+        """Price panel, forward returns, sector map, FF factors and a few cleaned factors."""
+        if self._inputs is None:
+            prices = self.loader.load_price_wide(dataset="price_daily")
+            fwd = self.loader.forward_returns(prices)
+            sector_map = self.loader.load_sector_map()
+            ff = self.loader.load_ff_factors()
+            # Raw panel with realistic gaps for the transforms scenarios: 12-1 momentum
+            raw = (prices.shift(21) / prices.shift(252) - 1).shift(1)
+            factors = {
+                f.name: f.compute(self.loader, sector_map=sector_map, use_cache=False)
+                for f in get_default_factors(list(DEFAULT_FACTORS)[:4])
+            }
+            self._inputs = {
+                "prices": prices,
+                "fwd_returns": fwd,
+                "sector_map": sector_map,
+                "ff": ff,
+                "raw": raw,
+                "factors": factors,
+            }
+        return self._inputs
+
+    # ------------------------------------------------------------------ scenarios
+    def bench_startup(self) -> list[BenchmarkResult]:
+        """
+        Cold-start wall time per STARTUP_SCENARIOS entry, with the -X importtime total and the
+        number of modules / factor modules imported as stages.
+        """
+        out = []
+        for name, statement in STARTUP_SCENARIOS.items():
+            res = _time("startup", name, lambda s=statement: _python(s), self.repeat)
+            if res.error is None:
+                prof = import_profile(statement)
+                # importlib-driven (lazy) imports are missing from -X importtime, so count sys.modules
+                counts = _python(
+                    f"{statement}; import sys; "
+                    "print(len(sys.modules), sum(m.startswith('quantlab_factor_library.factors.') for m in sys.modules))"
+                ).stdout.split()
+                res.stages = {
+                    "importtime_s": float(prof.loc[prof["depth"] == 0, "cumulative_us"].sum()) / 1e6,
+                    "modules": float(counts[0]),
+                    "factor_modules": float(counts[1]),
+                }
+            out.append(res)
+        return out
+
+    def bench_loader(self) -> list[BenchmarkResult]:
+        ld, r = self.loader, self.repeat
+        prices = ld.load_price_wide(dataset="price_daily")
+        return [
+            _time("loader", "load_long_price_daily", lambda: ld.load_long(dataset="price_daily"), r),
+            _time("loader", "load_price_wide", lambda: ld.load_price_wide(dataset="price_daily"), r),
+            _time("loader", "load_sector_map", ld.load_sector_map, r),
+            _time("loader", "load_ff_factors", ld.load_ff_factors, r),
+            _time("loader", "forward_returns", lambda: ld.forward_returns(prices), r),
+            _time(
+                "loader",
+                "load_long_balance_sheet",
+                lambda: ld.load_long(dataset="fundamentals_balance_sheet"),
+                r,
+            ),
+        ]
+
+    def bench_factors(self, names: Optional[Iterable[str]] = None) -> list[BenchmarkResult]:
+        sector_map = self.inputs()["sector_map"]
+        out = []
+        was_enabled = RECORDER.enabled
+        RECORDER.enable()
+        try:
+            for factor in get_default_factors(names):
+                RECORDER.reset()
+                res = _time(
+                    "factors",
+                    factor.name,
+                    # use_cache=False: time compute_raw_factor/post_process on every repeat, not cache hits
+                    lambda f=factor: f.compute(self.loader, sector_map=sector_map, use_cache=False),
+                    self.factor_repeat,
+                )
+                stages = pd.DataFrame(RECORDER.records())
+                if not stages.empty:
+                    per_run = stages.groupby("stage")["wall_s"].sum() / max(len(res.times_s), 1)
+                    res.stages = {k: float(v) for k, v in per_run.items()}
+                out.append(res)
+        finally:
+            RECORDER.reset()
+            if not was_enabled:
+                RECORDER.disable()
+        return out
+
+    def bench_transforms(self) -> list[BenchmarkResult]:
+        inp, r = self.inputs(), self.repeat
+        raw, sm = inp["raw"], inp["sector_map"]
+        # Each step runs on the output of the previous one, as inside clean_factor
+        covered = transforms.coverage_filter(raw, 0.3)
+        wins = transforms.winsorize(covered)
+        filled = transforms.fill_factor(wins, "median", sector_map=sm)
+        neutral = transforms.neutralize_factor(filled, "sector", sector_map=sm)
+        z = transforms.zscore(neutral)
+        return [
+            _time("transforms", "coverage_filter", lambda: transforms.coverage_filter(raw, 0.3), r),
+            _time("transforms", "winsorize", lambda: transforms.winsorize(covered), r),
+            _time("transforms", "fill_factor_median", lambda: transforms.fill_factor(wins, "median"), r),
+            _time(
+                "transforms",
+                "fill_factor_sector_median",
+                lambda: transforms.fill_factor(wins, "sector_median", sector_map=sm),
+                r,
+            ),
+            _time("transforms", "sector_neutralize", lambda: transforms.sector_neutralize(filled, sm), r),
+            _time("transforms", "neutralize_global", lambda: transforms.neutralize_factor(filled, "global"), r),
+            _time("transforms", "zscore", lambda: transforms.zscore(neutral), r),
+            _time("transforms", "drop_all_nan", lambda: transforms.drop_all_nan(z), r),
+            _time("transforms", "clean_factor", lambda: transforms.clean_factor(raw, sector_map=sm), r),
+        ]
+
+    def bench_analytics(self) -> list[BenchmarkResult]:
+        inp, r = self.inputs(), self.repeat
+        fwd, ff, factors = inp["fwd_returns"], inp["ff"], inp["factors"]
+        name, fac = next(iter(factors.items()))
+        ls = {n: analytics.long_short_returns(f, fwd) for n, f in factors.items()}
+        ic = analytics.information_coefficient(fac, fwd)
+        ac = analytics.factor_autocorrelation(fac)
+        spread, avg = analytics.factor_monotonicity(fac, fwd)
+        return [
+            _time("analytics", "information_coefficient", lambda: analytics.information_coefficient(fac, fwd), r),
+            _time("analytics", "factor_autocorrelation", lambda: analytics.factor_autocorrelation(fac), r),
+            _time("analytics", "factor_monotonicity", lambda: analytics.factor_monotonicity(fac, fwd), r),
+            _time("analytics", "summarize_analytics", lambda: analytics.summarize_analytics(ic, ac, spread, avg), r),
+            _time("analytics", "long_short_returns", lambda: analytics.long_short_returns(fac, fwd), r),
+            _time("analytics", "diagnostic_ls_backtest", lambda: analytics.diagnostic_ls_backtest(fac, fwd), r),
+            _time(
+                "analytics",
+                "compute_all_analytics",
+                lambda: analytics.compute_all_analytics(fac, fwd, factor_name=name),
+                r,
+            ),
+            _time("analytics", "regress_on_ff", lambda: analytics.regress_on_ff(ls[name], ff), r),
+            _time("analytics", "regress_on_ff_batch", lambda: analytics.regress_on_ff_batch(ls, ff), r),
+            _time("analytics", "corr_with_ff", lambda: analytics.corr_with_ff(ls, ff), r),
+            _time(
+                "analytics",
+                "compute_factor_correlations",
+                lambda: analytics.compute_factor_correlations(factors),
+                r,
+            ),
+        ]
+
+    def bench_run_all(self) -> list[BenchmarkResult]:
+        """One full run_all with all outputs redirected to a scratch directory."""
+        from ..run_factors import run_all
+
+        with tempfile.TemporaryDirectory(prefix="quantlab_bench_") as tmp:
+            with _env(
+                QUANTLAB_FINAL_DIR=str(self.data_dir),
+                QUANTLAB_FACTORS_DIR=str(Path(tmp) / "factors"),
+                QUANTLAB_DIAGNOSTICS_DIR=str(Path(tmp) / "diagnostics"),
+            ):
+                return [_time("run_all", "run_all", lambda: run_all(profile=False), 1)]
+
+    def run(self, groups: Iterable[str] = GROUPS, factor_names: Optional[Iterable[str]] = None) -> list[BenchmarkResult]:
+        results: list[BenchmarkResult] = []
+        for group in groups:
+            if group not in GROUPS:
+                raise ValueError(f"Unknown benchmark group {group!r}; expected one of {GROUPS}")
+            logger.info("Running benchmark group %s", group)
+            if group == "factors":
+                results.extend(self.bench_factors(factor_names))
+            else:
+                results.extend(getattr(self, f"bench_{group}")())
+        return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=repo_root(),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    out_path: Optional[Path] = None,
+    groups: Iterable[str] = GROUPS,
+    spec: Optional[SyntheticSpec] = None,
+    data_dir: Optional[Path] = None,
+    repeat: int = 3,
+    factor_repeat: int = 1,
+    factor_names: Optional[Iterable[str]] = None,
+) -> dict:
+    """
+    Generate (or reuse, via data_dir) synthetic data, run the selected scenario groups and
+    optionally write the JSON report: {"meta": {...}, "results": [...]}.
+    """
+    spec = spec or SyntheticSpec()
+    with tempfile.TemporaryDirectory(prefix="quantlab_synth_") as tmp:
+        src = Path(data_dir) if data_dir is not None else generate_synthetic_data(Path(tmp), spec)
+        suite = BenchmarkSuite(src, repeat=repeat, factor_repeat=factor_repeat)
+        results = suite.run(groups, factor_names=factor_names)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "spec": asdict(spec) if data_dir is None else {"data_dir": str(data_dir)},
+            "repeat": repeat,
+            "factor_repeat": factor_repeat,
+        },
+        "results": [asdict(r) for r in results],
+    }
+    if out_path is not None:
+        out_path = Path(out_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2, default=float))
+        logger.info("Saved %d benchmark results to %s", len(results), out_path)
+    return report
+
+
+def compare_results(baseline: Path | dict, current: Path | dict, threshold: float = 0.10) -> pd.DataFrame:
+    """
+    Join two reports on (group, name) and flag scenarios whose best time grew by more than
+    `threshold` (relative). Ratio < 1 means the current run is faster.
+    """
+
+    def _frame(rep) -> pd.DataFrame:
+        rep = json.loads(Path(rep).read_text()) if not isinstance(rep, dict) else rep
+        return pd.DataFrame(rep["results"]).set_index(["group", "name"])["best_s"]
+
+    df = pd.concat({"baseline_s": _frame(baseline), "current_s": _frame(current)}, axis=1)
+    df["ratio"] = df["current_s"] / df["baseline_s"]
+    df["regression"] = df["ratio"] > 1.0 + threshold
+    return df.sort_values("ratio", ascending=False)
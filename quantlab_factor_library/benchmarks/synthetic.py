@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SECTORS = [
+    "TECHNOLOGY",
+    "HEALTHCARE",
+    "FINANCIAL SERVICES",
+    "CONSUMER CYCLICAL",
+    "CONSUMER DEFENSIVE",
+    "INDUSTRIALS",
+    "ENERGY",
+    "UTILITIES",
+    "REAL ESTATE",
+    "BASIC MATERIALS",
+    "COMMUNICATION SERVICES",
+]
+
+
+@dataclass
+class SyntheticSpec:
+    """
+    Scale and shape of the synthetic universe. Same spec + seed -> byte-identical datasets.
+    """
+
+    n_tickers: int = 200
+    n_years: int = 5
+    start_date: str = "2015-01-01"
+    seed: int = 0
+    listing_gap_frac: float = 0.1  # share of tickers listed after the start date
+    dividend_payer_frac: float = 0.6
+
+    @property
+    def tickers(self) -> list[str]:
+        return [f"SYN{i:04d}" for i in range(self.n_tickers)]
+
+    def dates(self) -> pd.DatetimeIndex:
+        start = pd.Timestamp(self.start_date)
+        return pd.bdate_range(start, start + pd.DateOffset(years=self.n_years) - pd.Timedelta(days=1))
+
+
+def _prices(spec: SyntheticSpec, rng: np.random.Generator, sectors: np.ndarray, ff: pd.DataFrame) -> pd.DataFrame:
+    dates = spec.dates()
+    n_d, n_t = len(dates), spec.n_tickers
+    beta = rng.normal(1.0, 0.3, n_t)
+    sector_codes = pd.Categorical(sectors, categories=SECTORS).codes
+    sector_ret = rng.normal(0, 0.006, (n_d, len(SECTORS)))[:, sector_codes]
+    idio_vol = rng.uniform(0.01, 0.03, n_t)
+    rets = ff["mktrf"].to_numpy()[:, None] * beta + sector_ret + rng.standard_t(4, (n_d, n_t)) * idio_vol / np.sqrt(2)
+    close = 20.0 * np.exp(rng.normal(0, 0.8, n_t)) * np.exp(np.cumsum(rets, axis=0))
+
+    # Late listings: NaN history before a random start
+    late = rng.random(n_t) < spec.listing_gap_frac
+    first = np.where(late, rng.integers(0, max(n_d // 2, 1), n_t), 0)
+    listed = np.arange(n_d)[:, None] >= first[None, :]
+
+    spread = np.abs(rng.normal(0, 0.01, (n_d, n_t)))
+    open_ = close * (1 + rng.normal(0, 0.005, (n_d, n_t)))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = np.round(np.exp(rng.normal(13, 1.0, n_t)) * np.exp(rng.normal(0, 0.4, (n_d, n_t))))
+
+    d_idx, t_idx = np.nonzero(listed)
+    return pd.DataFrame(
+        {
+            "date": dates.date[d_idx],
+            "ticker": np.asarray(spec.tickers)[t_idx],
+            "open": open_[d_idx, t_idx],
+            "high": high[d_idx, t_idx],
+            "low": low[d_idx, t_idx],
+            "close": close[d_idx, t_idx],
+            "adjusted_close": close[d_idx, t_idx],
+            "volume": volume[d_idx, t_idx],
+        }
+    )
+
+
+def _ff_factors(spec: SyntheticSpec, rng: np.random.Generator) -> pd.DataFrame:
+    dates = spec.dates()
+    n = len(dates)
+    vols = {"mktrf": 0.011, "smb": 0.005, "hml": 0.006, "rmw": 0.004, "cma": 0.004, "umd": 0.008}
+    out = pd.DataFrame({k: rng.normal(0.0002, v, n) for k, v in vols.items()})
+    out["rf"] = 0.00008
+    out.insert(0, "date", dates.date)
+    return out
+
+
+def _quarter_ends(spec: SyntheticSpec) -> pd.DatetimeIndex:
+    dates = spec.dates()
+    return pd.date_range(dates[0] - pd.DateOffset(years=1), dates[-1], freq="QE")
+
+
+def _fundamentals(spec: SyntheticSpec, rng: np.random.Generator) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Quarterly rows for every ticker/quarter plus annual rows at fiscal year end, laid out like the
+    pipeline outputs (fiscalDateEnding, period_type, `date` = fiscalDateEnding + 2 business days).
+    Levels follow a per-ticker random walk so growth/change factors see realistic dispersion.
+    Also returns the quarterly (ticker, fiscalDateEnding, eps) frame the earnings tables build on.
+    """
+    qends = _quarter_ends(spec)
+    n_q, n_t = len(qends), spec.n_tickers
+    scale = np.exp(rng.normal(21, 1.2, n_t))  # revenue level per quarter
+    growth = np.exp(np.cumsum(rng.normal(0.015, 0.06, (n_q, n_t)), axis=0))
+    revenue = scale * growth
+
+    def ratio(lo, hi):
+        return rng.uniform(lo, hi, n_t) * np.exp(rng.normal(0, 0.05, (n_q, n_t)))
+
+    income = {
+        "totalRevenue": revenue,
+        "grossProfit": revenue * ratio(0.2, 0.6),
+        "operatingIncome": revenue * rng.normal(0.12, 0.08, (n_q, n_t)),
+        "netIncome": revenue * rng.normal(0.07, 0.07, (n_q, n_t)),
+        "sellingGeneralAndAdministrative": revenue * ratio(0.05, 0.25),
+        "researchAndDevelopment": np.where(rng.random(n_t) < 0.5, revenue * ratio(0.02, 0.15), np.nan),
+        "depreciationAndAmortization": revenue * ratio(0.02, 0.08),
+        "depreciation": revenue * ratio(0.01, 0.05),
+    }
+    assets = revenue * ratio(2.0, 6.0)
+    current_assets = assets * ratio(0.2, 0.5)
+    liabilities = assets * ratio(0.3, 0.8)
+    st_debt = liabilities * ratio(0.05, 0.2)
+    lt_debt = liabilities * ratio(0.2, 0.5)
+    shares = np.exp(rng.normal(18.5, 1.0, n_t)) * np.exp(np.cumsum(rng.normal(0, 0.01, (n_q, n_t)), axis=0))
+    balance = {
+        "totalAssets": assets,
+        "totalCurrentAssets": current_assets,
+        "totalCurrentLiabilities": current_assets * ratio(0.4, 1.2),
+        "totalLiabilities": liabilities,
+        "totalShareholderEquity": assets - liabilities,
+        "inventory": current_assets * ratio(0.1, 0.4),
+        "propertyPlantEquipment": assets * ratio(0.1, 0.5),
+        "cashAndCashEquivalentsAtCarryingValue": current_assets * ratio(0.1, 0.5),
+        "shortTermDebt": st_debt,
+        "longTermDebt": lt_debt,
+        "shortLongTermDebtTotal": st_debt + lt_debt,
+        "commonStockSharesOutstanding": np.round(shares),
+    }
+    ocf = income["netIncome"] + income["depreciationAndAmortization"] + revenue * rng.normal(0, 0.03, (n_q, n_t))
+    cash_flow = {
+        "operatingCashflow": ocf,
+        "capitalExpenditures": revenue * ratio(0.02, 0.1),
+    }
+
+    q_idx, t_idx = np.divmod(np.arange(n_q * n_t), n_t)
+    base = pd.DataFrame(
+        {
+            "ticker": np.asarray(spec.tickers)[t_idx],
+            "fiscalDateEnding": qends.date[q_idx],
+        }
+    )
+    base["date"] = (pd.to_datetime(base["fiscalDateEnding"]) + pd.tseries.offsets.BusinessDay(2)).dt.date
+
+    def _table(values: dict[str, np.ndarray], flow: bool) -> pd.DataFrame:
+        quarterly = base.copy()
+        for col, arr in values.items():
+            quarterly[col] = arr.reshape(-1)
+        quarterly["period_type"] = "quarterly"
+        fy_end = pd.to_datetime(quarterly["fiscalDateEnding"]).dt.month == 12
+        if flow:
+            # Annual flows are the sum of the fiscal year's quarters; stocks are the year-end level
+            year = pd.to_datetime(quarterly["fiscalDateEnding"]).dt.year
+            sums = quarterly.groupby(["ticker", year])[list(values)].transform("sum")
+            annual = quarterly.copy()
+            annual[list(values)] = sums
+            annual = annual[fy_end]
+        else:
+            annual = quarterly[fy_end].copy()
+        annual["period_type"] = "annual"
+        return pd.concat([quarterly, annual], ignore_index=True)
+
+    tables = {
+        "fundamentals_income_statement": _table(income, flow=True),
+        "fundamentals_balance_sheet": _table(balance, flow=False),
+        "fundamentals_cash_flow": _table(cash_flow, flow=True),
+    }
+    quarters = base[["ticker", "fiscalDateEnding"]].assign(eps=(income["netIncome"] / shares).reshape(-1))
+    return tables, quarters
+
+
+def _earnings(rng: np.random.Generator, quarters: pd.DataFrame) -> pd.DataFrame:
+    df = quarters.rename(columns={"eps": "reportedEPS"})
+    df["reportedDate"] = (
+        pd.to_datetime(df["fiscalDateEnding"]) + pd.to_timedelta(rng.integers(20, 45, len(df)), unit="D")
+    ).dt.date
+    df["estimatedEPS"] = df["reportedEPS"] + rng.normal(0, 0.05, len(df)) * (df["reportedEPS"].abs() + 0.05)
+    df["surprise"] = df["reportedEPS"] - df["estimatedEPS"]
+    df["surprisePercentage"] = 100 * df["surprise"] / df["estimatedEPS"].abs().replace(0, np.nan)
+    df["period_type"] = "quarterly"
+    df["date"] = (pd.to_datetime(df["reportedDate"]) + pd.tseries.offsets.BusinessDay(2)).dt.date
+    return df
+
+
+def _estimates(spec: SyntheticSpec, rng: np.random.Generator) -> pd.DataFrame:
+    # Weekly snapshots of trailing-30-day revision counts
+    weeks = spec.dates()[::5]
+    n = len(weeks) * spec.n_tickers
+    w_idx, t_idx = np.divmod(np.arange(n), spec.n_tickers)
+    return pd.DataFrame(
+        {
+            "date": weeks.date[w_idx],
+            "ticker": np.asarray(spec.tickers)[t_idx],
+            "eps_estimate_revision_up_trailing_30_days": rng.poisson(1.5, n).astype(float),
+            "eps_estimate_revision_down_trailing_30_days": rng.poisson(1.5, n).astype(float),
+        }
+    )
+
+
+def _dividends(spec: SyntheticSpec, rng: np.random.Generator) -> pd.DataFrame:
+    qends = _quarter_ends(spec)
+    payers = np.flatnonzero(rng.random(spec.n_tickers) < spec.dividend_payer_frac)
+    base_amt = rng.uniform(0.05, 0.8, len(payers))
+    rows = []
+    for k, t in enumerate(payers):
+        amt = base_amt[k] * np.exp(np.cumsum(rng.normal(0.01, 0.03, len(qends))))
+        ex = qends + pd.to_timedelta(rng.integers(10, 40, len(qends)), unit="D")
+        rows.append(pd.DataFrame({"ticker": spec.tickers[t], "ex_dividend_date": ex.date, "amount": amt}))
+    return pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=["ticker", "ex_dividend_date", "amount"])
+
+
+def generate_synthetic_data(out_dir: Path, spec: SyntheticSpec | None = None, **kwargs) -> Path:
+    """
+    Write a deterministic synthetic universe in the layout of final_data_dir(), so the default
+    factors, analytics and run_all run offline (point DataLoader(data_dir=out_dir) or
+    QUANTLAB_FINAL_DIR at it). kwargs override SyntheticSpec fields (n_tickers, n_years, seed, ...).
+    """
+    spec = replace(spec, **kwargs) if spec is not None else SyntheticSpec(**kwargs)
+    rng = np.random.default_rng(spec.seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    sectors = np.asarray(SECTORS)[rng.integers(0, len(SECTORS), spec.n_tickers)]
+    overview = pd.DataFrame(
+        {
+            "ticker": spec.tickers,
+            "Symbol": spec.tickers,
+            "Sector": sectors,
+            "EVToEBITDA": np.round(np.exp(rng.normal(2.4, 0.5, spec.n_tickers)), 2),
+        }
+    )
+    ff = _ff_factors(spec, rng)
+    prices = _prices(spec, rng, sectors, ff)
+    fundamentals, quarters = _fundamentals(spec, rng)
+    earnings = _earnings(rng, quarters)
+
+    tables = {
+        "price_daily": prices,
+        "company_overview": overview,
+        "FAMA_FRENCH_FACTORS": ff,
+        **fundamentals,
+        "fundamentals_earnings": earnings,
+        "fundamentals_earnings_quarterly": earnings,
+        "fundamentals_earnings_estimates": _estimates(spec, rng),
+        "fundamentals_dividends": _dividends(spec, rng),
+    }
+    for name, df in tables.items():
+        df.to_parquet(out_dir / f"{name}.parquet", index=False)
+    pd.Series(asdict(spec)).to_json(out_dir / "synthetic_spec.json")
+    logger.info(
+        "Wrote synthetic data (%d tickers x %d years, seed %d) to %s",
+        spec.n_tickers,
+        spec.n_years,
+        spec.seed,
+        out_dir,
+    )
+    return out_dir
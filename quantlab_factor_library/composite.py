@@ -1,20 +1,25 @@
 from __future__ import annotations
 
 import json
+import logging
 from pathlib import Path
 from typing import Dict, Iterable, Optional
 
 import numpy as np
 import pandas as pd
 
-from .paths import repo_root, factors_dir
+from .factor_store import output_formats, write_ls_arrow, write_wide_arrow
+from .paths import diagnostics_dir, repo_root, factors_dir
 from .analytics import (
+    attach_ff_regressions,
     compute_all_analytics,
     compute_factor_correlation,
     save_correlation_matrix,
     corr_with_ff,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _load_composite_config() -> dict:
     cfg_path = repo_root() / "config" / "config.json"
@@ -185,7 +190,7 @@ def save_composite_analytics(df: pd.DataFrame, name: str = "composite_analytics"
     Save composite analytics (wide DataFrame) to diagnostics in both parquet and CSV.
     Returns paths.
     """
-    diag_dir = repo_root() / "diagnostics"
+    diag_dir = diagnostics_dir()
     diag_dir.mkdir(parents=True, exist_ok=True)
     parquet_path = diag_dir / f"{name}.parquet"
     csv_path = diag_dir / f"{name}.csv"
@@ -196,17 +201,22 @@ def save_composite_analytics(df: pd.DataFrame, name: str = "composite_analytics"
 
 def save_composite_factor(name: str, df: pd.DataFrame) -> dict:
     """
-    Persist a composite factor to the factors directory (wide -> long parquet),
-    mirroring raw factor outputs.
+    Persist a composite factor to the factors directory (wide -> long parquet and/or
+    column-major Arrow per output_formats), mirroring raw factor outputs.
     """
     factors_dir().mkdir(parents=True, exist_ok=True)
-    long_df = df.stack().reset_index()
-    long_df.columns = ["Date", "Ticker", "Value"]
-    long_df = long_df.dropna(subset=["Value"])
-    long_df["Date"] = pd.to_datetime(long_df["Date"]).dt.date
-    parquet_path = factors_dir() / f"factor_{name}.parquet"
-    long_df.to_parquet(parquet_path, index=False)
-    return {"parquet": parquet_path}
+    formats = output_formats()
+    paths = {}
+    if "parquet" in formats:
+        long_df = df.stack().reset_index()
+        long_df.columns = ["Date", "Ticker", "Value"]
+        long_df = long_df.dropna(subset=["Value"])
+        long_df["Date"] = pd.to_datetime(long_df["Date"]).dt.date
+        paths["parquet"] = factors_dir() / f"factor_{name}.parquet"
+        long_df.to_parquet(paths["parquet"], index=False)
+    if "arrow" in formats:
+        paths["arrow"] = write_wide_arrow(df, factors_dir() / f"factor_{name}.arrow")
+    return paths
 
 
 def save_composite_ls(name: str, ls: pd.Series) -> dict:
@@ -214,12 +224,17 @@ def save_composite_ls(name: str, ls: pd.Series) -> dict:
     Persist composite long/short returns to the factors directory for reuse.
     """
     factors_dir().mkdir(parents=True, exist_ok=True)
-    df = ls.reset_index()
-    df.columns = ["Date", "LS_Return"]
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-    parquet_path = factors_dir() / f"ls_{name}.parquet"
-    df.to_parquet(parquet_path, index=False)
-    return {"parquet": parquet_path}
+    formats = output_formats()
+    paths = {}
+    if "parquet" in formats:
+        df = ls.reset_index()
+        df.columns = ["Date", "LS_Return"]
+        df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        paths["parquet"] = factors_dir() / f"ls_{name}.parquet"
+        df.to_parquet(paths["parquet"], index=False)
+    if "arrow" in formats:
+        paths["arrow"] = write_ls_arrow(ls, factors_dir() / f"ls_{name}.arrow")
+    return paths
 
 
 def analyze_composites(
@@ -233,7 +248,6 @@ def analyze_composites(
     Returns dict with analytics per composite and paths to saved artifacts.
     """
     analytics = {}
-    summary_rows = []
     ls_returns = {}
     factor_paths = {}
     ls_paths = {}
@@ -247,15 +261,16 @@ def analyze_composites(
             fwd_returns,
             factor_name=name,
             write_registry=False,
-            ff_factors=ff,
         )
         analytics[name] = res
-        summary_rows.append({"factor": name, **(res.get("summary") or {})})
         # Save composite factor and LS series similar to raw factors
         factor_paths[name] = save_composite_factor(name, fac)
         if res.get("ls_returns") is not None:
             ls_returns[name] = res["ls_returns"]
             ls_paths[name] = save_composite_ls(name, res["ls_returns"])
+    # One batched FF regression over all composite LS series
+    attach_ff_regressions(analytics, ff)
+    summary_rows = [{"factor": name, **(res.get("summary") or {})} for name, res in analytics.items()]
 
     paths = {}
     if summary_rows:
@@ -266,7 +281,7 @@ def analyze_composites(
     if composites:
         corr = compute_factor_correlation(composites)
         if not corr.empty:
-            diag_dir = repo_root() / "diagnostics"
+            diag_dir = diagnostics_dir()
             diag_dir.mkdir(parents=True, exist_ok=True)
             corr_path = save_correlation_matrix(
                 corr,
@@ -279,7 +294,7 @@ def analyze_composites(
     if ff is not None and ls_returns:
             ff_corr = corr_with_ff(ls_returns, ff)
             if not ff_corr.empty:
-                diag_dir = repo_root() / "diagnostics"
+                diag_dir = diagnostics_dir()
                 diag_dir.mkdir(parents=True, exist_ok=True)
                 ff_corr_path = save_correlation_matrix(
                     ff_corr,
@@ -1,14 +1,36 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
 from dataclasses import dataclass
 from datetime import date
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Optional
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from .paths import final_data_dir
 
+DEFAULT_HORIZONS = (1, 5, 10, 21, 63)
+
+
+def price_pivot(df: pd.DataFrame, value_col: Optional[str] = None, dataset: str = "price_daily") -> pd.DataFrame:
+    """Wide Date x Ticker price panel from a long price frame (value_col, else adjusted_close/close/price)."""
+    candidates = [value_col] if value_col else []
+    candidates += ["adjusted_close", "close", "price"]
+    col = next((c for c in candidates if c in df.columns), None)
+    if col is None:
+        raise ValueError(f"No price column found in {dataset}")
+    wide = df.pivot(index="date", columns="ticker", values=col).sort_index()
+    return wide
+
+
+def _schema_names(path: Path) -> list[str]:
+    import pyarrow.parquet as pq
+
+    return pq.read_schema(path).names
+
 
 @dataclass
 class DataLoader:
@@ -19,11 +41,24 @@ class DataLoader:
     data_dir: Optional[str] = None
     default_start_date: Optional[date] = None
     default_end_date: Optional[date] = None
+    tickers: Optional[tuple] = None
 
     def _dataset_path(self, dataset: str) -> Path:
         base = final_data_dir() if self.data_dir is None else Path(self.data_dir)
         return base / f"{dataset}.parquet"
 
+    def fingerprint(self) -> str:
+        """
+        Cheap identity of the data this loader reads: directory, default date window and each
+        dataset's name, size and mtime. Changes whenever a dataset is rewritten.
+        """
+        base = final_data_dir() if self.data_dir is None else Path(self.data_dir)
+        h = hashlib.sha1(repr((str(base.resolve()), self.default_start_date, self.default_end_date, self.tickers)).encode())
+        for path in sorted(base.glob("*.parquet")):
+            st = path.stat()
+            h.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns}".encode())
+        return h.hexdigest()
+
     def load_long(
         self,
         dataset: str = "price_daily",
@@ -33,7 +68,13 @@ class DataLoader:
         clip_to_available: bool = True,
     ) -> pd.DataFrame:
         path = self._dataset_path(dataset)
-        df = pd.read_parquet(path)
+        calendar = None
+        if self.tickers is not None and "ticker" in _schema_names(path):
+            df = pd.read_parquet(path, filters=[("ticker", "in", list(self.tickers))])
+            if "date" in df.columns:
+                calendar = pd.Index(pd.to_datetime(pd.read_parquet(path, columns=["date"])["date"]).dt.date.unique())
+        else:
+            df = pd.read_parquet(path)
         # Apply defaults if explicit dates not supplied
         if start_date is None:
             start_date = self.default_start_date
@@ -43,7 +84,8 @@ class DataLoader:
         if has_date:
             df["date"] = pd.to_datetime(df["date"]).dt.date
             if clip_to_available and not df.empty:
-                min_date, max_date = df["date"].min(), df["date"].max()
+                dates = df["date"] if calendar is None else calendar
+                min_date, max_date = dates.min(), dates.max()
                 if start_date and start_date < min_date:
                     start_date = min_date
                 if end_date and end_date > max_date:
@@ -52,10 +94,45 @@ class DataLoader:
             df = df[df["date"] >= start_date]
         if has_date and end_date:
             df = df[df["date"] <= end_date]
+        if calendar is not None:
+            # Dates on which no ticker of this subset trades get one all-NaN row so pivots keep
+            # the unrestricted calendar (rolling windows then span the same dates)
+            if start_date:
+                calendar = calendar[calendar >= start_date]
+            if end_date:
+                calendar = calendar[calendar <= end_date]
+            absent = calendar.difference(pd.Index(df["date"].unique()))
+            if len(absent) and not df.empty:
+                pad = pd.DataFrame({"date": absent, "ticker": df["ticker"].iloc[0]})
+                df = pd.concat([df, pad], ignore_index=True)
         if tickers is not None and "ticker" in df.columns:
             df = df[df["ticker"].isin(set(tickers))]
         return df
 
+    def restrict(self, tickers: Iterable[str]) -> "DataLoader":
+        """
+        Copy of this loader that only reads `tickers` (pushed down to the parquet reads).
+        Frames keep the full loader's dates, so per-ticker time-series kernels give the same
+        values on the subset as on the whole universe.
+        """
+        return dataclasses.replace(self, tickers=tuple(tickers))
+
+    def panel_shape(self, dataset: str = "price_daily") -> tuple[int, int]:
+        """(dates, tickers) of the wide panel load_price_wide would return, read from the date column only."""
+        dates = pd.to_datetime(pd.read_parquet(self._dataset_path(dataset), columns=["date"])["date"]).dt.date
+        if self.default_start_date:
+            dates = dates[dates >= self.default_start_date]
+        if self.default_end_date:
+            dates = dates[dates <= self.default_end_date]
+        return int(dates.nunique()), len(self.universe(dataset))
+
+    def universe(self, dataset: str = "price_daily") -> pd.Index:
+        """Sorted tickers present in a dataset (the columns load_price_wide would return)."""
+        tickers = pd.read_parquet(self._dataset_path(dataset), columns=["ticker"])["ticker"].dropna().unique()
+        if self.tickers is not None:
+            tickers = [t for t in tickers if t in set(self.tickers)]
+        return pd.Index(tickers).sort_values()
+
     def load_price_wide(
         self,
         dataset: str = "price_daily",
@@ -72,13 +149,7 @@ class DataLoader:
             tickers=tickers,
             clip_to_available=clip_to_available,
         )
-        candidates = [value_col] if value_col else []
-        candidates += ["adjusted_close", "close", "price"]
-        col = next((c for c in candidates if c in df.columns), None)
-        if col is None:
-            raise ValueError(f"No price column found in {dataset}")
-        wide = df.pivot(index="date", columns="ticker", values=col).sort_index()
-        return wide
+        return price_pivot(df, value_col=value_col, dataset=dataset)
 
     def load_sector_map(self, dataset: str = "company_overview", sector_col: str = "Sector") -> pd.Series:
         df = self.load_long(dataset=dataset)
@@ -92,13 +163,36 @@ class DataLoader:
         """
         return price_wide.shift(-horizon) / price_wide - 1.0
 
+    def forward_returns_multi(
+        self,
+        price_wide: pd.DataFrame,
+        horizons: Iterable[int] = DEFAULT_HORIZONS,
+    ) -> Dict[int, pd.DataFrame]:
+        """
+        Forward returns for several horizons from one cumulative log-price array:
+        r_h(t) = exp(log P(t+h) - log P(t)) - 1. Non-positive prices are treated as missing.
+        Returns {horizon: Date x Ticker frame} aligned like forward_returns.
+        """
+        prices = price_wide.to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            log_p = np.log(np.where(prices > 0, prices, np.nan))
+        out: Dict[int, pd.DataFrame] = {}
+        for h in sorted({int(h) for h in horizons}):
+            if h < 1:
+                raise ValueError(f"Forward return horizons must be >= 1, got {h}")
+            fwd = np.full(log_p.shape, np.nan)
+            if h < len(log_p):
+                fwd[:-h] = np.expm1(log_p[h:] - log_p[:-h])
+            out[h] = pd.DataFrame(fwd, index=price_wide.index, columns=price_wide.columns)
+        return out
+
     def load_ff_factors(self, path: Optional[Path] = None, scale_if_percent: bool = True) -> pd.DataFrame:
         """
         Load Fama-French factor time series (market, SMB, HML, etc.) from data-processed.
         Returns a DataFrame indexed by date with columns lowercased (mktrf, smb, hml, rmw, cma, rf, umd when present).
         If values look like percentages (abs max > 2), divide by 100 when scale_if_percent=True.
         """
-        path = path or final_data_dir() / "FAMA_FRENCH_FACTORS.parquet"
+        path = path or self._dataset_path("FAMA_FRENCH_FACTORS")
         if not path.exists():
             raise FileNotFoundError(f"FF factors not found at {path}")
         df = pd.read_parquet(path)
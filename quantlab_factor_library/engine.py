@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import contextvars
+import os
+from contextlib import contextmanager
+
+from .paths import _load_config
+
+ENGINES = ("reference", "fast")
+
+_override: contextvars.ContextVar[str | None] = contextvars.ContextVar("quantlab_engine", default=None)
+
+
+def get_engine() -> str:
+    """
+    Active implementation for transforms/analytics kernels:
+      - "reference": the original pandas row-wise implementations (default)
+      - "fast": numpy kernels in vectorized.py
+    Resolution order: use_engine() context, QUANTLAB_ENGINE env var, "engine" in config/config.json.
+    """
+    name = _override.get() or os.environ.get("QUANTLAB_ENGINE") or _load_config().get("engine") or "reference"
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name!r}; expected one of {ENGINES}")
+    return name
+
+
+def use_fast() -> bool:
+    return get_engine() == "fast"
+
+
+@contextmanager
+def use_engine(name: str):
+    """Temporarily select an engine in the current thread/context (e.g. for equivalence checks)."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine {name!r}; expected one of {ENGINES}")
+    token = _override.set(name)
+    try:
+        yield
+    finally:
+        _override.reset(token)
@@ -1,130 +1,92 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from .factors import (
-    MeanReversion,
-    Momentum,
-    Volatility,
-    DollarVolume,
-    Size,
-    EarningsYield,
-    Profitability,
-    DividendYield,
-    Beta,
-    DownsideBeta,
-    AnalystRevision,
-    EarningsSurprise,
-    Turnover,
-    DownsideVol,
-    High52wProximity,
-    AmihudIlliquidity,
-    AmihudIlliquidityLog,
-    Coskewness,
-    BookToPrice,
-    ReturnOnAssets,
-    Leverage,
-    SalesGrowth,
-    AssetGrowth,
-    ResidualVol,
-    IdiosyncraticVolatility,
-    ResidualMomentum,
-    CompositeMomentum,
-    IndustryCoMomentum,
-    VolumeInclusiveICM,
-    IndustryCoReversal,
-    LogTotalAssets,
-    LogEnterpriseValue,
-    LogRevenue,
-    EfficiencyRatio,
-    GrossProfitability,
-    SalesGrowthAcceleration,
-    NetBuybackYield,
-    IndustryMomentum,
-    MaxDailyReturn,
-    EVToEBITDA,
-    InvestmentToAssets,
-    PiotroskiFScore,
-    AverageTrueRange,
-    OnBalanceVolume,
-    VWAPDeviation,
-    HurstExponent,
-    StandardizedUnexpectedEarnings,
-    BenfordChiSquareD1,
-    BenfordChiSquareD2,
-    CashflowYield,
-    FreeCashflowYield,
-    Accruals,
-    RDIntensity,
-    NetIssuance,
-    ReturnSkewness,
-    ReturnKurtosis,
-    DividendGrowth,
-)
+from . import factors
 
+# Default factor set: output name -> (class name in factors/, constructor kwargs).
+# Classes are imported lazily, so building a subset only loads the modules it needs.
+DEFAULT_FACTORS: Dict[str, Tuple[str, dict]] = {
+    "momentum_12m": ("Momentum", {"lookback_days": 252, "skip_days": 21}),
+    "composite_momentum": ("CompositeMomentum", {}),
+    "residual_momentum_12m": ("ResidualMomentum", {}),
+    "industry_co_momentum": ("IndustryCoMomentum", {}),
+    "volume_inclusive_icm": ("VolumeInclusiveICM", {}),
+    "industry_co_reversal": ("IndustryCoReversal", {}),
+    "volatility_60d": ("Volatility", {"window": 60}),
+    "ivol_60d": ("IdiosyncraticVolatility", {"window": 60}),
+    "downside_vol_60d": ("DownsideVol", {"window": 60}),
+    "mean_reversion_5d": ("MeanReversion", {"lookback_days": 5}),
+    "high52w_proximity": ("High52wProximity", {}),
+    "dollar_volume_20d": ("DollarVolume", {"window": 20}),
+    "amihud_illiq_20d": ("AmihudIlliquidity", {"window": 20}),
+    "amihud_illiq_log_20d": ("AmihudIlliquidityLog", {"window": 20}),
+    "amihud_illiq_252d": ("AmihudIlliquidity", {"window": 252}),
+    "efficiency_ratio_252d": ("EfficiencyRatio", {"window": 252}),
+    "residual_vol_252d": ("ResidualVol", {"window": 252}),
+    "size_log_mktcap": ("Size", {}),
+    "earnings_yield": ("EarningsYield", {}),
+    "profitability_roe": ("Profitability", {}),
+    "dividend_yield_ttm": ("DividendYield", {}),
+    "beta_252d": ("Beta", {"window": 252}),
+    "downside_beta_252d": ("DownsideBeta", {"window": 252}),
+    "cashflow_yield": ("CashflowYield", {}),
+    "free_cashflow_yield": ("FreeCashflowYield", {}),
+    "gross_profitability": ("GrossProfitability", {}),
+    "accruals": ("Accruals", {}),
+    "rd_intensity": ("RDIntensity", {}),
+    "net_issuance": ("NetIssuance", {}),
+    "net_buyback_yield": ("NetBuybackYield", {}),
+    "investment_to_assets": ("InvestmentToAssets", {}),
+    "piotroski_fscore": ("PiotroskiFScore", {}),
+    "atr_14d": ("AverageTrueRange", {"window": 14}),
+    "obv": ("OnBalanceVolume", {}),
+    "vwap_dev_21d": ("VWAPDeviation", {"window": 21}),
+    "hurst_252d": ("HurstExponent", {"window": 252}),
+    "sue": ("StandardizedUnexpectedEarnings", {}),
+    "benford_chi2_d1": ("BenfordChiSquareD1", {}),
+    "benford_chi2_d2": ("BenfordChiSquareD2", {}),
+    "skewness_60d": ("ReturnSkewness", {}),
+    "kurtosis_60d": ("ReturnKurtosis", {}),
+    "dividend_growth": ("DividendGrowth", {}),
+    "ev_to_ebitda_inv": ("EVToEBITDA", {}),
+    "book_to_price": ("BookToPrice", {}),
+    "roa": ("ReturnOnAssets", {}),
+    "leverage": ("Leverage", {}),
+    "sales_growth": ("SalesGrowth", {}),
+    "sales_growth_accel": ("SalesGrowthAcceleration", {}),
+    "asset_growth": ("AssetGrowth", {}),
+    "analyst_revision_eps_30d": ("AnalystRevision", {}),
+    "earnings_surprise": ("EarningsSurprise", {}),
+    "turnover": ("Turnover", {}),
+    "coskewness_252d": ("Coskewness", {"window": 252}),
+    "industry_momentum": ("IndustryMomentum", {}),
+    "max_daily_return_1m": ("MaxDailyReturn", {"window": 21}),
+    "size_log_total_assets": ("LogTotalAssets", {}),
+    "size_log_enterprise_value": ("LogEnterpriseValue", {}),
+    "size_log_revenue": ("LogRevenue", {}),
+}
 
-def get_default_factors() -> List:
+
+def build_factor(name: str):
+    """Instantiate one default factor by output name (imports only its module)."""
+    try:
+        cls_name, kwargs = DEFAULT_FACTORS[name]
+    except KeyError:
+        raise KeyError(f"Unknown default factor {name!r}") from None
+    return factors.factor_class(cls_name)(name=name, **kwargs)
+
+
+def get_default_factors(names: Optional[Iterable[str]] = None) -> List:
     """
     Central place to declare the default factor set used by run_factors and demos.
-    Modify or extend this list to add/remove factors without changing runner code.
+    Modify or extend DEFAULT_FACTORS to add/remove factors without changing runner code.
+    names: optional subset (output names); only those factor modules are imported.
     """
-    return [
-        Momentum(lookback_days=252, skip_days=21, name="momentum_12m"),
-        CompositeMomentum(),
-        ResidualMomentum(),
-        IndustryCoMomentum(),
-        VolumeInclusiveICM(),
-        IndustryCoReversal(),
-        Volatility(window=60, name="volatility_60d"),
-        IdiosyncraticVolatility(window=60),
-        DownsideVol(window=60),
-        MeanReversion(lookback_days=5, name="mean_reversion_5d"),
-        High52wProximity(),
-        DollarVolume(window=20, name="dollar_volume_20d"),
-        AmihudIlliquidity(window=20),
-        AmihudIlliquidityLog(window=20),
-        AmihudIlliquidity(window=252, name="amihud_illiq_252d"),
-        EfficiencyRatio(window=252),
-        ResidualVol(window=252),
-        Size(),
-        EarningsYield(),
-        Profitability(),
-        DividendYield(),
-        Beta(window=252),
-        DownsideBeta(window=252),
-        CashflowYield(),
-        FreeCashflowYield(),
-        GrossProfitability(),
-        Accruals(),
-        RDIntensity(),
-        NetIssuance(),
-        NetBuybackYield(),
-        InvestmentToAssets(),
-        PiotroskiFScore(),
-        AverageTrueRange(window=14),
-        OnBalanceVolume(),
-        VWAPDeviation(window=21),
-        HurstExponent(window=252),
-        StandardizedUnexpectedEarnings(),
-        BenfordChiSquareD1(),
-        BenfordChiSquareD2(),
-        ReturnSkewness(),
-        ReturnKurtosis(),
-        DividendGrowth(),
-        EVToEBITDA(),
-        BookToPrice(),
-        ReturnOnAssets(),
-        Leverage(),
-        SalesGrowth(),
-        SalesGrowthAcceleration(),
-        AssetGrowth(),
-        AnalystRevision(),
-        EarningsSurprise(),
-        Turnover(),
-        Coskewness(window=252),
-        IndustryMomentum(),
-        MaxDailyReturn(window=21, name="max_daily_return_1m"),
-        LogTotalAssets(),
-        LogEnterpriseValue(),
-        LogRevenue(),
-    ]
+    if names is None:
+        return [build_factor(name) for name in DEFAULT_FACTORS]
+    wanted = list(names)
+    unknown = [n for n in wanted if n not in DEFAULT_FACTORS]
+    if unknown:
+        raise KeyError(f"Unknown default factor(s): {unknown}")
+    return [build_factor(name) for name in DEFAULT_FACTORS if name in wanted]
@@ -0,0 +1,897 @@
+from __future__ import annotations
+
+import logging
+import shutil
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .panel import block_slices, panel_axes, stack_frames
+from .paths import _load_config, factors_dir
+
+logger = logging.getLogger(__name__)
+
+
+def factor_dataset_dir() -> Path:
+    return factors_dir() / "factor_store"
+
+
+def factor_history_dir() -> Path:
+    return factors_dir() / "history"
+
+
+def _year_of(d) -> int:
+    return d.year if hasattr(d, "year") else pd.Timestamp(d).year
+
+
+def write_factor_dataset(
+    factors: Dict[str, pd.DataFrame],
+    path: Path | None = None,
+    partition_by_year: bool = True,
+    row_group_size: int = 1 << 17,
+    compression: str = "zstd",
+) -> Path:
+    """
+    Write all factors of a run (a dict of panels or a FactorStore) into one columnar dataset: one row per (date, ticker) with any
+    factor observed, one float32 column per factor, dictionary-encoded tickers, rows sorted by
+    (date, ticker) so row-group min/max statistics prune date/ticker predicates.
+    With partition_by_year the dataset is hive-partitioned as year=YYYY/part-0.parquet.
+    The previous dataset at `path` is replaced once the new one is fully written: it is renamed
+    to <path>.old, the new one renamed into place, and only then is the old one deleted.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out_dir = path or factor_dataset_dir()
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    names = list(factors)
+    dates, tickers = panel_axes(factors)
+    ticker_dict = pa.array([str(t) for t in tickers], type=pa.string())
+    if partition_by_year:
+        years = np.array([_year_of(d) for d in dates])
+        groups = [(int(y), dates[years == y]) for y in np.unique(years)]
+    else:
+        groups = [(None, dates)]
+
+    for year, block in groups:
+        panel = stack_frames(block_slices(factors, block), block, tickers, dtype=np.float32)  # (dates, tickers, K)
+        keep = ~np.isnan(panel).all(axis=2)
+        d_idx, t_idx = np.nonzero(keep)  # row-major -> sorted by (date, ticker)
+        values = panel[d_idx, t_idx]
+        block_dates = pd.to_datetime(pd.Index(block)).values.astype("datetime64[D]")
+        arrays = {
+            "date": pa.array(block_dates[d_idx], type=pa.date32()),
+            "ticker": pa.DictionaryArray.from_arrays(pa.array(t_idx.astype(np.int32)), ticker_dict),
+        }
+        for k, name in enumerate(names):
+            col = values[:, k]
+            arrays[name] = pa.array(col, type=pa.float32(), mask=np.isnan(col))
+        table = pa.table(arrays)
+        target = tmp_dir / f"year={year}" / "part-0.parquet" if year is not None else tmp_dir / "part-0.parquet"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            table,
+            target,
+            row_group_size=row_group_size,
+            compression=compression,
+            use_dictionary=["ticker"],
+            write_statistics=True,
+        )
+
+    old_dir = _old_dataset_dir(out_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    if out_dir.exists():
+        out_dir.rename(old_dir)
+    tmp_dir.rename(out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    logger.info("Saved %d factors (%d dates x %d tickers) to dataset %s", len(names), len(dates), len(tickers), out_dir)
+    return out_dir
+
+
+def _old_dataset_dir(path: Path) -> Path:
+    return path.with_name(path.name + ".old")
+
+
+def read_factor_dataset(
+    path: Path | None = None,
+    factors: Optional[Iterable[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    tickers: Optional[Iterable[str]] = None,
+    wide: bool = True,
+) -> Dict[str, pd.DataFrame] | pd.DataFrame:
+    """
+    Read a subset of factors/dates/tickers from the dataset written by write_factor_dataset.
+    Only the requested factor columns are read; date and ticker predicates are pushed down
+    (year partitions and row groups outside the range are skipped).
+    Returns {factor: wide Date x Ticker frame} or, with wide=False, the long frame
+    (date, ticker, <factors>...). If a writer died between its two renames, the previous dataset
+    left at <path>.old is read.
+    """
+    import pyarrow.dataset as ds
+
+    src = path or factor_dataset_dir()
+    if not src.exists() and _old_dataset_dir(src).exists():
+        src = _old_dataset_dir(src)
+    dataset = ds.dataset(src, format="parquet", partitioning="hive")
+    available = [f for f in dataset.schema.names if f not in ("date", "ticker", "year")]
+    cols = list(factors) if factors is not None else available
+    missing = [c for c in cols if c not in available]
+    if missing:
+        raise KeyError(f"Factors not in dataset {src}: {missing}")
+
+    expr = None
+
+    def _and(e):
+        return e if expr is None else expr & e
+
+    has_year = "year" in dataset.schema.names
+    if start_date is not None:
+        expr = _and(ds.field("date") >= pd.Timestamp(start_date).date())
+        if has_year:
+            expr = _and(ds.field("year") >= pd.Timestamp(start_date).year)
+    if end_date is not None:
+        expr = _and(ds.field("date") <= pd.Timestamp(end_date).date())
+        if has_year:
+            expr = _and(ds.field("year") <= pd.Timestamp(end_date).year)
+    if tickers is not None:
+        expr = _and(ds.field("ticker").isin([str(t) for t in tickers]))
+
+    table = dataset.to_table(columns=["date", "ticker"] + cols, filter=expr)
+    df = table.to_pandas()
+    df["ticker"] = df["ticker"].astype(str)
+    if not wide:
+        return df
+    return {c: df.pivot(index="date", columns="ticker", values=c).sort_index() for c in cols}
+
+
+def checksum_decimals() -> int:
+    """Rounding applied to values before hashing ("checksum_decimals" in config, default 10)."""
+    return int(_load_config().get("checksum_decimals", 10))
+
+
+class PartitionChecksums:
+    """
+    Per-year checksums of a factor's values: blake2b over the long rows in (date, ticker) order,
+    hashing dates, ticker names and values rounded to `decimals` (so summation-order noise below
+    the rounding does not count as a change). Rows must arrive in that order; how they are split
+    into update() calls does not affect the result.
+    """
+
+    def __init__(self, decimals: int | None = None):
+        self.decimals = checksum_decimals() if decimals is None else int(decimals)
+        # year -> [rows, hashers of dates, ticker lengths, ticker bytes, values]; one stream each so
+        # the digests do not depend on where update() calls split the rows
+        self._parts: Dict[int, list] = {}
+
+    def update(self, dates: np.ndarray, tickers, values: np.ndarray) -> None:
+        """dates: datetime64[D] per row; tickers: pyarrow string array; values: float64 per row."""
+        import hashlib
+
+        if not len(dates):
+            return
+        offsets = np.frombuffer(tickers.buffers()[1], dtype=np.int32)[tickers.offset : tickers.offset + len(tickers) + 1]
+        data = tickers.buffers()[2]
+        years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        values = np.round(values, self.decimals) + 0.0  # + 0.0 folds -0.0 into 0.0
+        bounds = np.flatnonzero(np.diff(years)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(years)]):
+            part = self._parts.setdefault(int(years[lo]), [0] + [hashlib.blake2b(digest_size=16) for _ in range(4)])
+            part[0] += int(hi - lo)
+            part[1].update(dates[lo:hi].astype(np.int64).tobytes())
+            part[2].update(np.diff(offsets[lo : hi + 1]).tobytes())
+            part[3].update(memoryview(data)[offsets[lo] : offsets[hi]])
+            part[4].update(np.ascontiguousarray(values[lo:hi]).tobytes())
+
+    def result(self) -> Dict[int, dict]:
+        """{year: {"rows": n, "checksum": hex digest}}."""
+        import hashlib
+
+        out = {}
+        for year, (rows, *hashers) in sorted(self._parts.items()):
+            digest = hashlib.blake2b(b"".join(h.digest() for h in hashers), digest_size=16).hexdigest()
+            out[year] = {"rows": rows, "checksum": digest}
+        return out
+
+
+def panel_checksums(panel: pd.DataFrame, decimals: int | None = None) -> Dict[int, dict]:
+    """PartitionChecksums of a wide panel, equal to what LongFactorWriter records when saving it."""
+    import pyarrow as pa
+
+    sums = PartitionChecksums(decimals)
+    panel = panel.sort_index()
+    values = panel.to_numpy(dtype=float)
+    tickers = np.asarray(panel.columns.astype(str), dtype=object)
+    order = np.argsort(tickers, kind="stable")
+    values, tickers = values[:, order], tickers[order]
+    d_idx, t_idx = np.nonzero(~np.isnan(values))
+    dates = pd.to_datetime(pd.Index(panel.index)).values.astype("datetime64[D]")
+    sums.update(dates[d_idx], pa.array(tickers[t_idx], type=pa.string()), values[d_idx, t_idx])
+    return sums.result()
+
+
+_CHECKSUM_KEY = b"quantlab.checksums"
+
+
+class LongFactorWriter:
+    """
+    Append wide Date x Ticker blocks to a long factor file (Date, Ticker, Value; the save_factor
+    layout FactorStore reads), one row group per block. Blocks should arrive in date order.
+    Rows go to <path>.tmp, which replaces path on close(); on error the partial file is removed.
+    Per-year PartitionChecksums are stored in the file's footer metadata (read by diff_runs).
+    """
+
+    def __init__(self, path: Path, compression: str = "snappy", decimals: int | None = None):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.compression = compression
+        self.rows = 0
+        self.checksums = PartitionChecksums(decimals)
+        self._writer = None
+
+    def write(self, block: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        values = block.to_numpy(dtype=float)
+        tickers = np.asarray(block.columns.astype(str), dtype=object)
+        if len(tickers) > 1 and not (tickers[:-1] <= tickers[1:]).all():
+            order = np.argsort(tickers, kind="stable")  # rows in (date, ticker) order for the checksums
+            values, tickers = values[:, order], tickers[order]
+        d_idx, t_idx = np.nonzero(~np.isnan(values))  # row-major: (date, ticker) order like stack()
+        dates = pd.to_datetime(pd.Index(block.index)).values.astype("datetime64[D]")
+        table = pa.table(
+            {
+                "Date": pa.array(dates[d_idx], type=pa.date32()),
+                "Ticker": pa.array(tickers[t_idx], type=pa.string()),
+                "Value": pa.array(values[d_idx, t_idx], type=pa.float64()),
+            }
+        )
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.tmp_path, table.schema, compression=self.compression)
+        self._writer.write_table(table)
+        self.checksums.update(dates[d_idx], table.column("Ticker").chunk(0), table.column("Value").chunk(0).to_numpy())
+        self.rows += table.num_rows
+
+    def close(self) -> Path:
+        import json
+
+        if self._writer is None:  # nothing written: still replace any stale file with an empty one
+            self.write(pd.DataFrame(index=pd.DatetimeIndex([]), columns=pd.Index([], dtype=object), dtype=float))
+        meta = {"decimals": self.checksums.decimals, "partitions": self.checksums.result()}
+        self._writer.add_key_value_metadata({_CHECKSUM_KEY: json.dumps(meta)})
+        self._writer.close()
+        self._writer = None
+        self.tmp_path.replace(self.path)
+        logger.info("Saved %d rows to %s", self.rows, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "LongFactorWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def output_formats() -> tuple[str, ...]:
+    """
+    Output formats ("output_formats" in config): "parquet" and/or "arrow" for the per-factor and
+    LS files save_factor / save_ls_returns write, plus optionally "dataset" for the run's
+    multi-factor dataset (write_factor_dataset), which compute_factors only writes when asked.
+    """
+    formats = tuple(_load_config().get("output_formats", ["parquet"]))
+    unknown = [f for f in formats if f not in ("parquet", "arrow", "dataset")]
+    if unknown or not ("parquet" in formats or "arrow" in formats):
+        raise ValueError(
+            f"output_formats must include 'parquet' or 'arrow' (optionally 'dataset'), got {list(formats)}"
+        )
+    return formats
+
+
+def _write_arrow(table, path: Path) -> Path:
+    """Uncompressed Arrow IPC file (Feather v2) in one record batch, replaced atomically."""
+    import pyarrow as pa
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table.combine_chunks())
+    tmp.replace(path)
+    return path
+
+
+def write_wide_arrow(panel: pd.DataFrame, path: Path) -> Path:
+    """
+    Save a wide Date x Ticker panel column-major: a date32 "Date" column and one float64 column
+    per ticker (NaN, not null, for missing cells) so read_wide_arrow can map the file and hand
+    out zero-copy NumPy views. All-NaN dates/tickers are dropped and tickers sorted, matching
+    what FactorStore reads back from the long parquet layout.
+    """
+    import pyarrow as pa
+
+    values = panel.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    rows, cols = present.any(axis=1), present.any(axis=0)
+    tickers = pd.Index(panel.columns[cols].astype(str))
+    order = np.argsort(tickers.to_numpy(), kind="stable")
+    values = values[rows][:, np.flatnonzero(cols)[order]]
+    dates = pd.to_datetime(pd.Index(panel.index[rows])).values.astype("datetime64[D]")
+    date_order = np.argsort(dates, kind="stable")
+    values = np.asfortranarray(values[date_order])
+    arrays = {"Date": pa.array(dates[date_order], type=pa.date32())}
+    for j, ticker in enumerate(tickers[order]):
+        arrays[ticker] = pa.array(values[:, j], type=pa.float64())
+    return _write_arrow(pa.table(arrays), path)
+
+
+def long_to_wide_arrow(source: Path, path: Path) -> Path:
+    """
+    write_wide_arrow layout from a long factor parquet (LongFactorWriter / save_factor), one
+    record batch per row group so only one date block is pivoted at a time. Assumes row groups
+    hold disjoint, increasing date ranges, as LongFactorWriter writes them.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(str(source))
+    tickers = sorted(pq.read_table(str(source), columns=["Ticker"]).column("Ticker").unique().to_pylist())
+    schema = pa.schema([("Date", pa.date32())] + [(t, pa.float64()) for t in tickers])
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for i in range(parquet.num_row_groups):
+            long = parquet.read_row_group(i, columns=_LONG_FACTOR_COLUMNS).to_pandas()
+            if long.empty:
+                continue
+            wide = long.pivot(index="Date", columns="Ticker", values="Value").sort_index().reindex(columns=tickers)
+            dates = pd.to_datetime(pd.Index(wide.index)).values.astype("datetime64[D]")
+            arrays = [pa.array(dates, type=pa.date32())]
+            arrays += [pa.array(wide[t].to_numpy(dtype=float), type=pa.float64()) for t in tickers]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+    tmp.replace(path)
+    return path
+
+
+def write_ls_arrow(ls: pd.Series, path: Path) -> Path:
+    """LS PnL as an Arrow IPC file with the parquet columns (Date, LS_Return)."""
+    import pyarrow as pa
+
+    dates = pd.to_datetime(pd.Index(ls.index)).values.astype("datetime64[D]")
+    table = pa.table({"Date": pa.array(dates, type=pa.date32()), "LS_Return": pa.array(ls.to_numpy(dtype=float))})
+    return _write_arrow(table, path)
+
+
+def _read_arrow(path: Path, memory_map: bool = True):
+    import pyarrow as pa
+
+    source = pa.memory_map(str(path), "r") if memory_map else pa.OSFile(str(path), "rb")
+    return pa.ipc.open_file(source).read_all()
+
+
+def read_wide_arrow(
+    path: Path,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    tickers: Optional[Iterable[str]] = None,
+    memory_map: bool = True,
+) -> pd.DataFrame:
+    """
+    Wide panel written by write_wide_arrow. With memory_map the ticker columns are read-only
+    NumPy views of the mapped file (no decompression, no pivot, no copy); the frame keeps one
+    block per ticker, so call .copy() before heavy row-wise work. Date and ticker filters slice
+    the mapping; dates/tickers left all-NaN by the filter are dropped like FactorStore.load.
+    """
+    table = _read_arrow(path, memory_map=memory_map)
+    dates = np.asarray(table.column("Date").to_numpy(), dtype="datetime64[D]")
+    lo = 0 if start_date is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date).date()), "left"))
+    hi = len(dates) if end_date is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date).date()), "right"))
+    names = table.column_names[1:]
+    if tickers is not None:
+        wanted = {str(t) for t in tickers}
+        names = [n for n in names if n in wanted]
+    table = table.slice(lo, hi - lo)
+    columns = {}
+    for name in names:
+        col = table.column(name)
+        arr = col.chunk(0).to_numpy(zero_copy_only=True) if col.num_chunks == 1 else col.to_numpy()
+        if not np.isnan(arr).all():
+            columns[name] = arr
+    index = pd.Index(table.column("Date").to_pylist(), dtype=object)
+    wide = pd.DataFrame(columns, index=index, columns=pd.Index(list(columns), dtype=object), dtype=float, copy=False)
+    if wide.shape[1] and (start_date is not None or end_date is not None or tickers is not None):
+        present = wide.notna().any(axis=1).to_numpy()
+        if not present.all():
+            wide = wide[present]
+    return wide
+
+
+def read_ls_arrow(path: Path, start_date: Optional[date] = None, end_date: Optional[date] = None) -> pd.Series:
+    df = _read_arrow(path).to_pandas()
+    if start_date is not None:
+        df = df[df["Date"] >= pd.Timestamp(start_date).date()]
+    if end_date is not None:
+        df = df[df["Date"] <= pd.Timestamp(end_date).date()]
+    return df.set_index("Date")["LS_Return"].rename(None)
+
+
+_LONG_FACTOR_COLUMNS = ["Date", "Ticker", "Value"]
+_LS_COLUMNS = ["Date", "LS_Return"]
+
+
+def _parquet_filters(start_date=None, end_date=None, tickers=None) -> list | None:
+    filters = []
+    if start_date is not None:
+        filters.append(("Date", ">=", pd.Timestamp(start_date).date()))
+    if end_date is not None:
+        filters.append(("Date", "<=", pd.Timestamp(end_date).date()))
+    if tickers is not None:
+        filters.append(("Ticker", "in", [str(t) for t in tickers]))
+    return filters or None
+
+
+class FactorStore(Mapping):
+    """
+    Lazy, read-only view of persisted factor outputs in factors_dir():
+    factor_<name>.parquet (long Date, Ticker, Value) and ls_<name>.parquet (Date, LS_Return),
+    or their Arrow IPC counterparts factor_<name>.arrow / ls_<name>.arrow. An .arrow file at
+    least as new as the parquet one is memory-mapped instead (see read_wide_arrow).
+
+    Behaves like the {name: wide DataFrame} dict returned by compute_factors, so it can be passed
+    straight to run_analytics_only, compute_correlations_only or run_composite_pipeline. Panels are
+    read and pivoted on first access, filtered at read time to the store's date/ticker slice, and
+    kept in an LRU cache of `cache_size` panels.
+
+    With `history` (a FactorHistory) the factor panels come from the date-partitioned history
+    instead of the per-factor files; LS returns and FF factors are still read from `root`.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        cache_size: int = 8,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        tickers: Optional[Iterable[str]] = None,
+        names: Optional[Iterable[str]] = None,
+        history: Optional["FactorHistory"] = None,
+    ):
+        self.root = Path(root) if root is not None else factors_dir()
+        self.history = history
+        self.cache_size = cache_size
+        self.start_date = start_date
+        self.end_date = end_date
+        self.tickers = list(tickers) if tickers is not None else None
+        self._names = list(names) if names is not None else None
+        self._cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._factor_files: Optional[Dict[str, Path]] = None
+
+    # ------------------------------------------------------------------ discovery
+    def _files(self, prefix: str, columns: list[str]) -> Dict[str, Path]:
+        import pyarrow.parquet as pq
+
+        out = {}
+        for path in sorted(self.root.glob(f"{prefix}*.parquet")):
+            try:
+                if pq.read_schema(path).names[: len(columns)] != columns:
+                    continue  # registry/correlation/FF files share the factor_ prefix
+            except Exception:
+                continue
+            out[path.stem[len(prefix) :]] = path
+        return out
+
+    def _arrow_path(self, prefix: str, name: str) -> Optional[Path]:
+        """prefix<name>.arrow when present and not older than prefix<name>.parquet."""
+        arrow, parquet = self.root / f"{prefix}{name}.arrow", self.root / f"{prefix}{name}.parquet"
+        if not arrow.exists():
+            return None
+        if parquet.exists() and parquet.stat().st_mtime > arrow.stat().st_mtime:
+            return None
+        return arrow
+
+    def list_factors(self) -> list[str]:
+        if self._factor_files is None and self.history is not None:
+            self._factor_files = {name: self.history.root / name for name in self.history.names()}
+        if self._factor_files is None:
+            found = self._files("factor_", _LONG_FACTOR_COLUMNS)
+            for path in sorted(self.root.glob("factor_*.arrow")):
+                found.setdefault(path.stem[len("factor_") :], path)
+            self._factor_files = found
+        found = self._factor_files
+        if self._names is not None:
+            return [n for n in self._names if n in found]
+        return list(found)
+
+    def list_ls(self) -> list[str]:
+        found = list(self._files("ls_", _LS_COLUMNS))
+        return found + [p.stem[len("ls_") :] for p in sorted(self.root.glob("ls_*.arrow")) if p.stem[len("ls_") :] not in found]
+
+    # ------------------------------------------------------------------ loading
+    def load(
+        self,
+        name: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        tickers: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Read one factor as a wide Date x Ticker panel, filtering dates/tickers at read time."""
+        if self.history is not None:
+            return self.history.load(name, start_date, end_date, tickers)
+        arrow = self._arrow_path("factor_", name)
+        if arrow is not None:
+            return read_wide_arrow(arrow, start_date, end_date, tickers)
+        path = self.root / f"factor_{name}.parquet"
+        if not path.exists():
+            raise KeyError(name)
+        df = pd.read_parquet(path, columns=_LONG_FACTOR_COLUMNS, filters=_parquet_filters(start_date, end_date, tickers))
+        wide = df.pivot(index="Date", columns="Ticker", values="Value").sort_index()
+        wide.index.name = None
+        wide.columns.name = None
+        return wide
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        if name in self._cache:
+            self._cache.move_to_end(name)
+            return self._cache[name]
+        panel = self.load(name, self.start_date, self.end_date, self.tickers)
+        if self.cache_size > 0:
+            self._cache[name] = panel
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return panel
+
+    def __iter__(self):
+        return iter(self.list_factors())
+
+    def __len__(self) -> int:
+        return len(self.list_factors())
+
+    def __contains__(self, name) -> bool:
+        if self.history is not None:
+            return name in self.list_factors()
+        exists = (self.root / f"factor_{name}.parquet").exists() or (self.root / f"factor_{name}.arrow").exists()
+        return exists and (self._names is None or name in self._names)
+
+    def select(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        tickers: Optional[Iterable[str]] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> "FactorStore":
+        """New store over the same files restricted to a date/ticker/factor slice."""
+        return FactorStore(
+            self.root,
+            cache_size=self.cache_size,
+            start_date=start_date if start_date is not None else self.start_date,
+            end_date=end_date if end_date is not None else self.end_date,
+            tickers=tickers if tickers is not None else self.tickers,
+            names=names if names is not None else self._names,
+            history=self.history,
+        )
+
+    def axes(self) -> tuple[pd.Index, pd.Index]:
+        """Sorted union of dates and tickers over the store's factors, read from the key columns only."""
+        dates, tickers = pd.Index([]), pd.Index([])
+        for name in self.list_factors():
+            if self.history is not None:
+                d, t = self.history.axes(name, self.start_date, self.end_date, self.tickers)
+                dates, tickers = dates.union(d), tickers.union(t)
+                continue
+            if self._arrow_path("factor_", name) is not None:
+                panel = self.load(name, self.start_date, self.end_date, self.tickers)
+                dates, tickers = dates.union(panel.index), tickers.union(panel.columns)
+                continue
+            keys = pd.read_parquet(
+                self._factor_files[name],
+                columns=["Date", "Ticker"],
+                filters=_parquet_filters(self.start_date, self.end_date, self.tickers),
+            )
+            dates = dates.union(pd.Index(keys["Date"].unique()))
+            tickers = tickers.union(pd.Index(keys["Ticker"].unique()))
+        return dates.sort_values(), tickers.sort_values()
+
+    def checksums(self, names: Optional[Iterable[str]] = None, decimals: int | None = None) -> Dict[str, Dict[int, dict]]:
+        """
+        {factor: {year: {"rows", "checksum"}}} over whole files (the store's slice is ignored), read
+        from the parquet footers LongFactorWriter writes; files without them (older runs, Arrow-only
+        or composite outputs) are loaded and hashed.
+        """
+        import json
+
+        import pyarrow.parquet as pq
+
+        decimals = checksum_decimals() if decimals is None else int(decimals)
+        out = {}
+        for name in names if names is not None else self.list_factors():
+            path = self.root / f"factor_{name}.parquet"
+            meta = None
+            if self.history is None and path.exists() and self._arrow_path("factor_", name) is None:
+                raw = (pq.read_metadata(path).metadata or {}).get(_CHECKSUM_KEY)
+                meta = json.loads(raw) if raw else None
+            if meta is not None and meta.get("decimals") == decimals:
+                out[name] = {int(year): part for year, part in meta["partitions"].items()}
+            else:
+                logger.debug("No stored checksums for %s in %s; hashing the loaded panel", name, self.root)
+                out[name] = panel_checksums(self.load(name), decimals)
+        return out
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def ls_returns(self, names: Optional[Iterable[str]] = None) -> Dict[str, pd.Series]:
+        """Load persisted LS PnL series as {name: Series indexed by date}."""
+        wanted = list(names) if names is not None else self.list_ls()
+        out = {}
+        for name in wanted:
+            arrow = self._arrow_path("ls_", name)
+            if arrow is not None:
+                out[name] = read_ls_arrow(arrow, self.start_date, self.end_date)
+                continue
+            path = self.root / f"ls_{name}.parquet"
+            if not path.exists():
+                continue
+            df = pd.read_parquet(path, filters=_parquet_filters(self.start_date, self.end_date))
+            out[name] = df.set_index("Date")["LS_Return"].rename(None)
+        return out
+
+    def ff(self) -> Optional[pd.DataFrame]:
+        """FF factor time series saved by compute_factors (None when absent)."""
+        path = self.root / "factor_ff_timeseries.parquet"
+        return pd.read_parquet(path) if path.exists() else None
+
+
+class FactorHistory:
+    """
+    Append-only, date-partitioned factor history for daily production runs:
+    <root>/<factor>/year=YYYY/month=MM/part-<seq>.parquet, each part a long Date/Ticker/Value
+    file (the save_factor layout). append() writes only new part files, so a nightly run touches
+    the current month; load() reads only the months overlapping the requested range.
+
+    Parts are numbered per factor; when several parts hold the same date, the highest-numbered
+    one wins for that whole date (restated cross-sections replace earlier ones). Parts store only
+    non-NaN cells, so a restated date that is entirely NaN writes nothing and cannot clear the
+    older values; drop such a date by rewriting the month. compact() merges a month's parts into
+    one file with the same content; readers that listed a month before a concurrent compact()
+    removed its parts re-list it once.
+    """
+
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root is not None else factor_history_dir()
+
+    # ------------------------------------------------------------------ layout
+    def names(self) -> list[str]:
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir()) if self.root.exists() else []
+
+    def _months(self, name: str) -> Dict[tuple[int, int], list[Path]]:
+        """{(year, month): part files in sequence order}."""
+        months: Dict[tuple[int, int], list[Path]] = {}
+        for part in (self.root / name).glob("year=*/month=*/part-*.parquet"):
+            year = int(part.parent.parent.name.split("=")[1])
+            month = int(part.parent.name.split("=")[1])
+            months.setdefault((year, month), []).append(part)
+        return {key: sorted(parts, key=self._seq) for key, parts in sorted(months.items())}
+
+    @staticmethod
+    def _seq(part: Path) -> int:
+        return int(part.stem.split("-")[1])
+
+    def _next_seq(self, name: str) -> int:
+        parts = [p for parts in self._months(name).values() for p in parts]
+        return max((self._seq(p) for p in parts), default=0) + 1
+
+    def _part_path(self, name: str, year: int, month: int, seq: int) -> Path:
+        return self.root / name / f"year={year:04d}" / f"month={month:02d}" / f"part-{seq:08d}.parquet"
+
+    # ------------------------------------------------------------------ writing
+    def append(self, name: str, panel: pd.DataFrame) -> int:
+        """Write a wide Date x Ticker panel as one new part per month it covers; returns rows written."""
+        if panel.empty:
+            return 0
+        stamps = pd.to_datetime(pd.Index(panel.index))
+        keys = stamps.year * 100 + stamps.month
+        seq = self._next_seq(name)
+        rows = 0
+        for key in np.unique(keys):
+            block = panel[keys == key].sort_index()
+            with LongFactorWriter(self._part_path(name, int(key) // 100, int(key) % 100, seq)) as writer:
+                writer.write(block)
+            rows += writer.rows
+        logger.info("Appended %d rows of %s to history %s", rows, name, self.root / name)
+        return rows
+
+    def last_date(self, name: str) -> Optional[date]:
+        """Latest date in the history (None when empty); reads the last month's Date column only."""
+        months = self._months(name)
+        for key, parts in reversed(list(months.items())):
+            dates = self._load_month(name, key, parts, columns=["Date"])
+            if dates is not None and not dates.empty:
+                return dates["Date"].max()
+        return None
+
+    def compact(self, names: Optional[Iterable[str]] = None, min_parts: int = 2) -> int:
+        """Merge every month with at least min_parts parts into a single part; returns months merged."""
+        merged = 0
+        for name in names if names is not None else self.names():
+            for (year, month), parts in self._months(name).items():
+                if len(parts) < max(2, min_parts):
+                    continue
+                df = self._read_month(parts)
+                panel = df.pivot(index="Date", columns="Ticker", values="Value").sort_index()
+                # The merged part is numbered last and written before the old parts are removed, so
+                # a reader that listed the month earlier finds it when it re-lists (_load_month)
+                with LongFactorWriter(self._part_path(name, year, month, self._next_seq(name))) as writer:
+                    writer.write(panel)
+                for part in parts:
+                    part.unlink()
+                merged += 1
+            logger.info("Compacted history of %s (%d months merged so far)", name, merged)
+        return merged
+
+    # ------------------------------------------------------------------ reading
+    @staticmethod
+    def _read_month(parts: list[Path], filters: list | None = None, columns: list[str] | None = None) -> pd.DataFrame:
+        """Rows of one month's parts, keeping each date from the highest-numbered part that has it."""
+        frames = []
+        for seq, part in enumerate(parts):
+            df = pd.read_parquet(part, columns=columns or _LONG_FACTOR_COLUMNS, filters=filters)
+            frames.append(df.assign(_part=seq))
+        df = pd.concat(frames, ignore_index=True)
+        if len(parts) > 1:
+            latest = df.groupby("Date")["_part"].transform("max")
+            df = df[df["_part"] == latest]
+        return df.drop(columns="_part")
+
+    def _load_month(
+        self,
+        name: str,
+        key: tuple[int, int],
+        parts: list[Path],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        tickers: Optional[Iterable[str]] = None,
+        columns: list[str] | None = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        _read_month of a listed month, filtered like load(); None when no parts are left. A part
+        removed by a concurrent compact() makes it re-list the month once and read again.
+        """
+        for attempt in range(2):
+            # With several parts a date is resolved on all tickers before the ticker filter applies
+            pushed = tickers if len(parts) == 1 else None
+            try:
+                df = self._read_month(parts, _parquet_filters(start_date, end_date, pushed), columns)
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                parts = self._months(name).get(key)
+                if not parts:
+                    return None
+                continue
+            if tickers is not None and pushed is None:
+                df = df[df["Ticker"].isin([str(t) for t in tickers])]
+            return df
+        return None
+
+    def _frames(self, name: str, start_date=None, end_date=None, tickers=None, columns=None) -> list[pd.DataFrame]:
+        """Resolved long rows of the months overlapping [start_date, end_date]."""
+        lo = pd.Timestamp(start_date) if start_date is not None else None
+        hi = pd.Timestamp(end_date) if end_date is not None else None
+        frames = []
+        for (year, month), parts in self._months(name).items():
+            if lo is not None and (year, month) < (lo.year, lo.month):
+                continue
+            if hi is not None and (year, month) > (hi.year, hi.month):
+                continue
+            df = self._load_month(name, (year, month), parts, start_date, end_date, tickers, columns)
+            if df is not None:
+                frames.append(df)
+        return frames
+
+    def axes(self, name: str, start_date=None, end_date=None, tickers=None) -> tuple[pd.Index, pd.Index]:
+        """Sorted dates and tickers of load(name, ...), read from the key columns only."""
+        frames = self._frames(name, start_date, end_date, tickers, columns=["Date", "Ticker"])
+        if not frames:
+            return pd.Index([]), pd.Index([])
+        keys = pd.concat(frames, ignore_index=True)
+        return pd.Index(keys["Date"].unique()).sort_values(), pd.Index(keys["Ticker"].unique()).sort_values()
+
+    def load(
+        self,
+        name: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        tickers: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Wide Date x Ticker panel from the months overlapping [start_date, end_date] (as FactorStore.load)."""
+        frames = self._frames(name, start_date, end_date, tickers)
+        if not frames:
+            if name not in self.names():
+                raise KeyError(name)
+            return pd.DataFrame(index=pd.Index([], dtype=object), columns=pd.Index([], dtype=object), dtype=float)
+        df = pd.concat(frames, ignore_index=True)
+        wide = df.pivot(index="Date", columns="Ticker", values="Value").sort_index()
+        wide.index.name = None
+        wide.columns.name = None
+        return wide
+
+
+_DIFF_COLUMNS = ["factor", "year", "status", "rows_a", "rows_b", "n_changed_dates", "first_changed_date", "max_abs_diff"]
+
+
+def diff_runs(
+    run_a: Path | FactorStore,
+    run_b: Path | FactorStore,
+    names: Optional[Iterable[str]] = None,
+    drill: bool = True,
+    decimals: int | None = None,
+) -> pd.DataFrame:
+    """
+    Factors and years that differ between two runs (factors directories or FactorStores),
+    compared by FactorStore.checksums, so unchanged partitions are never read. One row per
+    differing (factor, year) with status "changed", "added" (only in run_b) or "removed";
+    with drill, changed years of both runs are loaded and compared at the checksum rounding:
+    the number of dates that differ, the first one, and the max absolute difference (cells
+    present in only one run count as changed dates but not towards max_abs_diff).
+    """
+    decimals = checksum_decimals() if decimals is None else int(decimals)
+    store_a = run_a if isinstance(run_a, FactorStore) else FactorStore(run_a, cache_size=0)
+    store_b = run_b if isinstance(run_b, FactorStore) else FactorStore(run_b, cache_size=0)
+    if names is None:
+        names = sorted(set(store_a.list_factors()) | set(store_b.list_factors()))
+    names = list(names)
+    sums_a = store_a.checksums([n for n in names if n in store_a], decimals)
+    sums_b = store_b.checksums([n for n in names if n in store_b], decimals)
+
+    rows = []
+    for name in names:
+        parts_a, parts_b = sums_a.get(name, {}), sums_b.get(name, {})
+        for year in sorted(set(parts_a) | set(parts_b)):
+            a, b = parts_a.get(year), parts_b.get(year)
+            if a is not None and b is not None and a["checksum"] == b["checksum"]:
+                continue
+            row = {
+                "factor": name,
+                "year": year,
+                "status": "added" if a is None else "removed" if b is None else "changed",
+                "rows_a": a["rows"] if a is not None else 0,
+                "rows_b": b["rows"] if b is not None else 0,
+                "n_changed_dates": None,
+                "first_changed_date": None,
+                "max_abs_diff": None,
+            }
+            if drill and row["status"] == "changed":
+                start, end = date(year, 1, 1), date(year, 12, 31)
+                left, right = store_a.load(name, start, end).align(store_b.load(name, start, end), join="outer")
+                x = np.round(left.to_numpy(dtype=float), decimals)
+                y = np.round(right.to_numpy(dtype=float), decimals)
+                both = ~np.isnan(x) & ~np.isnan(y)
+                changed = (np.isnan(x) != np.isnan(y)) | (both & (x != y))
+                changed_dates = left.index[changed.any(axis=1)]
+                row["n_changed_dates"] = len(changed_dates)
+                row["first_changed_date"] = changed_dates[0] if len(changed_dates) else None
+                row["max_abs_diff"] = float(np.abs(x - y)[both].max()) if both.any() else 0.0
+            rows.append(row)
+    logger.info("diff_runs: %d differing factor-years over %d factors", len(rows), len(names))
+    return pd.DataFrame(rows, columns=_DIFF_COLUMNS)
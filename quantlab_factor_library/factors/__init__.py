@@ -1,114 +1,155 @@
-from .momentum import Momentum
-from .volatility import Volatility
-from .mean_reversion import MeanReversion
-from .dollar_volume import DollarVolume
-from .size import Size
-from .earnings_yield import EarningsYield
-from .profitability import Profitability
-from .dividend_yield import DividendYield
-from .beta import Beta
-from .analyst_revision import AnalystRevision
-from .earnings_surprise import EarningsSurprise
-from .turnover import Turnover
-from .downside_vol import DownsideVol
-from .high52w_proximity import High52wProximity
-from .amihud_illiquidity import AmihudIlliquidity
-from .amihud_illiq_log import AmihudIlliquidityLog
-from .coskewness import Coskewness
-from .book_to_price import BookToPrice
-from .roa import ReturnOnAssets
-from .leverage import Leverage
-from .sales_growth import SalesGrowth
-from .asset_growth import AssetGrowth
-from .residual_vol import ResidualVol
-from .cashflow_yield import CashflowYield
-from .free_cashflow_yield import FreeCashflowYield
-from .accruals import Accruals
-from .rd_intensity import RDIntensity
-from .net_issuance import NetIssuance
-from .skewness import ReturnSkewness
-from .kurtosis import ReturnKurtosis
-from .dividend_growth import DividendGrowth
-from .downside_beta import DownsideBeta
-from .idiosyncratic_volatility import IdiosyncraticVolatility
-from .residual_momentum import ResidualMomentum
-from .efficiency_ratio import EfficiencyRatio
-from .gross_profitability import GrossProfitability
-from .sales_growth_accel import SalesGrowthAcceleration
-from .net_buyback_yield import NetBuybackYield
-from .industry_momentum import IndustryMomentum
-from .max_daily_return import MaxDailyReturn
-from .ev_to_ebitda import EVToEBITDA
-from .investment_to_assets import InvestmentToAssets
-from .composite_momentum import CompositeMomentum
-from .industry_co_momentum import IndustryCoMomentum
-from .volume_inclusive_icm import VolumeInclusiveICM
-from .industry_co_reversal import IndustryCoReversal
-from .size_proxies import LogTotalAssets, LogEnterpriseValue, LogRevenue
-from .piotroski_fscore import PiotroskiFScore
-from .atr import AverageTrueRange
-from .obv import OnBalanceVolume
-from .vwap_deviation import VWAPDeviation
-from .hurst_exponent import HurstExponent
-from .sue import StandardizedUnexpectedEarnings
-from .benford import BenfordChiSquareD1, BenfordChiSquareD2
+"""
+Factor classes, imported lazily: `from quantlab_factor_library.factors import Momentum` loads
+only factors/momentum.py (and its own dependencies) on first access instead of every factor
+module. Register a new factor by adding its class name and module to _REGISTRY.
+"""
 
-__all__ = [
-    "Momentum",
-    "Volatility",
-    "MeanReversion",
-    "DollarVolume",
-    "Size",
-    "EarningsYield",
-    "Profitability",
-    "DividendYield",
-    "Beta",
-    "AnalystRevision",
-    "EarningsSurprise",
-    "Turnover",
-    "DownsideVol",
-    "High52wProximity",
-    "AmihudIlliquidity",
-    "AmihudIlliquidityLog",
-    "Coskewness",
-    "BookToPrice",
-    "ReturnOnAssets",
-    "Leverage",
-    "SalesGrowth",
-    "AssetGrowth",
-    "ResidualVol",
-    "CashflowYield",
-    "FreeCashflowYield",
-    "Accruals",
-    "RDIntensity",
-    "NetIssuance",
-    "ReturnSkewness",
-    "ReturnKurtosis",
-    "DividendGrowth",
-    "DownsideBeta",
-    "IdiosyncraticVolatility",
-    "ResidualMomentum",
-    "EfficiencyRatio",
-    "GrossProfitability",
-    "SalesGrowthAcceleration",
-    "NetBuybackYield",
-    "IndustryMomentum",
-    "CompositeMomentum",
-    "IndustryCoMomentum",
-    "VolumeInclusiveICM",
-    "IndustryCoReversal",
-    "MaxDailyReturn",
-    "EVToEBITDA",
-    "InvestmentToAssets",
-    "LogTotalAssets",
-    "LogEnterpriseValue",
-    "LogRevenue",
-    "PiotroskiFScore",
-    "AverageTrueRange",
-    "OnBalanceVolume",
-    "VWAPDeviation",
-    "HurstExponent",
-    "StandardizedUnexpectedEarnings",
-    "BenfordChiSquareD1",
-    "BenfordChiSquareD2",
-]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+# class name -> module in this package
+_REGISTRY = {
+    "Momentum": "momentum",
+    "Volatility": "volatility",
+    "MeanReversion": "mean_reversion",
+    "DollarVolume": "dollar_volume",
+    "Size": "size",
+    "EarningsYield": "earnings_yield",
+    "Profitability": "profitability",
+    "DividendYield": "dividend_yield",
+    "Beta": "beta",
+    "AnalystRevision": "analyst_revision",
+    "EarningsSurprise": "earnings_surprise",
+    "Turnover": "turnover",
+    "DownsideVol": "downside_vol",
+    "High52wProximity": "high52w_proximity",
+    "AmihudIlliquidity": "amihud_illiquidity",
+    "AmihudIlliquidityLog": "amihud_illiq_log",
+    "Coskewness": "coskewness",
+    "BookToPrice": "book_to_price",
+    "ReturnOnAssets": "roa",
+    "Leverage": "leverage",
+    "SalesGrowth": "sales_growth",
+    "AssetGrowth": "asset_growth",
+    "ResidualVol": "residual_vol",
+    "CashflowYield": "cashflow_yield",
+    "FreeCashflowYield": "free_cashflow_yield",
+    "Accruals": "accruals",
+    "RDIntensity": "rd_intensity",
+    "NetIssuance": "net_issuance",
+    "ReturnSkewness": "skewness",
+    "ReturnKurtosis": "kurtosis",
+    "DividendGrowth": "dividend_growth",
+    "DownsideBeta": "downside_beta",
+    "IdiosyncraticVolatility": "idiosyncratic_volatility",
+    "ResidualMomentum": "residual_momentum",
+    "EfficiencyRatio": "efficiency_ratio",
+    "GrossProfitability": "gross_profitability",
+    "SalesGrowthAcceleration": "sales_growth_accel",
+    "NetBuybackYield": "net_buyback_yield",
+    "IndustryMomentum": "industry_momentum",
+    "CompositeMomentum": "composite_momentum",
+    "IndustryCoMomentum": "industry_co_momentum",
+    "VolumeInclusiveICM": "volume_inclusive_icm",
+    "IndustryCoReversal": "industry_co_reversal",
+    "MaxDailyReturn": "max_daily_return",
+    "EVToEBITDA": "ev_to_ebitda",
+    "InvestmentToAssets": "investment_to_assets",
+    "LogTotalAssets": "size_proxies",
+    "LogEnterpriseValue": "size_proxies",
+    "LogRevenue": "size_proxies",
+    "PiotroskiFScore": "piotroski_fscore",
+    "AverageTrueRange": "atr",
+    "OnBalanceVolume": "obv",
+    "VWAPDeviation": "vwap_deviation",
+    "HurstExponent": "hurst_exponent",
+    "StandardizedUnexpectedEarnings": "sue",
+    "BenfordChiSquareD1": "benford",
+    "BenfordChiSquareD2": "benford",
+    "FFLoading": "ff_loadings",
+    "MultiFactorResidualVol": "ff_loadings",
+    "MultiFactorResidualMomentum": "ff_loadings",
+}
+
+__all__ = list(_REGISTRY)
+
+
+def factor_class(class_name: str) -> type:
+    """Import (on first use) and return a factor class by class name."""
+    try:
+        module = _REGISTRY[class_name]
+    except KeyError:
+        raise AttributeError(f"Unknown factor class {class_name!r}") from None
+    cls = getattr(importlib.import_module(f".{module}", __name__), class_name)
+    globals()[class_name] = cls  # cache so later lookups skip __getattr__
+    return cls
+
+
+def __getattr__(name: str):
+    if name in _REGISTRY:
+        return factor_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_REGISTRY))
+
+
+if TYPE_CHECKING:  # static analysers and IDEs see the eager imports
+    from .momentum import Momentum
+    from .volatility import Volatility
+    from .mean_reversion import MeanReversion
+    from .dollar_volume import DollarVolume
+    from .size import Size
+    from .earnings_yield import EarningsYield
+    from .profitability import Profitability
+    from .dividend_yield import DividendYield
+    from .beta import Beta
+    from .analyst_revision import AnalystRevision
+    from .earnings_surprise import EarningsSurprise
+    from .turnover import Turnover
+    from .downside_vol import DownsideVol
+    from .high52w_proximity import High52wProximity
+    from .amihud_illiquidity import AmihudIlliquidity
+    from .amihud_illiq_log import AmihudIlliquidityLog
+    from .coskewness import Coskewness
+    from .book_to_price import BookToPrice
+    from .roa import ReturnOnAssets
+    from .leverage import Leverage
+    from .sales_growth import SalesGrowth
+    from .asset_growth import AssetGrowth
+    from .residual_vol import ResidualVol
+    from .cashflow_yield import CashflowYield
+    from .free_cashflow_yield import FreeCashflowYield
+    from .accruals import Accruals
+    from .rd_intensity import RDIntensity
+    from .net_issuance import NetIssuance
+    from .skewness import ReturnSkewness
+    from .kurtosis import ReturnKurtosis
+    from .dividend_growth import DividendGrowth
+    from .downside_beta import DownsideBeta
+    from .idiosyncratic_volatility import IdiosyncraticVolatility
+    from .residual_momentum import ResidualMomentum
+    from .efficiency_ratio import EfficiencyRatio
+    from .gross_profitability import GrossProfitability
+    from .sales_growth_accel import SalesGrowthAcceleration
+    from .net_buyback_yield import NetBuybackYield
+    from .industry_momentum import IndustryMomentum
+    from .max_daily_return import MaxDailyReturn
+    from .ev_to_ebitda import EVToEBITDA
+    from .investment_to_assets import InvestmentToAssets
+    from .composite_momentum import CompositeMomentum
+    from .industry_co_momentum import IndustryCoMomentum
+    from .volume_inclusive_icm import VolumeInclusiveICM
+    from .industry_co_reversal import IndustryCoReversal
+    from .size_proxies import LogTotalAssets, LogEnterpriseValue, LogRevenue
+    from .piotroski_fscore import PiotroskiFScore
+    from .atr import AverageTrueRange
+    from .obv import OnBalanceVolume
+    from .vwap_deviation import VWAPDeviation
+    from .hurst_exponent import HurstExponent
+    from .sue import StandardizedUnexpectedEarnings
+    from .benford import BenfordChiSquareD1, BenfordChiSquareD2
+    from .ff_loadings import FFLoading, MultiFactorResidualVol, MultiFactorResidualMomentum
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class AmihudIlliquidityLog(FactorBase):
@@ -11,17 +12,15 @@ class AmihudIlliquidityLog(FactorBase):
     Amihud illiquidity with log compression to reduce outlier influence.
     """
 
+    inputs = ("returns", "dollar_volume")
+
     def __init__(self, window: int = 20, name: str | None = None):
         self.window = window
         self.name = name or f"amihud_illiq_log_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_long(dataset="price_daily")
-        prices["date"] = pd.to_datetime(prices["date"]).dt.date
-        price_wide = prices.pivot(index="date", columns="ticker", values="adjusted_close").sort_index()
-        vol_wide = prices.pivot(index="date", columns="ticker", values="volume").sort_index()
-        rets = price_wide.pct_change()
-        dollar_vol = price_wide * vol_wide
+        rets = intermediate(data_loader, "returns")
+        dollar_vol = intermediate(data_loader, "dollar_volume")
         amihud = (rets.abs() / dollar_vol.replace(0, np.nan)).rolling(self.window).mean()
         amihud = np.log1p(amihud)
         return amihud
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class AverageTrueRange(FactorBase):
@@ -11,16 +12,18 @@ class AverageTrueRange(FactorBase):
     Average True Range: rolling mean of true range (volatility proxy), shifted one day.
     """
 
+    ticker_partitionable = True
+    inputs = ("price_long", "price_wide")
+
     def __init__(self, window: int = 14, name: str | None = None):
         self.window = window
         self.name = name or f"atr_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_long(dataset="price_daily")
-        prices["date"] = pd.to_datetime(prices["date"]).dt.date
+        prices = intermediate(data_loader, "price_long")
         hi = prices.pivot(index="date", columns="ticker", values="high").sort_index()
         lo = prices.pivot(index="date", columns="ticker", values="low").sort_index()
-        close = prices.pivot(index="date", columns="ticker", values="adjusted_close").sort_index()
+        close = intermediate(data_loader, "price_wide")
         prev_close = close.shift(1)
         # Elementwise max across the three true-range components
         tr_components = [
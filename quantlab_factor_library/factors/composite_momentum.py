@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 def _exp_weights(k: int) -> np.ndarray:
@@ -37,6 +38,8 @@ class CompositeMomentum(FactorBase):
     Uses stock-level returns only.
     """
 
+    inputs = ("returns",)
+
     def __init__(
         self,
         bucket_sizes: tuple[int, ...] = (21, 63, 126, 252),
@@ -48,8 +51,7 @@ class CompositeMomentum(FactorBase):
         self.name = name or "composite_momentum"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
+        rets = intermediate(data_loader, "returns")
         cmc = _weighted_bucket_returns(rets, self.bucket_sizes, self.skip_days)
         return cmc
 
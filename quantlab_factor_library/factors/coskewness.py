@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class Coskewness(FactorBase):
@@ -10,15 +11,16 @@ class Coskewness(FactorBase):
     Coskewness: beta to squared market returns over a rolling window.
     """
 
+    inputs = ("returns", "ff_factors")
+
     def __init__(self, window: int = 252, min_periods: int | None = None, name: str | None = None):
         self.window = window
         self.min_periods = min_periods if min_periods is not None else max(60, window // 4)
         self.name = name or f"coskewness_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
-        ff = data_loader.load_ff_factors()
+        rets = intermediate(data_loader, "returns")
+        ff = intermediate(data_loader, "ff_factors")
         if "mktrf" not in ff.columns:
             raise ValueError("FF factors missing mktrf for coskewness")
         mkt = ff["mktrf"].reindex(rets.index)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class DollarVolume(FactorBase):
@@ -10,16 +11,14 @@ class DollarVolume(FactorBase):
     Rolling average dollar volume (price * volume), a liquidity proxy.
     """
 
+    inputs = ("dollar_volume",)
+
     def __init__(self, window: int = 20, name: str | None = None):
         self.window = window
         self.name = name or f"dollar_volume_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        df = data_loader.load_long(dataset="price_daily")
-        price_col = "adjusted_close" if "adjusted_close" in df.columns else "close"
-        price_wide = df.pivot(index="date", columns="ticker", values=price_col).sort_index()
-        vol_wide = df.pivot(index="date", columns="ticker", values="volume").sort_index()
-        dollar_vol = price_wide * vol_wide
+        dollar_vol = intermediate(data_loader, "dollar_volume")
         dv_mean = dollar_vol.rolling(window=self.window, min_periods=max(5, self.window // 2)).mean()
         return dv_mean
 
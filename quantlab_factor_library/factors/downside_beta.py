@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class DownsideBeta(FactorBase):
@@ -10,15 +11,16 @@ class DownsideBeta(FactorBase):
     Downside beta: rolling beta to market using only down-market days.
     """
 
+    inputs = ("returns", "ff_factors")
+
     def __init__(self, window: int = 252, min_periods: int | None = None, name: str | None = None):
         self.window = window
         self.min_periods = min_periods if min_periods is not None else max(60, window // 3)
         self.name = name or f"downside_beta_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
-        ff = data_loader.load_ff_factors()
+        rets = intermediate(data_loader, "returns")
+        ff = intermediate(data_loader, "ff_factors")
         if "mktrf" not in ff.columns:
             raise ValueError("FF factors missing mktrf for downside beta")
         mkt = ff["mktrf"].reindex(rets.index)
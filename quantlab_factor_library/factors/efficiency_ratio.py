@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class EfficiencyRatio(FactorBase):
@@ -11,13 +12,15 @@ class EfficiencyRatio(FactorBase):
     Path smoothness: total return over window divided by sum of absolute daily returns.
     """
 
+    inputs = ("price_wide", "returns")
+
     def __init__(self, window: int = 252, name: str | None = None):
         self.window = window
         self.name = name or f"efficiency_ratio_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
+        prices = intermediate(data_loader, "price_wide")
+        rets = intermediate(data_loader, "returns")
         abs_sum = rets.abs().rolling(self.window).sum()
         total_ret = prices / prices.shift(self.window) - 1
         ratio = total_ret / abs_sum.replace(0, np.nan)
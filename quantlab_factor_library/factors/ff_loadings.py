@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import pandas as pd
+
+from ..base import FactorBase
+from ..rolling_regression import ff_design, resolve_regressors, rolling_multi_ols, stock_excess_returns
+
+
+def _model_tag(model: str | Sequence[str]) -> str:
+    return model.lower() if isinstance(model, str) else "_".join(resolve_regressors(model))
+
+
+class FFLoading(FactorBase):
+    """
+    Rolling loading on one FF regressor from a multi-factor time-series regression (e.g. FF5 SMB beta).
+    """
+
+    def __init__(
+        self,
+        factor: str = "mktrf",
+        model: str | Sequence[str] = "ff5",
+        window: int = 252,
+        min_periods: int | None = None,
+        name: str | None = None,
+    ):
+        self.factor = factor.lower()
+        self.regressors = resolve_regressors(model)
+        if self.factor not in self.regressors:
+            raise ValueError(f"{self.factor} is not a regressor of model {model}")
+        self.window = window
+        self.min_periods = min_periods if min_periods is not None else max(60, window // 3)
+        self.name = name or f"{_model_tag(model)}_beta_{self.factor}_{window}d"
+
+    def compute_raw_factor(self, data_loader) -> pd.DataFrame:
+        ff = data_loader.load_ff_factors()
+        rets = stock_excess_returns(data_loader, ff)
+        X = ff_design(ff, self.regressors, rets.index)
+        res = rolling_multi_ols(rets, X, window=self.window, min_periods=self.min_periods)
+        return res.loading(self.factor)
+
+    def post_process(self, raw_factor: pd.DataFrame) -> pd.DataFrame:
+        return raw_factor.shift(1)
+
+
+class MultiFactorResidualVol(FactorBase):
+    """
+    Idiosyncratic volatility: rolling std of residuals from a multi-factor (default FF3) regression.
+    """
+
+    def __init__(
+        self,
+        model: str | Sequence[str] = "ff3",
+        window: int = 252,
+        min_periods: int | None = None,
+        name: str | None = None,
+    ):
+        self.regressors = resolve_regressors(model)
+        self.window = window
+        self.min_periods = min_periods if min_periods is not None else max(60, window // 3)
+        self.name = name or f"{_model_tag(model)}_residual_vol_{window}d"
+
+    def compute_raw_factor(self, data_loader) -> pd.DataFrame:
+        ff = data_loader.load_ff_factors()
+        rets = stock_excess_returns(data_loader, ff)
+        X = ff_design(ff, self.regressors, rets.index)
+        res = rolling_multi_ols(rets, X, window=self.window, min_periods=self.min_periods)
+        return res.resid_vol
+
+    def post_process(self, raw_factor: pd.DataFrame) -> pd.DataFrame:
+        return raw_factor.shift(1)
+
+
+class MultiFactorResidualMomentum(FactorBase):
+    """
+    Residual momentum net of a multi-factor (default FF3) component: sum of residual returns over
+    the lookback window, skipping the most recent month.
+    """
+
+    def __init__(
+        self,
+        model: str | Sequence[str] = "ff3",
+        lookback_days: int = 252,
+        skip_days: int = 21,
+        beta_window: int = 756,
+        min_beta_periods: int | None = None,
+        name: str | None = None,
+    ):
+        self.regressors = resolve_regressors(model)
+        self.lookback_days = lookback_days
+        self.skip_days = skip_days
+        self.beta_window = beta_window
+        self.min_beta_periods = min_beta_periods if min_beta_periods is not None else max(60, beta_window // 4)
+        self.name = name or f"{_model_tag(model)}_residual_momentum_12m"
+
+    def compute_raw_factor(self, data_loader) -> pd.DataFrame:
+        ff = data_loader.load_ff_factors()
+        rets = stock_excess_returns(data_loader, ff)
+        X = ff_design(ff, self.regressors, rets.index)
+        res = rolling_multi_ols(
+            rets,
+            X,
+            window=self.beta_window,
+            min_periods=self.min_beta_periods,
+            return_residuals=True,
+        )
+        # Exclude most recent month
+        shifted = res.residuals.shift(self.skip_days)
+        window = self.lookback_days - self.skip_days
+        return shifted.rolling(window, min_periods=window // 2).sum()
+
+    def post_process(self, raw_factor: pd.DataFrame) -> pd.DataFrame:
+        return raw_factor.shift(1)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase, factor_setting
+from ..intermediates import intermediate
 
 
 class FreeCashflowYield(FactorBase):
@@ -10,6 +11,8 @@ class FreeCashflowYield(FactorBase):
     Free cashflow yield: (operatingCashflow - capex) / market cap using annual fundamentals + price × shares, forward-fill configurable.
     """
 
+    inputs = ("price_wide", ("market_cap", "annual"))
+
     def __init__(self, name: str | None = None):
         self.name = name or "free_cashflow_yield"
 
@@ -24,30 +27,14 @@ class FreeCashflowYield(FactorBase):
         cf = cf.groupby(["ticker", "fiscalDateEnding"], as_index=False)[["operatingCashflow", "capitalExpenditures"]].mean()
         cf["fcf"] = cf["operatingCashflow"] - cf["capitalExpenditures"]
 
-        bal = data_loader.load_long(dataset="fundamentals_balance_sheet")
-        if "period_type" not in bal.columns:
-            raise ValueError("fundamentals_balance_sheet missing period_type")
-        bal = bal[bal["period_type"] == "annual"]
-        bal["fiscalDateEnding"] = pd.to_datetime(bal["fiscalDateEnding"], errors="coerce").dt.date
-        col = "commonStockSharesOutstanding"
-        if col not in bal.columns:
-            raise ValueError("fundamentals_balance_sheet missing commonStockSharesOutstanding")
-        bal[col] = pd.to_numeric(bal[col], errors="coerce")
-        shares = (
-            bal.groupby(["ticker", "fiscalDateEnding"], as_index=False)[col]
-            .mean()
-            .pivot(index="fiscalDateEnding", columns="ticker", values=col)
-            .sort_index()
-        )
-
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        shares = shares.reindex(prices.index).ffill()
-        tickers = prices.columns.intersection(shares.columns)
+        # Market cap with shares from annual balance sheets
+        prices = intermediate(data_loader, "price_wide")
+        cap = intermediate(data_loader, ("market_cap", "annual"))
+        tickers = cap.columns
 
         fcf_wide = cf.pivot(index="fiscalDateEnding", columns="ticker", values="fcf").sort_index()
         fcf_wide = fcf_wide.reindex(prices.index).ffill()
         fcf_wide = fcf_wide[tickers]
-        cap = prices[tickers] * shares[tickers]
         fcf_yield = fcf_wide / cap.replace(0, pd.NA)
 
         ff = factor_setting(getattr(self, "name", "free_cashflow_yield"), self.__class__.__name__, "forward_fill", True)
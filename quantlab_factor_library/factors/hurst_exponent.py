@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class HurstExponent(FactorBase):
@@ -11,6 +12,9 @@ class HurstExponent(FactorBase):
     Rolling Hurst exponent estimate (rescaled range method) on daily returns, shifted one day.
     """
 
+    ticker_partitionable = True
+    inputs = ("returns",)
+
     def __init__(self, window: int = 252, name: str | None = None):
         self.window = window
         self.name = name or f"hurst_{window}d"
@@ -30,8 +34,7 @@ class HurstExponent(FactorBase):
         return np.log(R / S) / np.log(len(s)) if R > 0 else np.nan
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
+        rets = intermediate(data_loader, "returns")
         hurst = rets.rolling(self.window).apply(self._hurst, raw=False)
         return hurst
 
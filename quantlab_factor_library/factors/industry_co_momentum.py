@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 from .composite_momentum import _exp_weights
 
 
@@ -24,6 +25,8 @@ class IndustryCoMomentum(FactorBase):
     Industry co-momentum: sector-level composite momentum assigned to members.
     """
 
+    inputs = ("sector_map", "sector_returns")
+
     def __init__(
         self,
         bucket_sizes: tuple[int, ...] = (21, 63, 126, 252),
@@ -35,12 +38,9 @@ class IndustryCoMomentum(FactorBase):
         self.name = name or "industry_co_momentum"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
         # Sector map
-        sector_map = data_loader.load_sector_map()
-        aligned_rets = rets.reindex(columns=sector_map.index)
-        sector_rets = aligned_rets.groupby(sector_map, axis=1).mean()
+        sector_map = intermediate(data_loader, "sector_map")
+        sector_rets = intermediate(data_loader, "sector_returns")
         sector_score = _sector_weighted_scores(sector_rets, self.bucket_sizes, self.skip_days)
         # Broadcast back to tickers
         sector_to_score = {ticker: sector_score[sector] for ticker, sector in sector_map.items() if sector in sector_score.columns}
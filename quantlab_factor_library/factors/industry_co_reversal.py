@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 from .composite_momentum import _exp_weights
 
 
@@ -12,6 +13,8 @@ class IndustryCoReversal(FactorBase):
     Industry co-reversal: short-horizon sector reversal signal (recent losers expected to mean-revert).
     """
 
+    inputs = ("sector_map", "sector_returns")
+
     def __init__(
         self,
         bucket_sizes: tuple[int, ...] = (21, 63),
@@ -23,11 +26,8 @@ class IndustryCoReversal(FactorBase):
         self.name = name or "industry_co_reversal"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
-        sector_map = data_loader.load_sector_map()
-        aligned_rets = rets.reindex(columns=sector_map.index)
-        sector_rets = aligned_rets.groupby(sector_map, axis=1).mean().shift(self.skip_days)
+        sector_map = intermediate(data_loader, "sector_map")
+        sector_rets = intermediate(data_loader, "sector_returns").shift(self.skip_days)
         weights = _exp_weights(len(self.bucket_sizes))
         stacked = []
         for w, lb in zip(weights, self.bucket_sizes):
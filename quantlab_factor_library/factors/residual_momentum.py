@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class ResidualMomentum(FactorBase):
@@ -24,24 +25,16 @@ class ResidualMomentum(FactorBase):
         self.min_beta_periods = min_beta_periods if min_beta_periods is not None else max(60, beta_window // 4)
         self.name = name or "residual_momentum_12m"
 
-    def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
-        ff = data_loader.load_ff_factors()
-        if "mktrf" not in ff.columns:
-            raise ValueError("FF factors missing mktrf for residual momentum")
-        mkt = ff["mktrf"].reindex(rets.index)
+    @property
+    def inputs(self) -> tuple:
+        return ("returns", ("market_beta", self.beta_window, self.min_beta_periods))
 
+    def compute_raw_factor(self, data_loader) -> pd.DataFrame:
+        rets = intermediate(data_loader, "returns")
         # rolling beta to market
-        mkt_mean = mkt.rolling(self.beta_window, min_periods=self.min_beta_periods).mean()
-        ret_mean = rets.rolling(self.beta_window, min_periods=self.min_beta_periods).mean()
-        mkt_center = mkt - mkt_mean
-        ret_center = rets - ret_mean
-        cov = (ret_center.mul(mkt_center, axis=0)).rolling(self.beta_window, min_periods=self.min_beta_periods).mean()
-        var_mkt = (mkt_center**2).rolling(self.beta_window, min_periods=self.min_beta_periods).mean()
-        beta = cov.div(var_mkt, axis=0)
-
-        residual_ret = rets - beta.mul(mkt, axis=0)
+        reg = intermediate(data_loader, ("market_beta", self.beta_window, self.min_beta_periods))
+
+        residual_ret = rets - reg["beta"].mul(reg["mkt"], axis=0)
         # Exclude most recent month
         shifted = residual_ret.shift(self.skip_days)
         window = self.lookback_days - self.skip_days
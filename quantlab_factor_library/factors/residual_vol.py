@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class ResidualVol(FactorBase):
@@ -15,21 +16,13 @@ class ResidualVol(FactorBase):
         self.min_periods = min_periods if min_periods is not None else max(60, window // 3)
         self.name = name or f"residual_vol_{window}d"
 
+    @property
+    def inputs(self) -> tuple:
+        return (("market_beta", self.window, self.min_periods),)
+
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
-        ff = data_loader.load_ff_factors()
-        if "mktrf" not in ff.columns:
-            raise ValueError("FF factors missing mktrf for residual volatility")
-        mkt = ff["mktrf"].reindex(rets.index)
-        mkt_mean = mkt.rolling(self.window, min_periods=self.min_periods).mean()
-        mkt_center = mkt - mkt_mean
-        ret_mean = rets.rolling(self.window, min_periods=self.min_periods).mean()
-        ret_center = rets - ret_mean
-        cov = (ret_center.mul(mkt_center, axis=0)).rolling(self.window, min_periods=self.min_periods).mean()
-        var_mkt = (mkt_center ** 2).rolling(self.window, min_periods=self.min_periods).mean()
-        beta = cov.div(var_mkt, axis=0)
-        resid = ret_center - beta.mul(mkt_center, axis=0)
+        reg = intermediate(data_loader, ("market_beta", self.window, self.min_periods))
+        resid = reg["ret_center"] - reg["beta"].mul(reg["mkt_center"], axis=0)
         rvol = resid.rolling(self.window, min_periods=self.min_periods).std()
         return rvol
 
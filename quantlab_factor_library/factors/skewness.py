@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 
 
 class ReturnSkewness(FactorBase):
@@ -10,14 +11,16 @@ class ReturnSkewness(FactorBase):
     Rolling skewness of daily returns over a window.
     """
 
+    ticker_partitionable = True
+    inputs = ("returns",)
+
     def __init__(self, window: int = 60, min_periods: int | None = None, name: str | None = None):
         self.window = window
         self.min_periods = min_periods if min_periods is not None else max(20, window // 2)
         self.name = name or f"skewness_{window}d"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices = data_loader.load_price_wide(dataset="price_daily")
-        rets = prices.pct_change()
+        rets = intermediate(data_loader, "returns")
 
         def rolling_skew(x: pd.Series) -> float:
             x = x.dropna()
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ..base import FactorBase
+from ..intermediates import intermediate
 from .composite_momentum import _exp_weights
 
 
@@ -13,6 +14,8 @@ class VolumeInclusiveICM(FactorBase):
     Uses return * volume as the input score before sector aggregation and exponential weighting.
     """
 
+    inputs = ("returns", "volume_wide", "sector_map")
+
     def __init__(
         self,
         bucket_sizes: tuple[int, ...] = (21, 63, 126, 252),
@@ -24,14 +27,11 @@ class VolumeInclusiveICM(FactorBase):
         self.name = name or "volume_inclusive_icm"
 
     def compute_raw_factor(self, data_loader) -> pd.DataFrame:
-        prices_long = data_loader.load_long(dataset="price_daily")
-        prices_long["date"] = pd.to_datetime(prices_long["date"]).dt.date
-        price_wide = prices_long.pivot(index="date", columns="ticker", values="adjusted_close").sort_index()
-        vol_wide = prices_long.pivot(index="date", columns="ticker", values="volume").sort_index()
-        rets = price_wide.pct_change()
+        rets = intermediate(data_loader, "returns")
+        vol_wide = intermediate(data_loader, "volume_wide")
         score = rets * vol_wide  # return * volume
 
-        sector_map = data_loader.load_sector_map()
+        sector_map = intermediate(data_loader, "sector_map")
         score = score.reindex(columns=sector_map.index)
         sector_score = score.groupby(sector_map, axis=1).mean().shift(self.skip_days)
         weights = _exp_weights(len(self.bucket_sizes))
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .panel import block_slices, date_blocks, newey_west_lags, panel_axes, stack_frames
+from .paths import diagnostics_dir, factors_dir
+
+logger = logging.getLogger(__name__)
+
+
+def newey_west_se(values: np.ndarray, lags: int | None = None) -> float:
+    """
+    HAC standard error of the sample mean using Bartlett weights.
+    """
+    x = np.asarray(values, dtype=float)
+    x = x[np.isfinite(x)]
+    n = len(x)
+    if n < 2:
+        return np.nan
+    lags = newey_west_lags(n) if lags is None else min(int(lags), n - 1)
+    e = x - x.mean()
+    lrv = e @ e / n
+    for lag in range(1, lags + 1):
+        w = 1.0 - lag / (lags + 1.0)
+        lrv += 2.0 * w * (e[lag:] @ e[:-lag]) / n
+    if lrv <= 0:
+        return np.nan
+    return float(np.sqrt(lrv / n))
+
+
+def newey_west_tstat(series: pd.Series, lags: int | None = None) -> float:
+    se = newey_west_se(series.to_numpy(dtype=float), lags=lags)
+    mean = series.mean()
+    return mean / se if se and np.isfinite(se) and se > 0 else np.nan
+
+
+def batched_cross_section(
+    X: np.ndarray,
+    y: np.ndarray,
+    min_obs: int | None = None,
+    return_residuals: bool = False,
+) -> dict:
+    """
+    Solve one OLS per date for a stack of cross-sections.
+    X: (dates, tickers, P) exposures, y: (dates, tickers) returns. A (date, ticker) row enters the
+    regression only when y and every exposure are finite; masked rows are zero-weighted instead of
+    being dropped, so all dates are solved together as a batch of P x P normal equations.
+    Returns coef (dates, P), r2, nobs and optionally residuals (dates, tickers; NaN where masked).
+    """
+    n_dates, _, n_coef = X.shape
+    mask = np.isfinite(y) & np.isfinite(X).all(axis=2)
+    Xz = np.where(mask[:, :, None], X, 0.0)
+    yz = np.where(mask, y, 0.0)
+    nobs = mask.sum(axis=1)
+    xt = Xz.transpose(0, 2, 1)
+    xtx = xt @ Xz
+    xty = (xt @ yz[:, :, None])[:, :, 0]
+
+    coef = np.full((n_dates, n_coef), np.nan)
+    ok = nobs >= max(min_obs or 0, n_coef + 1)
+    if ok.any():
+        try:
+            coef[ok] = np.linalg.solve(xtx[ok], xty[ok][:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            # Rank-deficient dates (e.g. an empty sector) fall back to the minimum-norm solution
+            coef[ok] = np.einsum("bij,bj->bi", np.linalg.pinv(xtx[ok]), xty[ok])
+
+    yy = (yz * yz).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ybar = yz.sum(axis=1) / nobs
+        sst = yy - nobs * ybar**2
+        ssr = yy - np.einsum("bi,bi->b", np.nan_to_num(coef), xty)
+        r2 = np.where(ok & (sst > 0), 1.0 - ssr / sst, np.nan)
+    out = {"coef": coef, "r2": r2, "nobs": nobs}
+    if return_residuals:
+        fitted = np.einsum("bnp,bp->bn", Xz, np.nan_to_num(coef))
+        out["residuals"] = np.where(mask & ok[:, None], y - fitted, np.nan)
+    return out
+
+
+def sector_dummies(
+    sector_map: pd.Series,
+    tickers: pd.Index,
+    categories: Optional[list] = None,
+) -> tuple[np.ndarray, list[str]]:
+    """
+    One-hot (tickers, sectors) matrix; tickers without a sector get an all-NaN row so they are masked.
+    categories fixes the sector columns (e.g. those of a fitted model); tickers in any other
+    sector are treated as having none.
+    """
+    sectors = sector_map.dropna()
+    sectors = sectors[~sectors.index.duplicated(keep="first")].reindex(tickers)
+    names = sorted(sectors.dropna().unique()) if categories is None else list(categories)
+    codes = pd.Categorical(sectors, categories=names).codes
+    dummies = np.zeros((len(tickers), len(names)))
+    has = codes >= 0
+    dummies[np.flatnonzero(has), codes[has]] = 1.0
+    dummies[~has] = np.nan
+    return dummies, [f"sector_{n}" for n in names]
+
+
+@dataclass
+class FamaMacBethResult:
+    factor_returns: pd.DataFrame
+    nuisance_returns: pd.DataFrame
+    r2: pd.Series
+    nobs: pd.Series
+    summary: pd.DataFrame
+
+
+def fama_macbeth(
+    factors: Dict[str, pd.DataFrame],
+    fwd_returns: pd.DataFrame,
+    sector_map: Optional[pd.Series] = None,
+    fill_value: float | None = 0.0,
+    nw_lags: int | None = None,
+    min_obs: int | None = None,
+    block_size: int = 252,
+) -> FamaMacBethResult:
+    """
+    Fama-MacBeth regressions of forward returns on the full factor set.
+    For every date, fwd_returns is regressed cross-sectionally on all factor exposures plus an
+    intercept, or on sector dummies instead of the intercept when sector_map is given.
+    Dates are processed in blocks of block_size, each block solved as one batch of least-squares
+    problems; only the block slice of each factor is materialized.
+    fill_value: exposure used for missing factor values (cleaned factors are z-scored, so 0 is the
+      cross-sectional mean); None drops any ticker missing a factor on that date.
+    Returns per-date factor returns, intercept/sector returns, R^2, observation counts and a summary
+    with mean, std, plain t-stat and Newey-West t-stat per factor.
+    """
+    names = list(factors)
+    if not names:
+        empty = pd.DataFrame()
+        return FamaMacBethResult(empty, empty, pd.Series(dtype=float), pd.Series(dtype=float), empty)
+
+    fac_index, fac_cols = panel_axes(factors)
+    dates = fwd_returns.index.intersection(fac_index).sort_values()
+    tickers = fwd_returns.columns.intersection(fac_cols).sort_values()
+
+    if sector_map is not None:
+        dummies, nuisance_names = sector_dummies(sector_map, tickers)
+    else:
+        dummies, nuisance_names = np.ones((len(tickers), 1)), ["intercept"]
+
+    coefs, r2s, nobs = [], [], []
+    for block in date_blocks(dates, block_size):
+        X = stack_frames(block_slices(factors, block), block, tickers)
+        if fill_value is not None:
+            X = np.where(np.isnan(X), fill_value, X)
+        X = np.concatenate([X, np.broadcast_to(dummies, (len(block),) + dummies.shape)], axis=2)
+        y = fwd_returns.reindex(index=block, columns=tickers).to_numpy(dtype=float)
+        res = batched_cross_section(X, y, min_obs=min_obs)
+        coefs.append(res["coef"])
+        r2s.append(res["r2"])
+        nobs.append(res["nobs"])
+
+    coef = np.concatenate(coefs) if coefs else np.empty((0, len(names) + len(nuisance_names)))
+    factor_returns = pd.DataFrame(coef[:, : len(names)], index=dates, columns=names)
+    nuisance_returns = pd.DataFrame(coef[:, len(names) :], index=dates, columns=nuisance_names)
+    valid = factor_returns.notna().any(axis=1)
+    factor_returns = factor_returns.loc[valid]
+    nuisance_returns = nuisance_returns.loc[valid]
+    r2 = pd.Series(np.concatenate(r2s) if r2s else [], index=dates, name="r2", dtype=float).loc[valid]
+    n_obs = pd.Series(np.concatenate(nobs) if nobs else [], index=dates, name="nobs", dtype=float).loc[valid]
+
+    rows = []
+    for name in names:
+        s = factor_returns[name].dropna()
+        n = len(s)
+        std = s.std(ddof=1) if n > 1 else np.nan
+        rows.append(
+            {
+                "factor": name,
+                "mean_return": s.mean() if n else np.nan,
+                "std_return": std,
+                "t_stat": s.mean() / (std / np.sqrt(n)) if n > 1 and std and std > 0 else np.nan,
+                "nw_t_stat": newey_west_tstat(s, lags=nw_lags) if n > 1 else np.nan,
+                "nw_lags": newey_west_lags(n) if nw_lags is None else nw_lags,
+                "n_periods": n,
+                "mean_r2": r2.mean() if len(r2) else np.nan,
+            }
+        )
+    summary = pd.DataFrame(rows).set_index("factor")
+    return FamaMacBethResult(factor_returns, nuisance_returns, r2, n_obs, summary)
+
+
+def save_fama_macbeth(result: FamaMacBethResult, path: Path | None = None, ref_name: str = "fama_macbeth") -> Path:
+    """
+    Persist factor-return time series (with R^2/nobs) and the summary to factors_dir, with
+    diagnostics copies of the summary (Parquet + CSV).
+    """
+    out_dir = path or factors_dir()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ts = result.factor_returns.join(result.r2).join(result.nobs)
+    ts.to_parquet(out_dir / f"{ref_name}_returns.parquet")
+    summary_path = out_dir / f"{ref_name}_summary.parquet"
+    result.summary.to_parquet(summary_path)
+    ref_dir = diagnostics_dir()
+    ref_dir.mkdir(parents=True, exist_ok=True)
+    result.summary.to_parquet(ref_dir / f"{ref_name}_summary.parquet")
+    result.summary.to_csv(ref_dir / f"{ref_name}_summary.csv")
+    logger.info("Saved Fama-MacBeth outputs to %s and diagnostics/%s_summary.(parquet,csv)", out_dir, ref_name)
+    return summary_path
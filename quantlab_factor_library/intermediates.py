@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import pandas as pd
+
+from .data_loader import price_pivot
+
+# An intermediate key is a registered name ("returns") or a tuple of a name and its parameters
+# (("market_cap", "annual"), ("market_beta", 252, 84)).
+Key = Hashable
+
+# name -> (dependencies(*params) -> keys, compute(data_loader, dependency values, *params))
+_REGISTRY: Dict[str, Tuple[Callable[..., tuple], Callable[..., Any]]] = {}
+# name -> size of the computed value in Date x Ticker float64 panels (for memory budgets)
+_PANELS: Dict[str, float] = {}
+
+
+def register(name: str, deps: tuple | Callable[..., tuple] = (), panels: float = 1.0):
+    """Register fn(data_loader, dep_values, *params) as intermediate `name` (about `panels` panels in size)."""
+
+    def _decorator(fn):
+        _REGISTRY[name] = (deps if callable(deps) else (lambda *params: deps), fn)
+        _PANELS[name] = panels
+        return fn
+
+    return _decorator
+
+
+def _split(key: Key) -> tuple[str, tuple]:
+    name, params = (key[0], tuple(key[1:])) if isinstance(key, tuple) else (key, ())
+    if name not in _REGISTRY:
+        raise KeyError(f"Unknown intermediate {name!r}; expected one of {sorted(_REGISTRY)}")
+    return name, params
+
+
+def dependencies(key: Key) -> tuple:
+    name, params = _split(key)
+    return tuple(_REGISTRY[name][0](*params))
+
+
+def footprint_panels(key: Key) -> float:
+    """Approximate size of an intermediate in Date x Ticker panels."""
+    return _PANELS[_split(key)[0]]
+
+
+def compute_intermediate(key: Key, data_loader, dep_values: list) -> Any:
+    """Compute one intermediate from its already-computed dependency values."""
+    name, params = _split(key)
+    return _REGISTRY[name][1](data_loader, dep_values, *params)
+
+
+def intermediate(data_loader, key: Key) -> Any:
+    """
+    Intermediate `key` for a factor's compute_raw_factor. Under the scheduler the loader carries
+    the shared value (computed once per run, read-only: copy before mutating); any other loader
+    computes it, and its dependencies, on the spot.
+    """
+    shared = getattr(data_loader, "intermediate", None)
+    if shared is not None:
+        return shared(key)
+    return compute_intermediate(key, data_loader, [intermediate(data_loader, dep) for dep in dependencies(key)])
+
+
+# ---------------------------------------------------------------------- price panels
+@register("price_long", panels=6.0)
+def _price_long(data_loader, deps):
+    return data_loader.load_long(dataset="price_daily")
+
+
+@register("price_wide", deps=("price_long",))
+def _price_wide(data_loader, deps):
+    (prices,) = deps
+    return price_pivot(prices)
+
+
+@register("volume_wide", deps=("price_long",))
+def _volume_wide(data_loader, deps):
+    (prices,) = deps
+    return prices.pivot(index="date", columns="ticker", values="volume").sort_index()
+
+
+@register("returns", deps=("price_wide",))
+def _returns(data_loader, deps):
+    (prices,) = deps
+    return prices.pct_change()
+
+
+@register("dollar_volume", deps=("price_wide", "volume_wide"))
+def _dollar_volume(data_loader, deps):
+    prices, volume = deps
+    return prices * volume
+
+
+# ---------------------------------------------------------------------- reference data
+@register("ff_factors", panels=0.0)
+def _ff_factors(data_loader, deps):
+    return data_loader.load_ff_factors()
+
+
+@register("sector_map", panels=0.0)
+def _sector_map(data_loader, deps):
+    return data_loader.load_sector_map()
+
+
+@register("sector_returns", deps=("returns", "sector_map"), panels=0.1)
+def _sector_returns(data_loader, deps):
+    """Equal-weighted daily return per sector (Date x Sector)."""
+    rets, sector_map = deps
+    return rets.reindex(columns=sector_map.index).T.groupby(sector_map).mean().T
+
+
+# ---------------------------------------------------------------------- fundamentals on the price calendar
+@register("shares_wide", deps=lambda period: ("price_wide",))
+def _shares_wide(data_loader, deps, period: str):
+    """commonStockSharesOutstanding from `period` ("annual"/"quarterly") balance sheets, forward-filled on the price calendar."""
+    (prices,) = deps
+    bal = data_loader.load_long(dataset="fundamentals_balance_sheet")
+    if "period_type" not in bal.columns:
+        raise ValueError("fundamentals_balance_sheet missing period_type")
+    bal = bal[bal["period_type"] == period]
+    bal["fiscalDateEnding"] = pd.to_datetime(bal["fiscalDateEnding"], errors="coerce").dt.date
+    col = "commonStockSharesOutstanding"
+    if col not in bal.columns:
+        raise ValueError("fundamentals_balance_sheet missing commonStockSharesOutstanding")
+    bal[col] = pd.to_numeric(bal[col], errors="coerce")
+    shares = (
+        bal.groupby(["ticker", "fiscalDateEnding"], as_index=False)[col]
+        .mean()
+        .pivot(index="fiscalDateEnding", columns="ticker", values=col)
+        .sort_index()
+    )
+    return shares.reindex(prices.index).ffill()
+
+
+@register("market_cap", deps=lambda period: ("price_wide", ("shares_wide", period)))
+def _market_cap(data_loader, deps, period: str):
+    """Price x shares on tickers with both (shares from `period` balance sheets)."""
+    prices, shares = deps
+    tickers = prices.columns.intersection(shares.columns)
+    return prices[tickers] * shares[tickers]
+
+
+# ---------------------------------------------------------------------- market regressions
+@register("market_beta", deps=lambda window, min_periods: ("returns", "ff_factors"), panels=4.0)
+def _market_beta(data_loader, deps, window: int, min_periods: int):
+    """
+    Rolling OLS of returns on FF mktrf: {"mkt", "mkt_center", "ret_center", "beta"} with the
+    rolling means over `window` (min_periods) used for centring and the covariance.
+    """
+    rets, ff = deps
+    if "mktrf" not in ff.columns:
+        raise ValueError("FF factors missing mktrf for market beta")
+    mkt = ff["mktrf"].reindex(rets.index)
+    mkt_mean = mkt.rolling(window, min_periods=min_periods).mean()
+    ret_mean = rets.rolling(window, min_periods=min_periods).mean()
+    mkt_center = mkt - mkt_mean
+    ret_center = rets - ret_mean
+    cov = (ret_center.mul(mkt_center, axis=0)).rolling(window, min_periods=min_periods).mean()
+    var_mkt = (mkt_center**2).rolling(window, min_periods=min_periods).mean()
+    beta = cov.div(var_mkt, axis=0)
+    return {"mkt": mkt, "mkt_center": mkt_center, "ret_center": ret_center, "beta": beta}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from .paths import _load_config
+
+logger = logging.getLogger(__name__)
+
+
+class OutputSink:
+    """
+    Runs output writes (save_factor, save_ls_returns, save_correlation_matrix, ...) in the
+    background so they overlap with the next factor's computation.
+
+    executor: "thread" (default; parquet encoding releases the GIL), "process" (the written
+    objects are pickled to the worker, so writer functions must be module level) or None to
+    write inline. At most max_pending writes are queued; submit() waits for one to finish
+    beyond that, bounding the panels kept alive by the queue. flush() waits for everything
+    queued and raises the first write error; close() (or leaving the `with` block) flushes and
+    shuts the pool down.
+    """
+
+    def __init__(self, executor: Optional[str] = "thread", max_workers: int = 1, max_pending: int = 4):
+        if executor not in (None, "thread", "process"):
+            raise ValueError(f"Unknown output sink executor {executor!r}; expected 'thread', 'process' or None")
+        self.executor = executor
+        self.max_workers = max(1, int(max_workers or 1))
+        self.max_pending = max(1, int(max_pending or 1))
+        self._pool: Optional[Executor] = None
+        self._pending: set[Future] = set()
+        self._error: Optional[BaseException] = None
+
+    @classmethod
+    def from_config(cls) -> "OutputSink":
+        """Sink configured by "output_sink" in config ({"executor", "max_workers", "max_pending"})."""
+        cfg = _load_config().get("output_sink") or {}
+        return cls(
+            executor=cfg.get("executor", "thread"),
+            max_workers=cfg.get("max_workers", 1),
+            max_pending=cfg.get("max_pending", 4),
+        )
+
+    def _collect(self, done) -> None:
+        for fut in done:
+            self._pending.discard(fut)
+            exc = fut.exception()
+            if exc is not None:
+                logger.error("Background write failed: %s", exc)
+                self._error = self._error or exc
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs); returns its Future (already resolved when writing inline)."""
+        if self.executor is None:
+            fut: Future = Future()
+            fut.set_result(fn(*args, **kwargs))
+            return fut
+        if self._pool is None:
+            pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+            self._pool = pool_cls(max_workers=self.max_workers)
+        while len(self._pending) >= self.max_pending:
+            done, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            self._collect(done)
+        if self._error is not None:
+            self.flush()  # stop queueing after a failed write
+        fut = self._pool.submit(fn, *args, **kwargs)
+        self._pending.add(fut)
+        return fut
+
+    def flush(self) -> None:
+        """Wait for every queued write; raise the first error."""
+        if self._pending:
+            done, _ = wait(self._pending)
+            self._collect(done)
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # The body already failed: let queued writes finish, but do not mask its exception
+        try:
+            self.close()
+        except Exception as write_exc:
+            logger.error("Background write also failed: %s", write_exc)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+
+def union_axes(frames: Iterable[pd.DataFrame]) -> tuple[pd.Index, pd.Index]:
+    """
+    Sorted union of the date index and ticker columns across wide frames.
+    """
+    index = None
+    columns = None
+    for df in frames:
+        index = df.index if index is None else index.union(df.index)
+        columns = df.columns if columns is None else columns.union(df.columns)
+    if index is None:
+        return pd.Index([]), pd.Index([])
+    return index.sort_values(), columns.sort_values()
+
+
+def panel_axes(factors: Mapping[str, pd.DataFrame]) -> tuple[pd.Index, pd.Index]:
+    """union_axes over a {name: frame} mapping; lazy stores (FactorStore) answer from their key columns."""
+    axes = getattr(factors, "axes", None)
+    return axes() if callable(axes) else union_axes(factors.values())
+
+
+def block_slices(factors: Mapping[str, pd.DataFrame], block: pd.Index) -> Mapping[str, pd.DataFrame]:
+    """
+    Frames for stack_frames over one date block: plain mappings are returned as they are, lazy
+    stores (FactorStore) read only the block's dates of each factor instead of whole panels.
+    """
+    load = getattr(factors, "load", None)
+    if not callable(load):
+        return factors
+    tickers = getattr(factors, "tickers", None)
+    return {name: load(name, block[0], block[-1], tickers) for name in factors}
+
+
+def stack_frames(
+    frames: Mapping[str, pd.DataFrame],
+    index: pd.Index,
+    columns: pd.Index,
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Stack wide Date x Ticker frames into a (dates, tickers, K) array aligned to index/columns.
+    Only the requested slice of each frame is materialized, so callers can build date blocks
+    without copying full panels.
+    """
+    out = np.full((len(index), len(columns), len(frames)), np.nan, dtype=dtype)
+    for k, df in enumerate(frames.values()):
+        out[:, :, k] = df.reindex(index=index, columns=columns).to_numpy(dtype=dtype)
+    return out
+
+
+def date_blocks(index: pd.Index, block_size: int) -> Iterable[pd.Index]:
+    """Yield consecutive slices of a date index of at most block_size dates."""
+    for start in range(0, len(index), max(int(block_size), 1)):
+        yield index[start : start + block_size]
+
+
+def newey_west_lags(n_obs: int) -> int:
+    """Newey-West (1994) plug-in lag length: floor(4 * (T / 100) ** (2 / 9))."""
+    return int(np.floor(4 * (max(n_obs, 1) / 100.0) ** (2.0 / 9.0)))
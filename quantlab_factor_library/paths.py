@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from functools import lru_cache
 
@@ -27,7 +28,16 @@ def _resolve_path(val: str) -> Path:
     return path.resolve()
 
 
+def _env_path(var: str) -> Path | None:
+    # Environment overrides (e.g. benchmarks pointing a run at synthetic data) win over config.json
+    val = os.environ.get(var)
+    return _resolve_path(val) if val else None
+
+
 def data_root() -> Path:
+    env = _env_path("QUANTLAB_DATA_ROOT")
+    if env is not None:
+        return env
     cfg = _load_config()
     if "data_root" in cfg:
         return _resolve_path(cfg["data_root"])
@@ -35,6 +45,9 @@ def data_root() -> Path:
 
 
 def factors_dir() -> Path:
+    env = _env_path("QUANTLAB_FACTORS_DIR")
+    if env is not None:
+        return env
     cfg = _load_config()
     if "factors_dir" in cfg:
         return _resolve_path(cfg["factors_dir"])
@@ -43,7 +56,18 @@ def factors_dir() -> Path:
 
 def final_data_dir() -> Path:
     # Cleaned long-format outputs from the previous pipeline
+    env = _env_path("QUANTLAB_FINAL_DIR")
+    if env is not None:
+        return env
     cfg = _load_config()
     if "final_dir" in cfg:
         return _resolve_path(cfg["final_dir"])
     return data_root() / "data-processed"
+
+
+def diagnostics_dir() -> Path:
+    # Parquet/CSV mirrors for quick inspection, checked in under the repo by default
+    env = _env_path("QUANTLAB_DIAGNOSTICS_DIR")
+    if env is not None:
+        return env
+    return repo_root() / "diagnostics"
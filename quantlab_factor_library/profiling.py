@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is reported as NaN
+    resource = None
+
+_NULL = nullcontext()
+_current_factor: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("quantlab_factor", default=None)
+# ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+_RSS_TO_MB = 1.0 / (1024 * 1024) if sys.platform == "darwin" else 1.0 / 1024
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_TO_MB
+
+
+class StageRecorder:
+    """
+    Collects per-stage timing/memory records: wall time, thread CPU time, process peak RSS, and
+    (with trace_memory) the tracemalloc allocation delta. Thread-safe; records carry the thread id
+    so runs with parallel=True render as separate lanes in a Chrome trace.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self._records: list[dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self, trace_memory: bool = False) -> None:
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records = []
+            self._origin = time.perf_counter()
+
+    @contextmanager
+    def _record(self, stage_name: str, factor: Optional[str]):
+        mem_start = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall_end = time.perf_counter()
+            rec = {
+                "factor": factor,
+                "stage": stage_name,
+                "start_s": wall_start - self._origin,
+                "wall_s": wall_end - wall_start,
+                "cpu_s": time.thread_time() - cpu_start,
+                "peak_rss_mb": _peak_rss_mb(),
+                "mem_delta_mb": (
+                    (tracemalloc.get_traced_memory()[0] - mem_start) / 1e6 if mem_start is not None else None
+                ),
+                "thread": threading.get_ident(),
+            }
+            with self._lock:
+                self._records.append(rec)
+
+    def stage(self, stage_name: str, factor: Optional[str] = None):
+        if not self.enabled:
+            return _NULL
+        return self._record(stage_name, factor if factor is not None else _current_factor.get())
+
+    def records(self) -> list[dict]:
+        with self._lock:
+            return list(self._records)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.records())
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """Write records as Chrome trace events (open in chrome://tracing or Perfetto)."""
+        events = [
+            {
+                "name": rec["stage"],
+                "cat": rec["factor"] or "run",
+                "ph": "X",
+                "ts": rec["start_s"] * 1e6,
+                "dur": rec["wall_s"] * 1e6,
+                "pid": os.getpid(),
+                "tid": rec["thread"],
+                "args": {k: rec[k] for k in ("factor", "cpu_s", "peak_rss_mb", "mem_delta_mb")},
+            }
+            for rec in self.records()
+        ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return path
+
+
+RECORDER = StageRecorder()
+
+
+def stage(stage_name: str, factor: Optional[str] = None):
+    """
+    Context manager timing one stage; attributed to the current factor (see factor_scope) unless
+    given. Returns a shared no-op context when instrumentation is disabled.
+    """
+    if not RECORDER.enabled:
+        return _NULL
+    return RECORDER.stage(stage_name, factor)
+
+
+@contextmanager
+def factor_scope(name: Optional[str]):
+    """Attribute nested stages (e.g. clean_factor steps) to a factor within this thread/context."""
+    token = _current_factor.set(name)
+    try:
+        yield
+    finally:
+        _current_factor.reset(token)
+
+
+def instrumentation_settings() -> dict:
+    """
+    config/config.json -> "instrumentation": {"enabled", "trace_memory", "chrome_trace"};
+    QUANTLAB_PROFILE=1 enables it from the environment.
+    """
+    from .base import _factor_config  # base imports transforms, which imports this module
+
+    cfg = dict(_factor_config().get("instrumentation") or {})
+    if os.environ.get("QUANTLAB_PROFILE", "").lower() in ("1", "true", "yes"):
+        cfg["enabled"] = True
+    return cfg
+
+
+def configure_from_settings() -> bool:
+    cfg = instrumentation_settings()
+    if cfg.get("enabled"):
+        RECORDER.enable(trace_memory=bool(cfg.get("trace_memory", False)))
+    return RECORDER.enabled
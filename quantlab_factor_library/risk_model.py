@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .fama_macbeth import batched_cross_section, sector_dummies
+from .panel import block_slices, date_blocks, panel_axes, stack_frames
+from .paths import factors_dir
+
+logger = logging.getLogger(__name__)
+
+
+def _decay(halflife: float) -> float:
+    return 0.5 ** (1.0 / halflife)
+
+
+class RiskModel:
+    """
+    Cross-sectional factor risk model.
+
+    Each date's forward returns are regressed on the cleaned factor exposures (plus sector dummies,
+    or an intercept without a sector map) to get factor returns and residuals. The state keeps an
+    EWMA factor covariance (K x K) and an EWMA specific variance per ticker, both bias-corrected by
+    their running weight sums, plus the latest exposures. `update` appends one day in O(N K^2)
+    for the regression and O(K^2) for the covariance, without touching history.
+
+    A factor with no exposure among that day's usable rows (an empty sector, a style factor with
+    no data) has no identified return: it is reported as NaN and the day leaves the covariance
+    untouched, rather than feeding the minimum-norm solver's zero into it.
+    """
+
+    def __init__(
+        self,
+        cov_halflife: float = 126,
+        specific_halflife: float = 63,
+        fill_value: float | None = 0.0,
+    ):
+        self.cov_halflife = cov_halflife
+        self.specific_halflife = specific_halflife
+        self.fill_value = fill_value
+        self.factor_names: list[str] = []
+        self.style_names: list[str] = []
+        self.sector_map: Optional[pd.Series] = None
+        self.sectors: list = []  # sector categories fixed at fit time (dummy column order)
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self.cov_num: Optional[np.ndarray] = None
+        self.cov_weight = 0.0
+        self.tickers = pd.Index([])
+        self.specific_num = np.empty(0)
+        self.specific_weight = np.empty(0)
+        self.exposures = pd.DataFrame()
+        self.last_date: Optional[date] = None
+        self.n_updates = 0
+        self._factor_return_log: list[pd.Series] = []
+
+    # ------------------------------------------------------------------ state
+    @property
+    def factor_cov(self) -> pd.DataFrame:
+        if self.cov_num is None or self.cov_weight <= 0:
+            return pd.DataFrame()
+        return pd.DataFrame(self.cov_num / self.cov_weight, index=self.factor_names, columns=self.factor_names)
+
+    @property
+    def specific_var(self) -> pd.Series:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = np.where(self.specific_weight > 0, self.specific_num / self.specific_weight, np.nan)
+        return pd.Series(var, index=self.tickers, name="specific_var")
+
+    def _align_tickers(self, tickers: pd.Index) -> None:
+        if self.tickers.equals(tickers):
+            return
+        union = self.tickers.union(tickers)
+        pos = union.get_indexer(self.tickers)
+        num = np.zeros(len(union))
+        wsum = np.zeros(len(union))
+        num[pos] = self.specific_num
+        wsum[pos] = self.specific_weight
+        self.tickers, self.specific_num, self.specific_weight = union, num, wsum
+
+    def _exposure_matrix(self, block: np.ndarray, tickers: pd.Index) -> np.ndarray:
+        """Append sector dummies (or an intercept column) to a (dates, tickers, styles) block."""
+        if self.fill_value is not None:
+            block = np.where(np.isnan(block), self.fill_value, block)
+        if self.sector_map is not None:
+            dummies, _ = sector_dummies(self.sector_map, tickers, categories=self.sectors)
+        else:
+            dummies = np.ones((len(tickers), 1))
+        return np.concatenate([block, np.broadcast_to(dummies, (block.shape[0],) + dummies.shape)], axis=2)
+
+    @staticmethod
+    def _observed(X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """(dates, factors) mask: the factor has a nonzero exposure on a row the regression uses."""
+        rows = np.isfinite(y) & np.isfinite(X).all(axis=2)
+        return ((X != 0) & rows[:, :, None]).any(axis=1)
+
+    def _apply(self, dt, f: np.ndarray, resid: np.ndarray, tickers: pd.Index, observed: np.ndarray) -> np.ndarray:
+        """Fold one day into the state; returns its factor returns with unobserved factors as NaN."""
+        lam_c = _decay(self.cov_halflife)
+        lam_s = _decay(self.specific_halflife)
+        f = np.where(observed, f, np.nan)
+        if np.isfinite(f).all():
+            outer = np.outer(f, f)
+            self.cov_num = outer * (1 - lam_c) if self.cov_num is None else lam_c * self.cov_num + (1 - lam_c) * outer
+            self.cov_weight = lam_c * self.cov_weight + (1 - lam_c)
+        if np.isfinite(f).any():
+            self._factor_return_log.append(pd.Series(f, index=self.factor_names, name=dt))
+        self._align_tickers(tickers)
+        ok = np.isfinite(resid)
+        pos = np.arange(len(tickers)) if self.tickers.equals(tickers) else self.tickers.get_indexer(tickers)
+        pos = pos[ok]
+        self.specific_num[pos] = lam_s * self.specific_num[pos] + (1 - lam_s) * resid[ok] ** 2
+        self.specific_weight[pos] = lam_s * self.specific_weight[pos] + (1 - lam_s)
+        self.last_date = dt
+        self.n_updates += 1
+        return f
+
+    # ------------------------------------------------------------------ build
+    def fit(
+        self,
+        factors: Dict[str, pd.DataFrame],
+        fwd_returns: pd.DataFrame,
+        sector_map: Optional[pd.Series] = None,
+        block_size: int = 252,
+    ) -> "RiskModel":
+        """
+        Build the state from history: batched cross-sectional regressions per date block, then one
+        O(K^2) EWMA update per date in order. Any state from an earlier fit() or load() is replaced.
+        """
+        self._reset_state()
+        self.style_names = list(factors)
+        self.sector_map = sector_map.dropna() if sector_map is not None else None
+        fac_index, fac_cols = panel_axes(factors)
+        dates = fwd_returns.index.intersection(fac_index).sort_values()
+        tickers = fwd_returns.columns.intersection(fac_cols).sort_values()
+        if self.sector_map is not None:
+            self.sectors = sorted(self.sector_map.reindex(tickers).dropna().unique())
+            _, nuisance = sector_dummies(self.sector_map, tickers, categories=self.sectors)
+        else:
+            self.sectors = []
+            nuisance = ["intercept"]
+        self.factor_names = self.style_names + nuisance
+        for block in date_blocks(dates, block_size):
+            X = self._exposure_matrix(stack_frames(block_slices(factors, block), block, tickers), tickers)
+            y = fwd_returns.reindex(index=block, columns=tickers).to_numpy(dtype=float)
+            res = batched_cross_section(X, y, return_residuals=True)
+            observed = self._observed(X, y)
+            for i, dt in enumerate(block):
+                self._apply(dt, res["coef"][i], res["residuals"][i], tickers, observed[i])
+            self.exposures = pd.DataFrame(X[-1], index=tickers, columns=self.factor_names)
+        return self
+
+    def update(self, dt, exposures: pd.DataFrame, returns: pd.Series) -> pd.Series:
+        """
+        Append one day: exposures is Ticker x style-factor (same factors as the fitted model),
+        returns the realized returns for the same period. Returns that day's factor returns.
+        Sector dummies use the fitted sectors: a sector with no tickers that day gets an empty
+        column, so its return is NaN and the covariance is not updated, and tickers in sectors
+        unseen at fit time are left out of the regression.
+        """
+        if not self.style_names:
+            raise ValueError("RiskModel has no factors; call fit() or load() first")
+        if self.last_date is not None and pd.Timestamp(dt) <= pd.Timestamp(self.last_date):
+            raise ValueError(f"Update date {dt} is not after last state date {self.last_date}")
+        tickers = exposures.index.union(returns.index).sort_values()
+        block = exposures.reindex(index=tickers, columns=self.style_names).to_numpy(dtype=float)[None]
+        X = self._exposure_matrix(block, tickers)
+        y = returns.reindex(tickers).to_numpy(dtype=float)[None]
+        res = batched_cross_section(X, y, return_residuals=True)
+        f = self._apply(dt, res["coef"][0], res["residuals"][0], tickers, self._observed(X, y)[0])
+        self.exposures = pd.DataFrame(X[0], index=tickers, columns=self.factor_names)
+        return pd.Series(f, index=self.factor_names, name=dt)
+
+    # ------------------------------------------------------------------ queries
+    def portfolio_risk(self, weights: pd.Series | pd.DataFrame, annualization: int = 252) -> pd.DataFrame:
+        """
+        Risk decomposition for one (Series) or many (DataFrame, one column per portfolio) weight
+        vectors indexed by ticker, using the latest stored exposures. Tickers without exposures or
+        specific variance contribute nothing to the respective term.
+        Returns factor_var, specific_var, total_var (daily) and annualized vol per portfolio.
+        """
+        W = weights.to_frame() if isinstance(weights, pd.Series) else weights
+        W = W.reindex(self.exposures.index).fillna(0.0)
+        X = np.nan_to_num(self.exposures.to_numpy())
+        F = self.factor_cov.to_numpy()
+        w = W.to_numpy()
+        x = X.T @ w  # (K, P) portfolio factor exposures
+        factor_var = np.einsum("kp,kl,lp->p", x, F, x)
+        spec = self.specific_var.reindex(W.index).fillna(0.0).to_numpy()
+        specific_var = (w**2 * spec[:, None]).sum(axis=0)
+        total = factor_var + specific_var
+        return pd.DataFrame(
+            {
+                "factor_var": factor_var,
+                "specific_var": specific_var,
+                "total_var": total,
+                "vol_annualized": np.sqrt(total * annualization),
+            },
+            index=W.columns,
+        )
+
+    def factor_returns(self) -> pd.DataFrame:
+        """Factor returns appended since this instance was fitted/loaded."""
+        if not self._factor_return_log:
+            return pd.DataFrame(columns=self.factor_names)
+        return pd.DataFrame(self._factor_return_log)
+
+    # ------------------------------------------------------------------ persistence
+    def save(self, path: Path | None = None) -> Path:
+        """
+        Persist state under factors_dir()/risk_model: meta JSON, covariance numerator, specific
+        variance accumulators, latest exposures, and appended factor returns.
+        """
+        out_dir = path or factors_dir() / "risk_model"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "cov_halflife": self.cov_halflife,
+            "specific_halflife": self.specific_halflife,
+            "fill_value": self.fill_value,
+            "factor_names": self.factor_names,
+            "style_names": self.style_names,
+            "sectors": [s.item() if isinstance(s, np.generic) else s for s in self.sectors],
+            "cov_weight": self.cov_weight,
+            "last_date": str(self.last_date) if self.last_date is not None else None,
+            "n_updates": self.n_updates,
+        }
+        (out_dir / "state.json").write_text(json.dumps(meta, indent=2))
+        pd.DataFrame(self.cov_num, index=self.factor_names, columns=self.factor_names).to_parquet(
+            out_dir / "factor_cov_num.parquet"
+        )
+        pd.DataFrame({"num": self.specific_num, "weight": self.specific_weight}, index=self.tickers).to_parquet(
+            out_dir / "specific.parquet"
+        )
+        self.exposures.to_parquet(out_dir / "exposures.parquet")
+        if self.sector_map is not None:
+            self.sector_map.rename("sector").to_frame().to_parquet(out_dir / "sector_map.parquet")
+        new_returns = self.factor_returns()
+        ret_path = out_dir / "factor_returns.parquet"
+        if not new_returns.empty:
+            new_returns.index = pd.to_datetime(new_returns.index).date
+            if ret_path.exists():
+                old = pd.read_parquet(ret_path)
+                new_returns = pd.concat([old[~old.index.isin(new_returns.index)], new_returns]).sort_index()
+            new_returns.to_parquet(ret_path)
+            self._factor_return_log = []
+        logger.info("Saved risk model state (%d factors, last date %s) to %s", len(self.factor_names), self.last_date, out_dir)
+        return out_dir
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "RiskModel":
+        in_dir = path or factors_dir() / "risk_model"
+        meta = json.loads((in_dir / "state.json").read_text())
+        model = cls(
+            cov_halflife=meta["cov_halflife"],
+            specific_halflife=meta["specific_halflife"],
+            fill_value=meta["fill_value"],
+        )
+        model.factor_names = meta["factor_names"]
+        model.style_names = meta["style_names"]
+        model.cov_weight = meta["cov_weight"]
+        model.n_updates = meta["n_updates"]
+        model.cov_num = pd.read_parquet(in_dir / "factor_cov_num.parquet").to_numpy()
+        spec = pd.read_parquet(in_dir / "specific.parquet")
+        model.tickers = spec.index
+        model.specific_num = spec["num"].to_numpy(copy=True)
+        model.specific_weight = spec["weight"].to_numpy(copy=True)
+        model.exposures = pd.read_parquet(in_dir / "exposures.parquet")
+        sector_path = in_dir / "sector_map.parquet"
+        if sector_path.exists():
+            model.sector_map = pd.read_parquet(sector_path)["sector"]
+            # States saved before "sectors" was stored: recover them from the dummy column names
+            fitted = [n[len("sector_") :] for n in model.factor_names[len(model.style_names) :]]
+            model.sectors = meta.get("sectors", fitted)
+        if meta["last_date"] is not None:
+            model.last_date = pd.Timestamp(meta["last_date"]).date()
+        return model
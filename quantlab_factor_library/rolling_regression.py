@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+FF_FACTOR_COLUMNS = ("mktrf", "smb", "hml", "rmw", "cma", "umd")
+
+# Named regressor sets accepted wherever a `model` argument is taken.
+FF_MODELS: Dict[str, Tuple[str, ...]] = {
+    "capm": ("mktrf",),
+    "ff3": ("mktrf", "smb", "hml"),
+    "carhart": ("mktrf", "smb", "hml", "umd"),
+    "ff5": ("mktrf", "smb", "hml", "rmw", "cma"),
+    "ff6": ("mktrf", "smb", "hml", "rmw", "cma", "umd"),
+}
+
+
+def resolve_regressors(model: str | Sequence[str]) -> Tuple[str, ...]:
+    """
+    Map a model name (capm/ff3/carhart/ff5/ff6) or an explicit list of FF columns to a tuple of columns.
+    """
+    if isinstance(model, str):
+        key = model.lower()
+        if key in FF_MODELS:
+            return FF_MODELS[key]
+        cols = (key,)
+    else:
+        cols = tuple(c.lower() for c in model)
+    unknown = [c for c in cols if c not in FF_FACTOR_COLUMNS]
+    if unknown or not cols:
+        raise ValueError(f"Unknown FF regressors {unknown or model}; expected a subset of {FF_FACTOR_COLUMNS}")
+    return cols
+
+
+def ff_design(ff: pd.DataFrame, regressors: Iterable[str], index: pd.Index) -> pd.DataFrame:
+    """
+    Select FF regressor columns aligned to `index` (typically the return calendar).
+    Raises ValueError if any requested column is missing.
+    """
+    cols = list(regressors)
+    missing = [c for c in cols if c not in ff.columns]
+    if missing:
+        raise ValueError(f"FF factors missing {missing} for multi-factor regression")
+    return ff[cols].apply(pd.to_numeric, errors="coerce").reindex(index)
+
+
+def stock_excess_returns(data_loader, ff: pd.DataFrame) -> pd.DataFrame:
+    """
+    Daily simple returns net of the FF risk-free rate (raw returns when rf is unavailable).
+    """
+    prices = data_loader.load_price_wide(dataset="price_daily")
+    rets = prices.pct_change()
+    if "rf" in ff.columns:
+        rf = pd.to_numeric(ff["rf"], errors="coerce").reindex(rets.index).fillna(0.0)
+        rets = rets.sub(rf, axis=0)
+    return rets
+
+
+def _rolling_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window sum along axis 0 via a cumulative-sum accumulator."""
+    out = np.cumsum(a, axis=0)
+    if window < len(a):
+        out[window:] = out[window:] - out[:-window]
+    return out
+
+
+@dataclass
+class RollingOLSResult:
+    """
+    Output of `rolling_multi_ols`: one wide Date x Ticker frame per coefficient plus residual stats.
+    """
+
+    betas: Dict[str, pd.DataFrame]
+    resid_vol: pd.DataFrame
+    nobs: pd.DataFrame
+    residuals: pd.DataFrame | None = None
+    regressors: Tuple[str, ...] = field(default_factory=tuple)
+
+    def loading(self, regressor: str) -> pd.DataFrame:
+        return self.betas[regressor]
+
+
+def rolling_multi_ols(
+    y: pd.DataFrame,
+    X: pd.DataFrame,
+    window: int,
+    min_periods: int | None = None,
+    add_intercept: bool = True,
+    return_residuals: bool = False,
+    block_size: int = 128,
+) -> RollingOLSResult:
+    """
+    Rolling multivariate OLS of every column of `y` (Date x Ticker) on the shared regressors `X` (Date x K).
+
+    Cross-products (X'X, X'y, y'y and counts) are accumulated with cumulative sums per ticker block and
+    differenced over the window, then all (date, ticker) normal equations of a block are solved in one
+    batched `np.linalg.solve`. Missing returns are masked per ticker, so each stock uses its own observations.
+    Peak memory is bounded by `block_size` tickers: O(T * block_size * K^2).
+
+    Returns coefficient panels keyed by regressor (plus "alpha" when add_intercept=True), residual
+    volatility (ddof = number of coefficients), observation counts and optionally the fitted residuals
+    y_t - X_t b_t (slope terms only, alpha stays in the residual).
+    """
+    regressors = tuple(X.columns)
+    X = X.reindex(y.index)
+    x = X.to_numpy(dtype=float)
+    x_ok = ~np.isnan(x).any(axis=1)
+    x = np.where(x_ok[:, None], x, 0.0)
+    if add_intercept:
+        x = np.column_stack([x_ok.astype(float), x])
+    n_dates, n_coef = x.shape
+    min_periods = max(min_periods if min_periods is not None else window, n_coef + 1)
+    xx = x[:, :, None] * x[:, None, :]  # (T, P, P)
+
+    n_tickers = y.shape[1]
+    betas = np.full((n_coef, n_dates, n_tickers), np.nan)
+    resid_vol = np.full((n_dates, n_tickers), np.nan)
+    nobs = np.zeros((n_dates, n_tickers))
+    residuals = np.full((n_dates, n_tickers), np.nan) if return_residuals else None
+    slope = slice(1, None) if add_intercept else slice(None)
+
+    y_all = y.to_numpy(dtype=float)
+    for start in range(0, n_tickers, block_size):
+        stop = min(start + block_size, n_tickers)
+        yb = y_all[:, start:stop]
+        mask = ~np.isnan(yb) & x_ok[:, None]
+        m = mask.astype(float)
+        yz = np.where(mask, yb, 0.0)
+
+        s_n = _rolling_sum(m, window)
+        s_yy = _rolling_sum(yz * yz, window)
+        s_xy = _rolling_sum(yz[:, :, None] * x[:, None, :], window)
+        s_xx = _rolling_sum(m[:, :, None, None] * xx[:, None, :, :], window)
+
+        valid = s_n >= min_periods
+        if valid.any():
+            a = s_xx[valid]
+            b = s_xy[valid]
+            try:
+                coef = np.linalg.solve(a, b[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                coef = np.einsum("vij,vj->vi", np.linalg.pinv(a), b)
+            ssr = np.clip(s_yy[valid] - np.einsum("vi,vi->v", coef, b), 0.0, None)
+            dof = s_n[valid] - n_coef
+            block_betas = np.full((n_dates, stop - start, n_coef), np.nan)
+            block_betas[valid] = coef
+            betas[:, :, start:stop] = np.moveaxis(block_betas, -1, 0)
+            block_vol = np.full((n_dates, stop - start), np.nan)
+            block_vol[valid] = np.sqrt(ssr / np.where(dof > 0, dof, np.nan))
+            resid_vol[:, start:stop] = block_vol
+            if residuals is not None:
+                fitted = np.einsum("tnk,tk->tn", block_betas[:, :, slope], x[:, slope])
+                residuals[:, start:stop] = np.where(mask, yb - fitted, np.nan)
+        nobs[:, start:stop] = s_n
+
+    names = (("alpha",) if add_intercept else ()) + regressors
+
+    def frame(arr: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(arr, index=y.index, columns=y.columns)
+
+    return RollingOLSResult(
+        betas={name: frame(betas[i]) for i, name in enumerate(names)},
+        resid_vol=frame(resid_vol),
+        nobs=frame(nobs),
+        residuals=frame(residuals) if residuals is not None else None,
+        regressors=regressors,
+    )
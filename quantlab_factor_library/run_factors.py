@@ -1,49 +1,45 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Type, Tuple, Dict, Any
+from typing import List, Type, Dict, Any, Iterable
 
 import pandas as pd
 
 from .analytics import (
+    attach_ff_regressions,
     compute_all_analytics,
     compute_factor_correlation,
     save_correlation_matrix,
     corr_with_ff,
-    update_registry,
+    information_coefficient,
+    RegistryWriter,
+    rolling_ic_stats,
     save_diagnostics,
 )
+from .base import iter_compute_batch
 from .data_loader import DataLoader
+from .fama_macbeth import fama_macbeth, save_fama_macbeth
+from .output_sink import OutputSink
 from .factor_definitions import get_default_factors
-from .paths import factors_dir
+from .factor_store import (
+    FactorHistory,
+    FactorStore,
+    LongFactorWriter,
+    long_to_wide_arrow,
+    output_formats,
+    write_factor_dataset,
+    write_ls_arrow,
+    write_wide_arrow,
+)
+from .paths import _load_config, diagnostics_dir, factors_dir
+from .profiling import RECORDER, configure_from_settings, instrumentation_settings, stage
+from .risk_model import RiskModel
+from .transforms import clean_factor_chunked
 
 logger = logging.getLogger(__name__)
 
 
-def _run_factor_task(
-    factor,
-    sector_map,
-    fwd_returns: pd.DataFrame,
-    ff: pd.DataFrame | None,
-) -> Tuple[str, pd.DataFrame, dict]:
-    """
-    Helper to compute a single factor and analytics.
-    Uses a fresh DataLoader per task to avoid shared-state issues in threads.
-    """
-    loader = DataLoader()
-    raw_scores = factor.compute(loader, sector_map=sector_map)
-    analytics = compute_all_analytics(
-        raw_scores,
-        fwd_returns,
-        factor_name=factor.name,
-        write_registry=False,  # registry updated in caller to avoid contention
-        ff_factors=ff,
-    )
-    return factor.name, raw_scores, analytics
-
-
 def wide_to_long(df: pd.DataFrame, value_name: str = "Value") -> pd.DataFrame:
     out = df.stack().reset_index()
     out.columns = ["Date", "Ticker", value_name]
@@ -53,37 +49,127 @@ def wide_to_long(df: pd.DataFrame, value_name: str = "Value") -> pd.DataFrame:
 
 
 def save_factor(factor_name: str, factor_df: pd.DataFrame) -> Path:
+    """
+    Long Date/Ticker/Value parquet, one row group per year so date-filtered reads skip the rest,
+    and/or a column-major factor_<name>.arrow (see output_formats in config).
+    Returns the parquet path when written, else the Arrow one.
+    """
     factors_dir().mkdir(parents=True, exist_ok=True)
+    formats = output_formats()
     path = factors_dir() / f"factor_{factor_name}.parquet"
-    long_df = wide_to_long(factor_df)
-    long_df.to_parquet(path, index=False)
+    if "parquet" in formats:
+        years = pd.to_datetime(pd.Index(factor_df.index)).year
+        with LongFactorWriter(path) as writer:
+            for year in pd.unique(years):
+                writer.write(factor_df[years == year])
+    arrow_path = factors_dir() / f"factor_{factor_name}.arrow"
+    if "arrow" in formats:
+        write_wide_arrow(factor_df, arrow_path)
+        path = path if "parquet" in formats else arrow_path
+    else:
+        arrow_path.unlink(missing_ok=True)  # a stale Arrow file from an earlier run would shadow the parquet
     logger.info("Saved factor %s to %s", factor_name, path)
     return path
 
 
 def save_ls_returns(name: str, ls: pd.Series) -> Path:
     factors_dir().mkdir(parents=True, exist_ok=True)
+    formats = output_formats()
     path = factors_dir() / f"ls_{name}.parquet"
-    df = ls.reset_index()
-    df.columns = ["Date", "LS_Return"]
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-    df.to_parquet(path, index=False)
+    if "parquet" in formats:
+        df = ls.reset_index()
+        df.columns = ["Date", "LS_Return"]
+        df["Date"] = pd.to_datetime(df["Date"]).dt.date
+        df.to_parquet(path, index=False)
+    if "arrow" in formats:
+        arrow_path = write_ls_arrow(ls, factors_dir() / f"ls_{name}.arrow")
+        path = path if "parquet" in formats else arrow_path
     logger.info("Saved LS returns for %s to %s", name, path)
     return path
 
 
-def compute_factors(parallel: bool = False, max_workers: int | None = None):
+def save_factor_history(factor_name: str, factor_df: pd.DataFrame, since=None) -> int:
     """
-    Step 1: compute factors (cleaned, shifted), forward returns, and LS PnL time series.
-    Returns (factors dict, ls_returns dict, ff DataFrame).
-    Persists factors and LS PnL to disk.
+    Append a factor to the date-partitioned history (factor_store.FactorHistory): only dates
+    after the last stored one, or every date from `since` on to restate recent history (the
+    appended dates replace the stored ones). A restated date that is all NaN writes no rows, so
+    its stored values stay. Returns the number of rows written.
     """
-    loader = DataLoader()
-    sector_map = None
+    history = FactorHistory()
+    dates = pd.to_datetime(pd.Index(factor_df.index))
+    if since is not None:
+        new = factor_df[dates >= pd.Timestamp(since)]
+    else:
+        last = history.last_date(factor_name)
+        new = factor_df if last is None else factor_df[dates > pd.Timestamp(last)]
+    return history.append(factor_name, new.dropna(how="all"))  # empty dates would only add empty parts
+
+
+def save_factor_chunked(
+    factor_name: str,
+    source,
+    sector_map: pd.Series | None = None,
+    block_size: int | None = None,
+    index: pd.Index | None = None,
+    columns: pd.Index | None = None,
+    **settings,
+) -> Path:
+    """
+    Clean a raw panel too large for memory date block by date block (clean_block_dates in
+    config, default 252) and write factor_<name>.parquet as it goes. source: anything
+    transforms.iter_date_blocks reads (wide/long parquet, .npy memmap, array, DataFrame);
+    settings: clean_factor keyword arguments (e.g. factor.clean_settings()).
+    Honours output_formats like save_factor: the Arrow file is built from the long parquet a
+    block at a time (long_to_wide_arrow), which is then removed if parquet was not requested.
+    Returns the parquet path when written, else the Arrow one.
+    """
+    block_size = block_size or int(_load_config().get("clean_block_dates", 252))
+    formats = output_formats()
+    parquet_path = factors_dir() / f"factor_{factor_name}.parquet"
+    arrow_path = factors_dir() / f"factor_{factor_name}.arrow"
+    # Without "parquet" the long rows go to a dot-file FactorStore does not list
+    path = parquet_path if "parquet" in formats else factors_dir() / f".factor_{factor_name}.chunked.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with LongFactorWriter(path) as writer:
+        n_dates = clean_factor_chunked(
+            source, writer, block_size=block_size, index=index, columns=columns, sector_map=sector_map, **settings
+        )
+    if "arrow" in formats:
+        long_to_wide_arrow(path, arrow_path)
+        if "parquet" not in formats:
+            path.unlink()
+            path = arrow_path
+    else:
+        arrow_path.unlink(missing_ok=True)  # a stale Arrow file from an earlier run would shadow the parquet
+    logger.info("Saved factor %s (%d dates, blocks of %d) to %s", factor_name, n_dates, block_size, path)
+    return path
+
+
+def _sector_map_or_none(loader: DataLoader) -> pd.Series | None:
     try:
-        sector_map = loader.load_sector_map()
+        return loader.load_sector_map()
     except Exception:
         logger.warning("Sector map unavailable; sector neutralization will be skipped.")
+        return None
+
+
+def compute_factors(
+    parallel: bool = False,
+    max_workers: int | None = None,
+    factor_names: Iterable[str] | None = None,
+):
+    """
+    Step 1: compute factors (cleaned, shifted), forward returns, and LS PnL time series.
+    factor_names restricts the run to a subset of the default factors (only their modules load).
+    Returns (factors, ls_returns dict, ff DataFrame, forward returns).
+    Persists factors and LS PnL to disk as each factor completes, on a background OutputSink. With "memory": {"spill": true}
+    in config, factors is a FactorStore over the persisted files rather than an in-memory dict;
+    "memory.budget_mb" caps the estimated footprint of concurrently computed factors.
+    With "history": {"enabled": true}, factors are appended to the FactorHistory (only dates after
+    the stored ones) instead of rewriting factor_<name>.parquet and the run dataset.
+    """
+    loader = DataLoader()
+    sector_map = _sector_map_or_none(loader)
 
     ff = None
     try:
@@ -98,58 +184,130 @@ def compute_factors(parallel: bool = False, max_workers: int | None = None):
     price_wide = loader.load_price_wide(dataset="price_daily")
     fwd_returns = loader.forward_returns(price_wide)
 
-    factors = get_default_factors()
-    factor_outputs: Dict[str, pd.DataFrame] = {}
+    factors = get_default_factors(factor_names)
     ls_returns: Dict[str, pd.Series] = {}
+    computed: Dict[str, pd.DataFrame] = {}
 
-    def _task(f):
-        raw_scores = f.compute(loader, sector_map=sector_map)
-        return f.name, raw_scores
+    # Raw panels through the intermediate DAG (threaded when parallel, admitted within the memory
+    # budget), cleaned clean_batch_size at a time; each factor is persisted as soon as it is cleaned
+    # and, with memory.spill, dropped so only its name is held.
+    config = _load_config()
+    batch_size = max(1, int(config.get("clean_batch_size", 8)))
+    memory = config.get("memory", {})
+    budget_mb = memory.get("budget_mb")
+    budget_bytes = int(budget_mb * 2**20) if budget_mb else None
+    spill = bool(memory.get("spill", False))
+    history_cfg = config.get("history", {})
+    use_history = bool(history_cfg.get("enabled", False))
+    cleaned = iter_compute_batch(
+        factors,
+        loader,
+        sector_map=sector_map,
+        parallel=parallel,
+        max_workers=max_workers,
+        batch_size=batch_size,
+        budget_bytes=budget_bytes,
+        # Cached post-processed panels would sit outside the budget / defeat spilling
+        use_cache=budget_bytes is None and not spill,
+    )
+    # Writes run on the output sink (config "output_sink") while the next factors compute
+    with OutputSink.from_config() as sink:
+        for name, raw_scores in cleaned:
+            # The nightly path: history mode writes only the new dates, not the full per-factor file
+            sink.submit(save_factor_history if use_history else save_factor, name, raw_scores)
+            # Compute LS PnL for reuse in downstream steps (FF regressions are batched in run_analytics_only)
+            analytics = compute_all_analytics(raw_scores, fwd_returns, factor_name=name, write_registry=False)
+            ls_series = analytics.get("ls_returns")
+            if ls_series is not None:
+                ls_returns[name] = ls_series
+                sink.submit(save_ls_returns, name, ls_series)
+            computed[name] = None if spill else raw_scores
+    if use_history:
+        # Fold the nightly parts of busy months back into one file per month
+        FactorHistory().compact(computed, min_parts=int(history_cfg.get("compact_min_parts", 20)))
 
-    if parallel:
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futures = {ex.submit(_task, factor): factor.name for factor in factors}
-            for fut in as_completed(futures):
-                name, raw_scores = fut.result()
-                factor_outputs[name] = raw_scores
+    names = [n for n in (getattr(f, "name", None) or f.__class__.__name__ for f in factors) if n in computed]
+    if spill:
+        # No LRU: steps 2-4 read each factor (or its date blocks) once, so nothing stays resident
+        factor_outputs = FactorStore(names=names, cache_size=0, history=FactorHistory() if use_history else None)
     else:
-        for factor in factors:
-            name, raw_scores = _task(factor)
-            factor_outputs[name] = raw_scores
-
-    # Persist factors and LS PnL
-    for name, raw_scores in factor_outputs.items():
-        save_factor(name, raw_scores)
-        # Compute LS PnL for reuse in downstream steps
-        analytics = compute_all_analytics(raw_scores, fwd_returns, factor_name=name, write_registry=False, ff_factors=ff)
-        ls_series = analytics.get("ls_returns")
-        if ls_series is not None:
-            ls_returns[name] = ls_series
-            save_ls_returns(name, ls_series)
+        factor_outputs = {name: computed[name] for name in names}
+    ls_returns = {name: ls_returns[name] for name in names if name in ls_returns}
+    # All factors of the run in one columnar dataset (float32, year partitions), when configured
+    if names and "dataset" in output_formats() and not use_history:
+        write_factor_dataset(factor_outputs)
 
     return factor_outputs, ls_returns, ff, fwd_returns
 
 
+def load_saved_outputs(cache_size: int = 8, horizon: int = 1):
+    """
+    Reload a previous run without recomputing factors.
+    Returns (factors, ls_returns, ff, fwd_returns) like compute_factors, where factors is a lazy
+    FactorStore over the persisted factor_<name>.parquet files (panels load on first access), or
+    over the FactorHistory when "history.enabled" is set in config.
+    """
+    history = FactorHistory() if _load_config().get("history", {}).get("enabled", False) else None
+    store = FactorStore(cache_size=cache_size, history=history)
+    loader = DataLoader()
+    fwd_returns = loader.forward_returns(loader.load_price_wide(dataset="price_daily"), horizon=horizon)
+    return store, store.ls_returns(), store.ff(), fwd_returns
+
+
+def horizon_forward_returns(
+    loader: DataLoader | None = None,
+    horizons: Iterable[int] | None = None,
+) -> Dict[int, pd.DataFrame]:
+    """
+    Forward returns for the IC term structure, all horizons from one log-price pass.
+    Horizons default to "ic_horizons" in config (off when empty or unset; e.g. [1, 5, 10, 21, 63]).
+    """
+    if horizons is None:
+        horizons = _load_config().get("ic_horizons", [])
+    if not horizons:
+        return {}
+    loader = loader or DataLoader()
+    try:
+        price_wide = loader.load_price_wide(dataset="price_daily")
+    except Exception as exc:
+        logger.warning("Prices unavailable; IC term structure will be skipped: %s", exc)
+        return {}
+    return loader.forward_returns_multi(price_wide, horizons)
+
+
 def run_analytics_only(
     factors: Dict[str, pd.DataFrame],
     fwd_returns: pd.DataFrame,
     ff: pd.DataFrame | None = None,
     write_registry: bool = True,
+    horizon_returns: Dict[int, pd.DataFrame] | None = None,
 ):
     """
     Step 2: compute analytics given precomputed factors and fwd returns.
+    IC term structure (mean_ic_h{n}) uses horizon_returns, built via horizon_forward_returns
+    when None; pass {} to skip it.
+    FF regressions for all LS series run as one batched solve after the per-factor analytics.
     Returns analytics_results dict; optionally writes registry/diagnostics.
     """
+    if horizon_returns is None:
+        horizon_returns = horizon_forward_returns()
     analytics_results: Dict[str, dict] = {}
     for name, raw_scores in factors.items():
         analytics = compute_all_analytics(
             raw_scores,
             fwd_returns,
             factor_name=name,
-            write_registry=write_registry,
-            ff_factors=ff,
+            write_registry=False,
+            horizon_returns=horizon_returns,
         )
         analytics_results[name] = analytics
+    with stage("ff_regression_batch"):
+        attach_ff_regressions(analytics_results, ff)
+    if write_registry:
+        # One registry commit (and one diagnostics mirror write) per run
+        with stage("registry_commit"), RegistryWriter() as writer:
+            for name, analytics in analytics_results.items():
+                writer.add(name, analytics["summary"])
     return analytics_results
 
 
@@ -161,20 +319,25 @@ def compute_correlations_only(
     """
     Step 3: factor cross-correlation and LS vs FF correlation.
     """
-    corr = compute_factor_correlation(factors)
-    corr_path = None
-    if not corr.empty:
-        corr_path = save_correlation_matrix(corr)
-    ff_corr_path = None
-    if ff is not None and ls_returns:
-        ff_corr = corr_with_ff(ls_returns, ff)
-        if not ff_corr.empty:
-            ff_corr_path = save_correlation_matrix(
-                ff_corr,
-                path=factors_dir() / "factor_ff_correlation.parquet",
-                ref_name="factor_ff_correlation",
-            )
-    return corr_path, ff_corr_path
+    with stage("factor_correlation"):
+        corr = compute_factor_correlation(factors)
+    corr_path = ff_corr_path = None
+    with OutputSink.from_config() as sink:
+        if not corr.empty:
+            corr_path = sink.submit(save_correlation_matrix, corr)
+        if ff is not None and ls_returns:
+            ff_corr = corr_with_ff(ls_returns, ff)
+            if not ff_corr.empty:
+                ff_corr_path = sink.submit(
+                    save_correlation_matrix,
+                    ff_corr,
+                    path=factors_dir() / "factor_ff_correlation.parquet",
+                    ref_name="factor_ff_correlation",
+                )
+    return (
+        corr_path.result() if corr_path is not None else None,
+        ff_corr_path.result() if ff_corr_path is not None else None,
+    )
 
 
 def run_time_effects(
@@ -182,27 +345,32 @@ def run_time_effects(
     fwd_returns: pd.DataFrame,
     window: int = 252,
     step: int = 21,
+    windows: Iterable[int] | None = None,
+    ic_by_factor: Dict[str, pd.Series] | None = None,
 ):
     """
-    Step 4: rolling IC/IC IR to see time-varying performance.
-    Returns a DataFrame with factor, date, rolling_mean_ic, rolling_ic_ir.
-    """
-    rows = []
-    for name, fac in factors.items():
-        ic = compute_all_analytics(fac, fwd_returns, write_registry=False, run_ls_ptf=False)["ic"]
-        ic_roll = ic.rolling(window).mean()
-        ic_std = ic.rolling(window).std(ddof=1)
-        ic_ir = ic_roll / ic_std
-        sampled = ic_roll.iloc[::step]
-        for dt, val in sampled.dropna().items():
-            rows.append({"factor": name, "date": dt, "rolling_mean_ic": val, "rolling_ic_ir": ic_ir.get(dt)})
-    df = pd.DataFrame(rows)
+    Step 4: rolling IC/IC IR to see time-varying performance, for `window` or several `windows`.
+    IC comes from ic_by_factor when given (e.g. {name: res["ic"]} from run_analytics_only),
+    otherwise only the IC is computed per factor (no autocorr/monotonicity/LS).
+    Returns a DataFrame with factor, date, rolling_mean_ic, rolling_ic_ir, plus a window column
+    when several windows are requested.
+    """
+    windows = tuple(windows) if windows is not None else (window,)
+    if ic_by_factor is None:
+        ic_by_factor = {}
+        for name, fac in factors.items():
+            with stage("information_coefficient", name):
+                ic_by_factor[name] = information_coefficient(fac, fwd_returns)
+    with stage("rolling_ic_stats"):
+        df = rolling_ic_stats(ic_by_factor, windows=windows, step=step)
+    if len(windows) == 1:
+        df = df.drop(columns="window")  # single-window output keeps the original schema
     if not df.empty:
         out = factors_dir() / "factor_rolling_analytics.parquet"
         out.parent.mkdir(parents=True, exist_ok=True)
         df.to_parquet(out, index=False)
         # Diagnostics copies (Parquet + CSV) for quick inspection
-        diag_dir = Path(__file__).resolve().parents[1] / "diagnostics"
+        diag_dir = diagnostics_dir()
         diag_dir.mkdir(parents=True, exist_ok=True)
         diag_parquet = diag_dir / "factor_rolling_analytics.parquet"
         diag_csv = diag_dir / "factor_rolling_analytics.csv"
@@ -212,16 +380,117 @@ def run_time_effects(
     return df
 
 
-def run_all(parallel: bool = False, max_workers: int | None = None):
+def run_fama_macbeth_only(
+    factors: Dict[str, pd.DataFrame],
+    fwd_returns: pd.DataFrame,
+    sector_map: pd.Series | None = None,
+    save: bool = True,
+):
+    """
+    Step 5: Fama-MacBeth regressions of forward returns on all factors jointly
+    (sector dummies instead of an intercept when sector_map is provided). run_all runs it when
+    "fama_macbeth": {"enabled": true} is set in config.
+    Returns the FamaMacBethResult; optionally saves returns/summary.
+    """
+    result = fama_macbeth(factors, fwd_returns, sector_map=sector_map)
+    if save and not result.summary.empty:
+        save_fama_macbeth(result)
+    return result
+
+
+def run_risk_model_only(
+    factors: Dict[str, pd.DataFrame],
+    fwd_returns: pd.DataFrame,
+    sector_map: pd.Series | None = None,
+    cov_halflife: float = 126,
+    specific_halflife: float = 63,
+    save: bool = True,
+) -> RiskModel:
+    """
+    Step 6: fit the cross-sectional factor risk model (EWMA factor covariance + specific variance)
+    and persist its state under factors_dir()/risk_model. Append new days later with
+    RiskModel.load().update(...) instead of refitting history. run_all runs it when
+    "risk_model": {"enabled": true} is set in config.
+    """
+    model = RiskModel(cov_halflife=cov_halflife, specific_halflife=specific_halflife)
+    model.fit(factors, fwd_returns, sector_map=sector_map)
+    if save:
+        model.save()
+    return model
+
+
+def save_instrumentation(chrome_trace: bool | None = None) -> None:
+    """
+    Persist the stage records collected so far to factor_step_diagnostics and, when requested
+    (argument or instrumentation.chrome_trace in config), a Chrome trace in diagnostics/.
+    """
+    save_diagnostics(RECORDER.records())
+    if chrome_trace is None:
+        chrome_trace = bool(instrumentation_settings().get("chrome_trace", False))
+    if chrome_trace and RECORDER.records():
+        path = RECORDER.write_chrome_trace(diagnostics_dir() / "factor_step_trace.json")
+        logger.info("Saved Chrome trace to %s", path)
+
+
+def run_all(
+    parallel: bool = False,
+    max_workers: int | None = None,
+    profile: bool | None = None,
+    factor_names: Iterable[str] | None = None,
+):
+    """
+    Steps 1-4 (for all default factors, or the factor_names subset), plus step 5 (Fama-MacBeth)
+    and step 6 (risk model) when "fama_macbeth" / "risk_model": {"enabled": true} are set in
+    config. profile=True (or instrumentation.enabled in config / QUANTLAB_PROFILE=1) records
+    per-stage wall/CPU time and memory to factor_step_diagnostics.
+    """
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    if profile:
+        RECORDER.enable(trace_memory=bool(instrumentation_settings().get("trace_memory", False)))
+    elif profile is None:
+        configure_from_settings()
+    RECORDER.reset()
     # Step 1: compute factors + LS PnL
-    factor_outputs, ls_returns, ff, fwd_returns = compute_factors(parallel=parallel, max_workers=max_workers)
+    with stage("step1_compute_factors"):
+        factor_outputs, ls_returns, ff, fwd_returns = compute_factors(
+            parallel=parallel, max_workers=max_workers, factor_names=factor_names
+        )
     # Step 2: analytics
-    analytics_results = run_analytics_only(factor_outputs, fwd_returns, ff=ff, write_registry=True)
+    with stage("step2_analytics"):
+        analytics_results = run_analytics_only(factor_outputs, fwd_returns, ff=ff, write_registry=True)
     # Step 3: correlations
-    compute_correlations_only(factor_outputs, ls_returns=ls_returns, ff=ff)
-    # Step 4: rolling time effects
-    run_time_effects(factor_outputs, fwd_returns)
+    with stage("step3_correlations"):
+        compute_correlations_only(factor_outputs, ls_returns=ls_returns, ff=ff)
+    # Step 4: rolling time effects (reuses the step-2 IC series)
+    with stage("step4_time_effects"):
+        time_cfg = _load_config().get("time_effects", {})
+        run_time_effects(
+            factor_outputs,
+            fwd_returns,
+            step=time_cfg.get("step", 21),
+            windows=time_cfg.get("windows", [252]),
+            ic_by_factor={name: res["ic"] for name, res in analytics_results.items()},
+        )
+    config = _load_config()
+    fm_cfg, risk_cfg = config.get("fama_macbeth", {}), config.get("risk_model", {})
+    if fm_cfg.get("enabled", False) or risk_cfg.get("enabled", False):
+        sector_map = _sector_map_or_none(DataLoader())
+    # Step 5: Fama-MacBeth regressions on all factors jointly (opt-in)
+    if fm_cfg.get("enabled", False):
+        with stage("step5_fama_macbeth"):
+            run_fama_macbeth_only(factor_outputs, fwd_returns, sector_map=sector_map)
+    # Step 6: factor risk model state (opt-in)
+    if risk_cfg.get("enabled", False):
+        with stage("step6_risk_model"):
+            run_risk_model_only(
+                factor_outputs,
+                fwd_returns,
+                sector_map=sector_map,
+                cov_halflife=risk_cfg.get("cov_halflife", 126),
+                specific_halflife=risk_cfg.get("specific_halflife", 63),
+            )
+    if RECORDER.enabled:
+        save_instrumentation()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import pandas as pd
+
+from .intermediates import compute_intermediate, dependencies, footprint_panels, intermediate
+from .profiling import factor_scope, stage
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBudget:
+    """
+    Estimated bytes held by a run against an optional limit (None: unlimited). The scheduler
+    charges running nodes and held intermediates; the consumer of iter_post_processed releases
+    what it holds for a yielded factor once it is done with it.
+    """
+
+    def __init__(self, limit_bytes: int | None = None):
+        self.limit_bytes = limit_bytes
+        self.live = 0.0
+
+    def fits(self, nbytes: float) -> bool:
+        return self.limit_bytes is None or self.live + nbytes <= self.limit_bytes
+
+    def acquire(self, nbytes: float) -> None:
+        self.live += nbytes
+
+    def release(self, nbytes: float) -> None:
+        self.live = max(self.live - nbytes, 0.0)
+
+
+class SharedInputs:
+    """
+    Loader view handed to factors by the scheduler: intermediate(key) serves the run's shared
+    value (computed on the spot if the factor did not declare it); everything else is delegated
+    to the wrapped loader.
+    """
+
+    def __init__(self, data_loader, store: Dict[Any, Any], lock: threading.Lock):
+        self._loader = data_loader
+        self._store = store
+        self._lock = lock
+
+    def intermediate(self, key):
+        with self._lock:
+            if key in self._store:
+                return self._store[key]
+        logger.debug("Intermediate %r not declared; computing it for this factor only", key)
+        return intermediate(self._loader, key)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+def _is_factor(node) -> bool:
+    return isinstance(node, tuple) and node[0] == "factor"
+
+
+def build_graph(factors: list, data_loader=None) -> tuple[Dict[Any, tuple], Dict[Any, int]]:
+    """
+    DAG over intermediates and factors: {node: dependency keys} (factor nodes are ("factor", i))
+    and each node's priority, the position of the first factor needing it, so a single worker
+    computes intermediates just before their first consumer.
+    """
+    deps: Dict[Any, tuple] = {}
+    priority: Dict[Any, int] = {}
+
+    def _visit(key, prio: int) -> None:
+        priority[key] = min(priority.get(key, prio), prio)
+        if key not in deps:
+            deps[key] = dependencies(key)
+        for dep in deps[key]:
+            _visit(dep, prio)
+
+    for i, factor in enumerate(factors):
+        node = ("factor", i)
+        deps[node] = tuple(factor.required_inputs(data_loader))
+        priority[node] = i
+        for key in deps[node]:
+            _visit(key, i)
+    return deps, priority
+
+
+def iter_post_processed(
+    factors: Iterable,
+    data_loader,
+    max_workers: int | None = 1,
+    budget: MemoryBudget | None = None,
+    panel_bytes: int | None = None,
+    hold_panels: float = 0.0,
+    use_cache: bool = True,
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    post_processed() for every factor, computing the intermediates they declare (see
+    intermediates.py) once per run. Nodes run on max_workers threads as soon as their inputs
+    exist, lowest priority first; an intermediate is dropped as soon as its last consumer
+    finishes, so peak memory holds only intermediates still needed. Yields (name, post-processed
+    panel) in completion order; the first failure is raised after running work has finished.
+
+    With a budget, each node's footprint is estimated as panels x panel_bytes (one Date x
+    Ticker float64 panel; factor.memory_panels() / the intermediate's registered size) and a
+    node only starts while everything charged to the budget stays within its limit; a node
+    larger than the limit still runs once nothing else is running. A finished factor stays
+    charged hold_panels panels until the consumer calls budget.release for it.
+    use_cache=False bypasses the post-process cache (FactorBase.post_processed).
+    """
+    factors = list(factors)
+    deps, priority = build_graph(factors, data_loader)
+    consumers: Dict[Any, int] = {key: 0 for key in deps}
+    dependents: Dict[Any, list] = {key: [] for key in deps}
+    for node, node_deps in deps.items():
+        for dep in node_deps:
+            consumers[dep] += 1
+            dependents[dep].append(node)
+    missing = {node: len(node_deps) for node, node_deps in deps.items()}
+    ready = [node for node, n in missing.items() if n == 0]
+    store: Dict[Any, Any] = {}
+    lock = threading.Lock()
+    view = SharedInputs(data_loader, store, lock)
+
+    def _run(node):
+        if _is_factor(node):
+            factor = factors[node[1]]
+            with factor_scope(getattr(factor, "name", None) or factor.__class__.__name__):
+                return factor.post_processed(view, use_cache=use_cache)
+        with stage(f"intermediate:{node if isinstance(node, str) else node[0]}"):
+            with lock:
+                values = [store[dep] for dep in deps[node]]
+            return compute_intermediate(node, data_loader, values)
+
+    budget = budget or MemoryBudget()
+
+    def _footprint(node) -> float:
+        if budget.limit_bytes is None:
+            return 0.0
+        panels = factors[node[1]].memory_panels() if _is_factor(node) else footprint_panels(node)
+        return panels * (panel_bytes or 0)
+
+    hold_bytes = hold_panels * (panel_bytes or 0) if budget.limit_bytes is not None else 0.0
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        running: Dict[Any, Any] = {}
+        error = None
+        while ready or running:
+            ready.sort(key=lambda n: (priority[n], _is_factor(n)))
+            while ready and error is None and len(running) < workers:
+                if running and not budget.fits(_footprint(ready[0])):
+                    break
+                node = ready.pop(0)
+                budget.acquire(_footprint(node))
+                running[ex.submit(_run, node)] = node
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                node = running.pop(fut)
+                try:
+                    value = fut.result()
+                except Exception as exc:
+                    budget.release(_footprint(node))
+                    error = error or exc
+                    continue
+                if _is_factor(node):
+                    budget.release(_footprint(node))
+                    budget.acquire(hold_bytes)  # released by the consumer
+                    factor = factors[node[1]]
+                    yield getattr(factor, "name", None) or factor.__class__.__name__, value
+                elif consumers[node]:
+                    with lock:
+                        store[node] = value
+                for dep in deps[node]:
+                    consumers[dep] -= 1
+                    if consumers[dep] == 0:
+                        budget.release(_footprint(dep))
+                        with lock:
+                            store.pop(dep, None)
+                for nxt in dependents[node]:
+                    missing[nxt] -= 1
+                    if missing[nxt] == 0:
+                        ready.append(nxt)
+        if error is not None:
+            raise error
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Iterator
+
 import numpy as np
 import pandas as pd
 
+from . import vectorized
+from .engine import use_fast
+from .profiling import stage
+
 
 def winsorize(df: pd.DataFrame, lower: float = 0.01, upper: float = 0.99) -> pd.DataFrame:
     """
     Clip extremes cross-sectionally by date.
     """
+    if use_fast():
+        return vectorized.winsorize(df, lower=lower, upper=upper)
+
     def _clip(row: pd.Series) -> pd.Series:
         if row.dropna().empty:
             return row
@@ -22,6 +32,9 @@ def zscore(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cross-sectional z-score per date.
     """
+    if use_fast():
+        return vectorized.zscore(df)
+
     def _z(row: pd.Series) -> pd.Series:
         mean = row.mean()
         std = row.std(ddof=0)
@@ -36,6 +49,8 @@ def sector_neutralize(df: pd.DataFrame, sector_map: pd.Series) -> pd.DataFrame:
     """
     Demean factor values within each sector group.
     """
+    if use_fast():
+        return vectorized.sector_neutralize(df, sector_map)
     sector_map = sector_map.dropna()
     def _neutralize(row: pd.Series) -> pd.Series:
         if row.dropna().empty:
@@ -70,6 +85,8 @@ def fill_factor(df: pd.DataFrame, method: str | None = "median", sector_map: pd.
     """
     if method is None:
         return df
+    if use_fast():
+        return vectorized.fill_factor(df, method=method, sector_map=sector_map)
     if method == "median":
         return df.apply(lambda row: row.fillna(row.median()), axis=1)
     if method == "sector_median":
@@ -96,6 +113,8 @@ def neutralize_factor(df: pd.DataFrame, method: str = "sector", sector_map: pd.S
     if method == "sector" and sector_map is not None:
         return sector_neutralize(df, sector_map)
     if method == "global":
+        if use_fast():
+            return vectorized.global_demean(df)
         return df.apply(lambda row: row - row.mean(), axis=1)
     return df
 
@@ -125,10 +144,127 @@ def clean_factor(
         return raw_factor
 
     df = raw_factor.copy()
-    df = coverage_filter(df, min_coverage=min_coverage)
-    df = winsorize(df, lower=winsor_limits[0], upper=winsor_limits[1])
-    df = fill_factor(df, method=fill_method, sector_map=sector_map)
-    df = neutralize_factor(df, method=neutralize_method, sector_map=sector_map)
-    df = zscore(df)
-    df = drop_all_nan(df)
+    with stage("coverage_filter"):
+        df = coverage_filter(df, min_coverage=min_coverage)
+    with stage("winsorize"):
+        df = winsorize(df, lower=winsor_limits[0], upper=winsor_limits[1])
+    with stage("fill_factor"):
+        df = fill_factor(df, method=fill_method, sector_map=sector_map)
+    with stage("neutralize_factor"):
+        df = neutralize_factor(df, method=neutralize_method, sector_map=sector_map)
+    with stage("zscore"):
+        df = zscore(df)
+    with stage("drop_all_nan"):
+        df = drop_all_nan(df)
     return df
+
+
+def clean_factors(
+    panels: dict[str, pd.DataFrame],
+    settings: dict[str, dict] | None = None,
+    sector_map: pd.Series | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    clean_factor for several raw panels at once, keyed by factor name. settings[name] holds that
+    factor's clean_factor keyword arguments (missing keys use clean_factor's defaults).
+    With the fast engine the panels are stacked into one (factor x date x ticker) tensor and
+    every step runs across all of them; the reference engine loops clean_factor.
+    """
+    defaults = {"winsor_limits": (0.01, 0.99), "min_coverage": 0.3, "fill_method": "median", "neutralize_method": "sector"}
+    resolved = {name: {**defaults, **(settings or {}).get(name, {})} for name in panels}
+    if use_fast():
+        return vectorized.clean_factors(panels, resolved, sector_map=sector_map)
+    return {name: clean_factor(panel, sector_map=sector_map, **resolved[name]) for name, panel in panels.items()}
+
+
+def iter_date_blocks(
+    source,
+    block_size: int = 252,
+    index: pd.Index | None = None,
+    columns: pd.Index | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a raw Date x Ticker panel as consecutive blocks of at most block_size dates without
+    materializing the whole panel. source can be:
+      - a wide DataFrame
+      - a 2D array / np.memmap (dates x tickers) with index and columns given
+      - a .npy path (opened with mmap_mode="r"; index and columns required)
+      - a parquet path: wide (date index, ticker columns; read batch by batch) or long
+        (Date, Ticker, Value as written by save_factor; read one date range at a time)
+    Every block has the same columns: `columns` when given, else the full panel's tickers (for
+    long parquet, every ticker in the file), so per-date coverage is measured against the same
+    universe as when cleaning the whole panel.
+    """
+    block_size = max(int(block_size), 1)
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), block_size):
+            block = source.iloc[start : start + block_size]
+            yield block if columns is None else block.reindex(columns=columns)
+        return
+    if isinstance(source, (str, Path)) and Path(source).suffix == ".npy":
+        source = np.load(source, mmap_mode="r")
+    if isinstance(source, np.ndarray):
+        if index is None or columns is None:
+            raise ValueError("index and columns are required for array sources")
+        if source.shape != (len(index), len(columns)):
+            raise ValueError(f"array shape {source.shape} does not match index/columns ({len(index)}, {len(columns)})")
+        for start in range(0, len(index), block_size):
+            values = np.asarray(source[start : start + block_size], dtype=float)
+            yield pd.DataFrame(values, index=index[start : start + block_size], columns=columns)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(source)
+    if pf.schema_arrow.names[:3] == ["Date", "Ticker", "Value"]:
+        keys = pq.read_table(source, columns=["Date", "Ticker"])
+        dates = pd.Index(keys.column("Date").unique().to_pylist()).sort_values()
+        if columns is None:
+            columns = pd.Index(keys.column("Ticker").unique().to_pylist(), dtype=object).sort_values()
+        del keys
+        for start in range(0, len(dates), block_size):
+            block = dates[start : start + block_size]
+            long = pd.read_parquet(source, filters=[("Date", ">=", block[0]), ("Date", "<=", block[-1])])
+            wide = long.pivot(index="Date", columns="Ticker", values="Value").sort_index()
+            wide.index.name = None
+            wide.columns.name = None
+            yield wide.reindex(columns=columns)
+        return
+    for batch in pf.iter_batches(batch_size=block_size):
+        block = pa.Table.from_batches([batch], schema=pf.schema_arrow).to_pandas()
+        yield block if columns is None else block.reindex(columns=columns)
+
+
+def clean_factor_chunked(
+    source,
+    sink,
+    block_size: int = 252,
+    index: pd.Index | None = None,
+    columns: pd.Index | None = None,
+    sector_map: pd.Series | None = None,
+    winsor_limits: tuple[float, float] = (0.01, 0.99),
+    min_coverage: float = 0.3,
+    fill_method: str | None = "median",
+    neutralize_method: str = "sector",
+) -> int:
+    """
+    Streaming clean_factor: every step is cross-sectional, so cleaning date blocks one at a time
+    gives the same rows as cleaning the whole panel. Blocks come from iter_date_blocks(source)
+    and each cleaned block goes to sink.write(block) (e.g. factor_store.LongFactorWriter), so
+    peak memory is bounded by block_size x tickers. Returns the number of dates written.
+    """
+    written = 0
+    for block in iter_date_blocks(source, block_size, index=index, columns=columns):
+        cleaned = clean_factor(
+            block,
+            sector_map=sector_map,
+            winsor_limits=winsor_limits,
+            min_coverage=min_coverage,
+            fill_method=fill_method,
+            neutralize_method=neutralize_method,
+        )
+        if not cleaned.empty:
+            sink.write(cleaned)
+            written += len(cleaned)
+    return written
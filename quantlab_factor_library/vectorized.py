@@ -0,0 +1,566 @@
+"""
+Numpy kernels for the cross-sectional transforms and analytics.
+
+Each public function mirrors the reference implementation of the same name in transforms.py /
+analytics.py (same arguments, labels and NaN semantics) but works on whole panels instead of
+one date at a time. Kernels operate along the last axis, so they also accept stacked
+(..., dates, tickers) arrays. AnalyticsPanel aligns, ranks and sorts one factor once for all
+of its analytics (compute_all_analytics). Select them with engine "fast" (see engine.py) once
+benchmarks.equivalence reports no drift.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------------------------- helpers
+def as_float_array(df: pd.DataFrame) -> np.ndarray:
+    """Float64 copy of a panel; pd.NA/None become NaN (object panels from replace(0, pd.NA))."""
+    return df.to_numpy(dtype=float, na_value=np.nan)
+
+
+def _pct(q: float) -> float:
+    # pandas hands quantiles to np.percentile as q * 100, which divides by 100 again
+    return np.true_divide(q * 100.0, 100)
+
+
+def sort_valid(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort along the last axis (NaNs last) and count non-NaN values."""
+    return np.sort(x, axis=-1), (~np.isnan(x)).sum(axis=-1)
+
+
+def sorted_quantile(sorted_x: np.ndarray, n: np.ndarray, q: float) -> np.ndarray:
+    """
+    Linear-interpolated quantile of the first n values of each sorted slice; identical to
+    pandas Series.quantile (numpy "linear" method, including its lerp rounding). NaN where n == 0.
+    """
+    q = _pct(q)
+    vi = (n - 1) * q
+    lo = np.clip(np.floor(vi), 0, np.maximum(n - 1, 0)).astype(np.intp)
+    hi = np.minimum(lo + 1, np.maximum(n - 1, 0))
+    t = vi - np.floor(vi)
+    a = np.take_along_axis(sorted_x, lo[..., None], axis=-1)[..., 0]
+    b = np.take_along_axis(sorted_x, hi[..., None], axis=-1)[..., 0]
+    diff = b - a
+    out = a + diff * t
+    out = np.where(t >= 0.5, b - diff * (1 - t), out)
+    return np.where(n > 0, out, np.nan)
+
+
+def sorted_median(sorted_x: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Median of the first n values of each sorted slice (mean of the two middle values)."""
+    m = np.maximum(n - 1, 0)
+    a = np.take_along_axis(sorted_x, (m // 2)[..., None], axis=-1)[..., 0]
+    b = np.take_along_axis(sorted_x, ((m + 1) // 2)[..., None], axis=-1)[..., 0]
+    return np.where(n > 0, np.where(m % 2 == 0, a, (a + b) / 2), np.nan)
+
+
+def pairwise_sum(x: np.ndarray) -> np.ndarray:
+    """
+    Sum over the last axis in the exact order numpy uses for a 1-D array (pairwise blocks of
+    8, split above 128 elements). A 2-D x.sum(axis=-1) may accumulate sequentially instead,
+    which is an ulp away from the per-row Series.mean() of the reference code and enough to
+    turn an exactly-zero sector demean into noise that zscore then blows up.
+    """
+    n = x.shape[-1]
+    if n < 8:
+        res = np.zeros(x.shape[:-1])
+        for i in range(n):
+            res = res + x[..., i]
+        return res
+    if n <= 128:
+        r = [x[..., j].copy() for j in range(8)]
+        i = 8
+        while i < n - n % 8:
+            for j in range(8):
+                r[j] += x[..., i + j]
+            i += 8
+        res = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]))
+        for k in range(i, n):
+            res = res + x[..., k]
+        return res
+    n2 = n // 2
+    n2 -= n2 % 8
+    return pairwise_sum(x[..., :n2]) + pairwise_sum(x[..., n2:])
+
+
+def masked_mean(x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Mean of x where mask over the last axis (NaN when empty). When mask is just the non-NaN
+    positions this is bit-identical to Series.mean() on each slice.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pairwise_sum(np.where(mask, x, 0.0)) / mask.sum(axis=-1)
+
+
+def nan_mean_std(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and population std (ddof=0) over the last axis, computed like pandas nanops."""
+    valid = ~np.isnan(x)
+    mean = masked_mean(x, valid)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sq = np.where(valid, (mean[..., None] - x) ** 2, 0.0)
+        std = np.sqrt(pairwise_sum(sq) / valid.sum(axis=-1))
+    return mean, std
+
+
+def sector_groups(
+    sector_map: pd.Series,
+    columns: pd.Index,
+    drop_na: bool = True,
+    keep_absent: bool = False,
+) -> Tuple[list, np.ndarray]:
+    """
+    Column positions per sector, in sector_map order (the order the reference groupby visits
+    them), and a mask of columns absent from sector_map. With drop_na=False, tickers mapped to a
+    NaN sector count as present but belong to no group. With keep_absent=True, mapped tickers
+    missing from columns stay in their group at position len(columns) (a NaN pad column), as
+    they do after the reference reindexes each row to sector_map.
+    """
+    smap = sector_map.dropna() if drop_na else sector_map
+    smap = smap[~smap.index.duplicated(keep="first")]
+    pos = pd.Index(columns).get_indexer(smap.index)
+    missing = np.ones(len(columns), dtype=bool)
+    missing[pos[pos >= 0]] = False
+    if keep_absent:
+        pos = np.where(pos >= 0, pos, len(columns))
+    else:
+        smap, pos = smap[pos >= 0], pos[pos >= 0]
+    groups = [pos[(smap == s).to_numpy()] for s in pd.unique(smap.dropna())]
+    return groups, missing
+
+
+def _frame(values: np.ndarray, like: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+
+# ---------------------------------------------------------------------- array kernels
+def winsorize_array(x: np.ndarray, lower: float = 0.01, upper: float = 0.99) -> np.ndarray:
+    s, n = sort_valid(x)
+    lo = sorted_quantile(s, n, lower)[..., None]
+    hi = sorted_quantile(s, n, upper)[..., None]
+    return np.where(np.isnan(x), np.nan, np.minimum(np.maximum(x, lo), hi))
+
+
+def zscore_array(x: np.ndarray) -> np.ndarray:
+    mean, std = nan_mean_std(x)
+    ok = (std != 0) & ~np.isnan(std)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x - mean[..., None]) / std[..., None]
+    return np.where(ok[..., None], z, np.nan)
+
+
+def group_demean_array(x: np.ndarray, groups: list, missing: np.ndarray) -> np.ndarray:
+    # trailing NaN pad column for groups built with keep_absent=True
+    padded = np.concatenate([x, np.full(x.shape[:-1] + (1,), np.nan)], axis=-1)
+    out = np.full_like(padded, np.nan)
+    for cols in groups:
+        block = padded[..., cols]
+        mean = masked_mean(block, ~np.isnan(block))
+        out[..., cols] = block - mean[..., None]
+    out = out[..., :-1]
+    out[..., missing] = np.nan
+    return out
+
+
+def median_fill_array(x: np.ndarray) -> np.ndarray:
+    s, n = sort_valid(x)
+    med = sorted_median(s, n)
+    return np.where(np.isnan(x), med[..., None], x)
+
+
+def group_median_fill_array(x: np.ndarray, groups: list, missing: np.ndarray) -> np.ndarray:
+    out = x.copy()
+    for cols in groups:
+        block = x[..., cols]
+        s, n = sort_valid(block)
+        med = sorted_median(s, n)
+        out[..., cols] = np.where(np.isnan(block), med[..., None], block)
+    out[..., missing] = np.nan
+    return out
+
+
+def argsort_last(x: np.ndarray) -> np.ndarray:
+    """Stable ascending order along the last axis, NaNs last."""
+    return np.argsort(x, axis=-1, kind="stable")
+
+
+def restrict_order(order: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Sort order of x restricted to mask, derived from x's full order without sorting values
+    again: a stable partition that moves masked-out entries to the end.
+    """
+    keep = np.take_along_axis(mask, order, axis=-1)
+    return np.take_along_axis(order, np.argsort(~keep, axis=-1, kind="stable"), axis=-1)
+
+
+def rank_array(x: np.ndarray, order: np.ndarray | None = None) -> np.ndarray:
+    """
+    Average-tie ranks (1..n) along the last axis; NaN stays NaN (scipy rankdata "average").
+    order: precomputed argsort_last(x) (or restrict_order for a masked x).
+    """
+    x = np.asarray(x, dtype=float)
+    if x.size == 0:
+        return x.copy()
+    order = argsort_last(x) if order is None else order
+    s = np.take_along_axis(x, order, axis=-1)
+    m = s.shape[-1]
+    pos = np.broadcast_to(np.arange(m), s.shape)
+    starts = np.ones(s.shape, dtype=bool)
+    starts[..., 1:] = s[..., 1:] != s[..., :-1]
+    ends = np.ones(s.shape, dtype=bool)
+    ends[..., :-1] = starts[..., 1:]
+    first = np.maximum.accumulate(np.where(starts, pos, 0), axis=-1)
+    last = np.flip(np.minimum.accumulate(np.flip(np.where(ends, pos, m), axis=-1), axis=-1), axis=-1)
+    ranks_sorted = np.where(np.isnan(s), np.nan, (first + last) / 2.0 + 1.0)
+    out = np.empty_like(ranks_sorted)
+    np.put_along_axis(out, order, ranks_sorted, axis=-1)
+    return out
+
+
+def masked_ranks(x: np.ndarray, mask: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """rank_array(x where mask) reusing x's full sort order."""
+    return rank_array(np.where(mask, x, np.nan), restrict_order(order, mask))
+
+
+def _rank_corr(rx: np.ndarray, ry: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Pearson correlation of ranks over mask (ranks 1..n, so the mean is (n + 1) / 2)."""
+    n = mask.sum(axis=-1)
+    mean = (n + 1) / 2.0
+    dx = np.where(mask, rx - mean[..., None], 0.0)
+    dy = np.where(mask, ry - mean[..., None], 0.0)
+    sxy = (dx * dy).sum(axis=-1)
+    div = np.sqrt((dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(div != 0, sxy / div, np.nan)
+
+
+def spearman_rows(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Per-slice Spearman correlation over jointly non-NaN entries of x and y."""
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    rx = rank_array(np.where(mask, x, np.nan))
+    ry = rank_array(np.where(mask, y, np.nan))
+    return _rank_corr(rx, ry, mask)
+
+
+def spearman_rows_multi(x: np.ndarray, ys: list, order: np.ndarray | None = None) -> list:
+    """
+    spearman_rows(x, y) for several y panels of x's shape, sorting x once (or reusing `order`,
+    its argsort_last); each joint mask only partitions that order.
+    """
+    valid = ~np.isnan(x)
+    order = argsort_last(x) if order is None else order
+    out = []
+    for y in ys:
+        mask = valid & ~np.isnan(y)
+        rx = masked_ranks(x, mask, order)
+        ry = rank_array(np.where(mask, y, np.nan))
+        out.append(_rank_corr(rx, ry, mask))
+    return out
+
+
+def qcut_labels(x: np.ndarray, buckets: int, sorted_counts: Tuple[np.ndarray, np.ndarray] | None = None) -> np.ndarray:
+    """
+    pd.qcut(row, buckets, labels=False, duplicates="drop") for every slice; -1 where NaN or
+    unassigned (e.g. a constant cross-section collapses to one edge and gets no bucket).
+    sorted_counts: precomputed sort_valid(x).
+    """
+    s, n = sort_valid(x) if sorted_counts is None else sorted_counts
+    edges = [sorted_quantile(s, n, q) for q in np.linspace(0, 1, buckets + 1)]
+    ids = np.zeros(x.shape, dtype=np.int64)
+    n_unique = np.zeros(n.shape, dtype=np.int64)
+    for k, e in enumerate(edges):
+        uniq = np.ones(n.shape, dtype=bool) if k == 0 else e != edges[k - 1]
+        n_unique += uniq
+        ids += (uniq[..., None] & (e[..., None] < x)).astype(np.int64)
+    ids = np.where(x == edges[0][..., None], 1, ids)
+    ok = ~np.isnan(x) & (ids >= 1) & (ids <= (n_unique - 1)[..., None])
+    return np.where(ok, ids - 1, -1)
+
+
+def bucket_means(labels: np.ndarray, y: np.ndarray, buckets: int) -> np.ndarray:
+    """(..., buckets) mean of y per label; NaN for empty buckets."""
+    out = np.full(labels.shape[:-1] + (buckets,), np.nan)
+    for k in range(buckets):
+        out[..., k] = masked_mean(y, labels == k)
+    return out
+
+
+def long_short_array(
+    x: np.ndarray,
+    y: np.ndarray,
+    top_pct: float,
+    bottom_pct: float,
+    sorted_counts: Tuple[np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray:
+    """
+    Top-minus-bottom percentile mean of y per slice over jointly non-NaN entries.
+    sorted_counts: precomputed sort_valid of x restricted to the joint mask.
+    """
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    xm = np.where(mask, x, np.nan)
+    s, n = sort_valid(xm) if sorted_counts is None else sorted_counts
+    long_cut = sorted_quantile(s, n, 1 - top_pct)[..., None]
+    short_cut = sorted_quantile(s, n, bottom_pct)[..., None]
+    lm = mask & (xm >= long_cut)
+    sm = mask & (xm <= short_cut)
+    long_ret = masked_mean(y, lm)
+    short_ret = masked_mean(y, sm)
+    return np.where((lm.sum(axis=-1) > 0) & (sm.sum(axis=-1) > 0), long_ret - short_ret, np.nan)
+
+
+# ---------------------------------------------------------------------- panel API (mirrors reference)
+def winsorize(df: pd.DataFrame, lower: float = 0.01, upper: float = 0.99) -> pd.DataFrame:
+    return _frame(winsorize_array(as_float_array(df), lower, upper), df)
+
+
+def zscore(df: pd.DataFrame) -> pd.DataFrame:
+    return _frame(zscore_array(as_float_array(df)), df)
+
+
+def sector_neutralize(df: pd.DataFrame, sector_map: pd.Series) -> pd.DataFrame:
+    groups, missing = sector_groups(sector_map, df.columns, keep_absent=True)
+    return _frame(group_demean_array(as_float_array(df), groups, missing), df)
+
+
+def global_demean(df: pd.DataFrame) -> pd.DataFrame:
+    x = as_float_array(df)
+    mean, _ = nan_mean_std(x)
+    return _frame(x - mean[:, None], df)
+
+
+def fill_factor(df: pd.DataFrame, method: str | None = "median", sector_map: pd.Series | None = None) -> pd.DataFrame:
+    if method is None:
+        return df
+    if method == "median":
+        return _frame(median_fill_array(as_float_array(df)), df)
+    if method == "sector_median":
+        if sector_map is None:
+            return df
+        groups, missing = sector_groups(sector_map, df.columns, drop_na=False)
+        return _frame(group_median_fill_array(as_float_array(df), groups, missing), df)
+    return df
+
+
+def _own_mean_std(x: np.ndarray, cols: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    nan_mean_std of each x[k] over its own columns cols[k], gathered in the factor's own order so
+    the pairwise sums match cleaning that factor alone. Factors sharing a column set share a call.
+    """
+    mean = np.empty(x.shape[:2])
+    std = np.empty(x.shape[:2])
+    by_cols: dict = {}
+    for k, c in enumerate(cols):
+        by_cols.setdefault(c.tobytes(), []).append(k)
+    for ks in by_cols.values():
+        c = cols[ks[0]]
+        sub = x[ks] if np.array_equal(c, np.arange(x.shape[-1])) else x[ks][..., c]
+        mean[ks], std[ks] = nan_mean_std(sub)
+    return mean, std
+
+
+def clean_tensor(
+    x: np.ndarray,
+    cols: list,
+    settings: list,
+    tickers: pd.Index,
+    sector_map: pd.Series | None = None,
+) -> np.ndarray:
+    """
+    clean_factor (coverage, winsorize, fill, neutralize, zscore) on a (K, dates, tickers) tensor
+    in place of K separate calls. cols[k]: positions of factor k's own tickers (its order);
+    settings[k]: resolved winsor_limits/min_coverage/fill_method/neutralize_method. Cells outside
+    a factor's own tickers stay NaN. Sector groups are derived once for all factors. Rows removed
+    by the coverage filter come back all-NaN (the caller drops all-NaN dates).
+    """
+    k_all = np.arange(len(settings))
+    own = np.zeros(x.shape[::2], dtype=bool)
+    for k, c in enumerate(cols):
+        own[k, c] = True
+    own_mask = own[:, None, :]
+
+    min_cov = np.array([st["min_coverage"] for st in settings], dtype=float)
+    coverage = (~np.isnan(x)).sum(axis=-1) / own.sum(axis=1)[:, None]
+    x[coverage < min_cov[:, None]] = np.nan
+
+    lower = np.array([st["winsor_limits"][0] for st in settings], dtype=float)[:, None]
+    upper = np.array([st["winsor_limits"][1] for st in settings], dtype=float)[:, None]
+    s, n = sort_valid(x)
+    lo, hi = sorted_quantile(s, n, lower)[..., None], sorted_quantile(s, n, upper)[..., None]
+    x = np.where(np.isnan(x), np.nan, np.minimum(np.maximum(x, lo), hi))
+    del s
+
+    fill = np.array([st["fill_method"] for st in settings], dtype=object)
+    ks = k_all[fill == "median"]
+    if len(ks):
+        x[ks] = median_fill_array(x[ks])
+    ks = k_all[fill == "sector_median"]
+    if len(ks) and sector_map is not None:
+        groups, missing = sector_groups(sector_map, tickers, drop_na=False)
+        x[ks] = group_median_fill_array(x[ks], groups, missing)
+    x = np.where(own_mask, x, np.nan)
+
+    neutral = np.array([st["neutralize_method"] for st in settings], dtype=object)
+    ks = k_all[neutral == "sector"]
+    if len(ks) and sector_map is not None:
+        groups, missing = sector_groups(sector_map, tickers, keep_absent=True)
+        x[ks] = group_demean_array(x[ks], groups, missing)
+    ks = k_all[neutral == "global"]
+    if len(ks):
+        mean, _ = _own_mean_std(x[ks], [cols[k] for k in ks])
+        x[ks] = x[ks] - mean[..., None]
+
+    mean, std = _own_mean_std(x, cols)
+    ok = (std != 0) & ~np.isnan(std)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x - mean[..., None]) / std[..., None]
+    return np.where(ok[..., None] & own_mask, z, np.nan)
+
+
+def clean_factors(panels: dict, settings: dict, sector_map: pd.Series | None = None) -> dict:
+    """
+    clean_factor for several panels in one call: stack them onto the union Date x Ticker grid
+    as one float tensor, run clean_tensor with per-factor settings, then copy each factor's own
+    dates/tickers back out, so a cleaned panel never keeps the whole K-factor tensor alive.
+    """
+    names = [name for name, panel in panels.items() if not panel.empty]
+    if not names:
+        return dict(panels)
+    dates, tickers = panels[names[0]].index, panels[names[0]].columns
+    for name in names[1:]:
+        dates, tickers = dates.union(panels[name].index), tickers.union(panels[name].columns)
+    x = np.full((len(names), len(dates), len(tickers)), np.nan)
+    rows, cols = [], []
+    for k, name in enumerate(names):
+        panel = panels[name]
+        r, c = dates.get_indexer(panel.index), tickers.get_indexer(panel.columns)
+        x[k][np.ix_(r, c)] = as_float_array(panel)
+        rows.append(r)
+        cols.append(c)
+    x = clean_tensor(x, cols, [settings[name] for name in names], tickers, sector_map)
+    out = {}
+    for k, name in enumerate(names):
+        panel = panels[name]
+        r, c = rows[k], cols[k]
+        keep = ~np.isnan(x[k][r][:, c]).all(axis=1)
+        identity = np.array_equal(r, np.arange(len(dates))) and np.array_equal(c, np.arange(len(tickers)))
+        values = x[k].copy() if identity and keep.all() else x[k][np.ix_(r[keep], c)]
+        out[name] = pd.DataFrame(values, index=panel.index[keep], columns=panel.columns, copy=False)
+    return {name: out.get(name, panels[name]) for name in panels}
+
+
+class AnalyticsPanel:
+    """
+    A factor panel on its own Date x Ticker grid plus (optionally) forward returns aligned onto
+    that grid, with per-date ranks and sorted cross-sections built once on first use and shared
+    by IC, autocorrelation, monotonicity, long-short and the IC term structure. Returns missing
+    for a date/ticker become NaN, which drops them just like the reference intersection + dropna.
+    """
+
+    def __init__(self, factor: pd.DataFrame, fwd_returns: pd.DataFrame | None = None):
+        self.factor = factor
+        self.dates = factor.index
+        self.x = as_float_array(factor)
+        self.valid = ~np.isnan(self.x)
+        self.y = None if fwd_returns is None else self.on_grid(fwd_returns)
+
+    def on_grid(self, df: pd.DataFrame) -> np.ndarray:
+        return df.reindex(index=self.dates, columns=self.factor.columns).to_numpy(dtype=float, na_value=np.nan)
+
+    @cached_property
+    def order(self) -> np.ndarray:
+        """Per-date sort order of the factor; every rank and quantile below derives from it."""
+        return argsort_last(self.x)
+
+    @cached_property
+    def joint(self) -> np.ndarray:
+        if self.y is None:
+            raise ValueError("AnalyticsPanel was built without forward returns")
+        return self.valid & ~np.isnan(self.y)
+
+    @cached_property
+    def joint_order(self) -> np.ndarray:
+        return restrict_order(self.order, self.joint)
+
+    @cached_property
+    def joint_x(self) -> np.ndarray:
+        return np.where(self.joint, self.x, np.nan)
+
+    @cached_property
+    def joint_ranks(self) -> np.ndarray:
+        """Per-date factor ranks over dates/tickers with a forward return (rank/percentile matrix)."""
+        return rank_array(self.joint_x, self.joint_order)
+
+    @cached_property
+    def joint_sorted_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        return np.take_along_axis(self.joint_x, self.joint_order, axis=-1), self.joint.sum(axis=-1)
+
+    def information_coefficient(self) -> pd.Series:
+        ry = rank_array(np.where(self.joint, self.y, np.nan))
+        return pd.Series(_rank_corr(self.joint_ranks, ry, self.joint), index=self.dates).dropna()
+
+    def ic_term_structure(self, fwd_by_horizon: dict) -> pd.DataFrame:
+        horizons = list(fwd_by_horizon)
+        ys = [self.on_grid(fwd_by_horizon[h]) for h in horizons]
+        ic = np.column_stack(spearman_rows_multi(self.x, ys, order=self.order)) if ys else np.empty((len(self.dates), 0))
+        return pd.DataFrame(ic, index=self.dates, columns=horizons).dropna(how="all")
+
+    def factor_autocorrelation(self) -> pd.Series:
+        if len(self.x) < 2:
+            return pd.Series(dtype=float)
+        x, valid, order = self.x, self.valid, self.order
+        mask = valid[:-1] & valid[1:]
+        left = masked_ranks(x[:-1], mask, order[:-1])
+        right = masked_ranks(x[1:], mask, order[1:])
+        return pd.Series(_rank_corr(left, right, mask), index=self.dates[:-1]).dropna()
+
+    def factor_monotonicity(self, buckets: int = 10) -> Tuple[pd.Series, pd.Series]:
+        mask = self.joint
+        eligible = mask.sum(axis=1) >= buckets
+        labels = qcut_labels(self.joint_x, buckets, self.joint_sorted_counts)
+        means = bucket_means(labels, self.y, buckets)[eligible]
+        present = ~np.isnan(means)
+        has_any = present.any(axis=1)
+        with np.errstate(invalid="ignore"):
+            spread = np.nanmax(means[has_any], axis=1) - np.nanmin(means[has_any], axis=1) if has_any.any() else []
+        spread_series = pd.Series(spread, index=self.dates[eligible][has_any])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = np.where(present.any(axis=0), np.nansum(means, axis=0) / present.sum(axis=0), np.nan)
+        return spread_series.dropna(), pd.Series(avg, index=range(buckets))
+
+    def long_short_returns(self, top_pct: float = 0.1, bottom_pct: float = 0.1) -> pd.Series:
+        if top_pct <= 0 or bottom_pct <= 0 or top_pct + bottom_pct >= 1:
+            raise ValueError("top_pct and bottom_pct must be > 0 and sum to < 1.")
+        ls = long_short_array(self.x, self.y, top_pct, bottom_pct, self.joint_sorted_counts)
+        keep = ~np.isnan(ls)
+        return pd.Series(ls[keep], index=self.dates[keep])
+
+
+def information_coefficient(factor: pd.DataFrame, fwd_returns: pd.DataFrame) -> pd.Series:
+    return AnalyticsPanel(factor, fwd_returns).information_coefficient()
+
+
+def ic_term_structure(factor: pd.DataFrame, fwd_by_horizon: dict) -> pd.DataFrame:
+    """Dates x horizons Spearman IC; the factor panel is aligned and ranked once."""
+    return AnalyticsPanel(factor).ic_term_structure(fwd_by_horizon)
+
+
+def factor_autocorrelation(factor: pd.DataFrame) -> pd.Series:
+    return AnalyticsPanel(factor).factor_autocorrelation()
+
+
+def factor_monotonicity(factor: pd.DataFrame, fwd_returns: pd.DataFrame, buckets: int = 10) -> Tuple[pd.Series, pd.Series]:
+    return AnalyticsPanel(factor, fwd_returns).factor_monotonicity(buckets)
+
+
+def long_short_returns(
+    factor: pd.DataFrame,
+    fwd_returns: pd.DataFrame,
+    top_pct: float = 0.1,
+    bottom_pct: float = 0.1,
+) -> pd.Series:
+    return AnalyticsPanel(factor, fwd_returns).long_short_returns(top_pct, bottom_pct)
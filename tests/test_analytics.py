@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from quantlab_factor_library.analytics import RegistryWriter, compute_factor_correlations, regress_on_ff_batch
+
+FF_COLS = ["mktrf", "smb", "hml", "rmw", "cma", "umd"]
+
+
+def _ff_and_ls(n=300, n_series=5, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2022-01-03", periods=n).date
+    ff = pd.DataFrame(rng.standard_normal((n, len(FF_COLS))) * 0.01, index=dates, columns=FF_COLS)
+    ff.iloc[7, 2] = np.nan  # dropped from the design
+    ls = {}
+    for i in range(n_series):
+        s = pd.Series(ff.fillna(0).to_numpy() @ rng.standard_normal(len(FF_COLS)) * 0.5, index=dates)
+        s += rng.standard_normal(n) * 0.004 + 0.0002
+        if i % 2:
+            s[rng.random(n) < 0.15] = np.nan  # distinct NaN pattern per odd series
+        ls[f"f{i}"] = s
+    return ff, ls
+
+
+def _ols(y: pd.Series, ff: pd.DataFrame, hac_lags: int | None = None) -> dict:
+    df = pd.concat([y.rename("y"), ff], axis=1).dropna()
+    X = np.column_stack([np.ones(len(df)), df[FF_COLS].to_numpy()])
+    yv = df["y"].to_numpy()
+    beta, *_ = np.linalg.lstsq(X, yv, rcond=None)
+    resid = yv - X @ beta
+    n, k = X.shape
+    xtx_inv = np.linalg.inv(X.T @ X)
+    if hac_lags is None:
+        cov = xtx_inv * (resid @ resid) / (n - k)
+    else:
+        Z = X * resid[:, None]
+        S = Z.T @ Z
+        for lag in range(1, hac_lags + 1):
+            G = Z[lag:].T @ Z[:-lag]
+            S += (1 - lag / (hac_lags + 1)) * (G + G.T)
+        cov = xtx_inv @ S @ xtx_inv
+    t = beta / np.sqrt(np.diag(cov))
+    return {"beta": beta, "t": t, "p": 2 * stats.t.sf(np.abs(t), df=n - k)}
+
+
+def _as_arrays(res: dict) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    beta = [res["alpha"]] + [res[f"beta_{c}"] for c in FF_COLS]
+    t = [res["t_alpha"]] + [res[f"t_{c}"] for c in FF_COLS]
+    p = [res["p_alpha"]] + [res[f"p_{c}"] for c in FF_COLS]
+    return np.array(beta), np.array(t), np.array(p)
+
+
+def test_regress_on_ff_batch_matches_per_series_ols():
+    ff, ls = _ff_and_ls()
+    batch = regress_on_ff_batch(ls, ff)
+    hac = regress_on_ff_batch(ls, ff, hac=True, hac_lags=4)
+    for name, series in ls.items():
+        for res, lags in ((batch[name], None), (hac[name], 4)):
+            beta, t, p = _as_arrays(res)
+            expected = _ols(series, ff, hac_lags=lags)
+            np.testing.assert_allclose(beta, expected["beta"], rtol=1e-8, atol=1e-12)
+            np.testing.assert_allclose(t, expected["t"], rtol=1e-7)
+            np.testing.assert_allclose(p, expected["p"], rtol=1e-6, atol=1e-12)
+
+
+def _scores(seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=90).date
+    tickers = [f"T{i:02d}" for i in range(15)]
+    base = rng.standard_normal((90, 15))
+    scores = {}
+    for i, name in enumerate(["a", "b", "c"]):
+        panel = pd.DataFrame(base * (i - 1) + rng.standard_normal((90, 15)), index=dates, columns=tickers)
+        scores[name] = panel.mask(rng.random(panel.shape) < 0.1).iloc[i * 5 :, i:]  # own axes per factor
+    return scores
+
+
+def _stacked_baseline(scores, method, join="inner"):
+    aligned = pd.concat([df.stack().rename(n) for n, df in scores.items()], axis=1, join=join).dropna(how="all")
+    return aligned.corr(method=method)
+
+
+def test_compute_factor_correlations_matches_stacked_baseline():
+    scores = _scores()
+    methods = ("pearson", "spearman", "kendall")
+    streamed = compute_factor_correlations(scores, methods=methods, block_size=7)
+    assert list(streamed) == list(methods)
+    for method in methods:
+        pd.testing.assert_frame_equal(streamed[method], _stacked_baseline(scores, method), rtol=1e-10)
+    pairwise = compute_factor_correlations(scores, methods=("pearson",), pairwise=True, block_size=7)["pearson"]
+    pd.testing.assert_frame_equal(pairwise, _stacked_baseline(scores, "pearson", join="outer"), rtol=1e-10)
+
+
+def _commit_rows(registry, worker, n_rows):
+    for i in range(n_rows):
+        with RegistryWriter(registry, mirror_diagnostics=False) as writer:
+            writer.add(f"w{worker}_f{i}", {"mean_ic": float(worker), "n_obs": i})
+            writer.add("shared", {"mean_ic": float(worker), "n_obs": i})
+
+
+def test_registry_writer_concurrent_commits_keep_every_row(tmp_path):
+    registry = tmp_path / "factor_analytics_summary.parquet"
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_commit_rows, args=(registry, w, 5)) for w in range(4)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(60)
+        assert proc.exitcode == 0
+    df = pd.read_parquet(registry)
+    expected = {f"w{w}_f{i}" for w in range(4) for i in range(5)} | {"shared"}
+    assert sorted(df["factor"]) == sorted(expected)  # no lost updates, one row per factor
+    assert df.set_index("factor").loc["shared", "n_obs"] == 4
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from quantlab_factor_library.benchmarks.equivalence import run_equivalence
+from quantlab_factor_library.benchmarks.synthetic import SyntheticSpec
+
+
+def test_fast_engine_matches_reference_on_synthetic_data():
+    # One price-based and one fundamental factor keep this small; the CLI covers the full set
+    report = run_equivalence(
+        spec=SyntheticSpec(n_tickers=20, n_years=1, seed=3),
+        factor_names=["volatility_60d", "earnings_yield"],
+        save=False,
+    )
+    assert set(report["factor"]) == {"volatility_60d", "earnings_yield"}
+    assert report["error"].isna().all(), report.loc[report["error"].notna(), ["factor", "function", "error"]]
+    assert (report["n_cells"] > 0).all()
+    failed = report[~report["passed"].astype(bool)]
+    assert failed.empty, failed[["factor", "function", "max_abs_diff", "nan_mismatch"]].to_string()
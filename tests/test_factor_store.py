@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from quantlab_factor_library.factor_store import (
+    FactorHistory,
+    FactorStore,
+    LongFactorWriter,
+    diff_runs,
+    long_to_wide_arrow,
+    read_wide_arrow,
+    write_wide_arrow,
+)
+
+
+def _panel(seed=0, n_dates=60, tickers=("MSFT", "AAPL", "XOM", "JPM", "KO")):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-11-01", periods=n_dates).date
+    panel = pd.DataFrame(rng.standard_normal((n_dates, len(tickers))), index=dates, columns=list(tickers))
+    return panel.mask(rng.random(panel.shape) < 0.2)
+
+
+def test_wide_arrow_round_trip(tmp_path):
+    panel = _panel()
+    panel.iloc[3] = np.nan  # all-NaN date and ticker are dropped, like the long parquet layout
+    panel["XOM"] = np.nan
+    write_wide_arrow(panel, tmp_path / "factor_x.arrow")
+
+    expected = panel.dropna(how="all").dropna(axis=1, how="all").sort_index(axis=1)
+    got = read_wide_arrow(tmp_path / "factor_x.arrow")
+    pd.testing.assert_frame_equal(got, expected, check_index_type=False, check_column_type=False)
+    assert not got["AAPL"].to_numpy().flags.writeable  # zero-copy view of the mapping
+
+    start, end = date(2023, 11, 10), date(2023, 12, 15)
+    sliced = read_wide_arrow(tmp_path / "factor_x.arrow", start, end, tickers=["KO", "AAPL"])
+    want = expected.loc[start:end, ["AAPL", "KO"]].dropna(how="all")
+    pd.testing.assert_frame_equal(sliced, want, check_index_type=False, check_column_type=False)
+
+    # FactorStore reads the same panel from the Arrow file and from the long parquet
+    with LongFactorWriter(tmp_path / "factor_y.parquet") as writer:
+        writer.write(panel)
+    store = FactorStore(tmp_path, cache_size=0)
+    pd.testing.assert_frame_equal(store["x"], store["y"], check_index_type=False, check_column_type=False)
+
+    # ... and long_to_wide_arrow, converting row group by row group, writes the same file contents
+    with LongFactorWriter(tmp_path / "long.parquet") as writer:
+        for block in (panel.iloc[:20], panel.iloc[20:45], panel.iloc[45:]):
+            writer.write(block)
+    long_to_wide_arrow(tmp_path / "long.parquet", tmp_path / "converted.arrow")
+    pd.testing.assert_frame_equal(read_wide_arrow(tmp_path / "converted.arrow"), got)
+
+
+def test_history_append_compact_load_keeps_last_value_per_date(tmp_path):
+    panel = _panel(n_dates=70)
+    history = FactorHistory(tmp_path)
+    for start in range(0, 60, 5):  # nightly-style appends, several parts per month
+        history.append("f", panel.iloc[start : start + 5])
+    restated = panel.iloc[50:70] * 10  # restates dates 50-59 and adds 60-69
+    restated.iloc[0, 0] = np.nan  # a restated cell may become NaN: the whole date is replaced
+    history.append("f", restated)
+
+    expected = pd.concat([panel.iloc[:50], restated]).dropna(how="all").dropna(axis=1, how="all")
+    expected = expected.sort_index(axis=1)
+    pd.testing.assert_frame_equal(history.load("f"), expected, check_index_type=False, check_column_type=False)
+    assert history.last_date("f") == expected.index[-1]
+
+    months_before = history._months("f")
+    assert max(len(parts) for parts in months_before.values()) > 1
+    assert history.compact(["f"], min_parts=2) == sum(len(p) > 1 for p in months_before.values())
+    assert all(len(parts) == 1 for parts in history._months("f").values())
+    pd.testing.assert_frame_equal(history.load("f"), expected, check_index_type=False, check_column_type=False)
+
+    start, end = expected.index[12], expected.index[55]
+    sliced = history.load("f", start, end, tickers=["KO", "MSFT"])
+    want = expected.loc[start:end, ["KO", "MSFT"]].dropna(how="all")
+    pd.testing.assert_frame_equal(sliced, want, check_index_type=False, check_column_type=False)
+
+    # a month listed before compact() removed its parts is re-listed once
+    history.append("f", panel.iloc[65:70] * 3)
+    stale = history._months("f")
+    history.compact(["f"], min_parts=2)
+    key = max(stale)
+    assert len(stale[key]) > 1
+    got = history._load_month("f", key, stale[key]).sort_values(["Date", "Ticker"], ignore_index=True)
+    fresh = history._load_month("f", key, history._months("f")[key]).sort_values(["Date", "Ticker"], ignore_index=True)
+    pd.testing.assert_frame_equal(got, fresh)
+
+
+def _save_run(root, panels):
+    root.mkdir()
+    for name, panel in panels.items():
+        with LongFactorWriter(root / f"factor_{name}.parquet") as writer:
+            for year in sorted({d.year for d in panel.index}):
+                writer.write(panel[[d.year == year for d in panel.index]])
+
+
+def test_diff_runs_flags_only_changed_years(tmp_path):
+    a = _panel(n_dates=600).round(6)  # 2023-11 .. 2026-02: four year partitions
+    a.loc[date(2024, 6, 3), "AAPL"] = 1.0
+    b = a.copy()
+    b.loc[date(2024, 6, 3), "AAPL"] += 0.5
+    b.loc[date(2024, 9, 2), "KO"] = np.nan
+    b.loc[b.index > date(2025, 12, 31)] += 1e-13  # noise well inside the 1e-10 checksum rounding
+    other = _panel(seed=1)
+    _save_run(tmp_path / "a", {"x": a, "same": other, "gone": other})
+    _save_run(tmp_path / "b", {"x": b, "same": other, "new": other})
+
+    diff = diff_runs(tmp_path / "a", tmp_path / "b")
+    rows = {(r.factor, r.year): r for r in diff.itertuples()}
+    assert {(f, y) for f, y in rows if f == "x"} == {("x", 2024)}
+    changed = rows[("x", 2024)]
+    assert changed.status == "changed"
+    assert changed.n_changed_dates == 2
+    assert changed.first_changed_date == date(2024, 6, 3)
+    assert np.isclose(changed.max_abs_diff, 0.5)
+    assert {rows[k].status for k in rows if k[0] == "gone"} == {"removed"}
+    assert {rows[k].status for k in rows if k[0] == "new"} == {"added"}
+    assert not any(k[0] == "same" for k in rows)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from quantlab_factor_library.risk_model import RiskModel
+
+
+def _inputs(seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=60).date
+    tickers = [f"T{i}" for i in range(12)]
+    sector_map = pd.Series(["A", "B", "C"] * 4, index=tickers)
+    factor = pd.DataFrame(rng.standard_normal((60, 12)), index=dates, columns=tickers)
+    fwd = pd.DataFrame(rng.standard_normal((60, 12)) * 0.01, index=dates, columns=tickers)
+    return {"value": factor}, fwd, sector_map
+
+
+def _fitted():
+    factors, fwd, sector_map = _inputs()
+    return RiskModel().fit(factors, fwd, sector_map=sector_map), list(fwd.columns), sector_map
+
+
+def _ewma_cov(returns: pd.DataFrame, halflife: float) -> np.ndarray:
+    lam = 0.5 ** (1.0 / halflife)
+    num, weight = 0.0, 0.0
+    for f in returns.to_numpy():
+        num = lam * num + (1 - lam) * np.outer(f, f)
+        weight = lam * weight + (1 - lam)
+    return num / weight
+
+
+def test_update_with_absent_sector():
+    model, tickers, sector_map = _fitted()
+    assert model.factor_names == ["value", "sector_A", "sector_B", "sector_C"]
+    ab = [t for t in tickers if sector_map[t] != "C"]
+    rng = np.random.default_rng(1)
+    exposures = pd.DataFrame({"value": rng.standard_normal(len(ab))}, index=ab)
+    f = model.update(pd.Timestamp("2024-06-03").date(), exposures, pd.Series(rng.standard_normal(len(ab)) * 0.01, index=ab))
+    assert list(f.index) == model.factor_names
+    assert np.isfinite(f[["value", "sector_A", "sector_B"]]).all()
+    assert np.isnan(f["sector_C"])
+    assert model.factor_cov.shape == (4, 4)
+
+
+def test_empty_sector_days_leave_covariance_untouched():
+    factors, fwd, sector_map = _inputs()
+    empty_days = fwd.index[[10, 11, 30]]
+    fwd.loc[empty_days, sector_map.index[sector_map == "C"]] = np.nan
+    model = RiskModel().fit(factors, fwd, sector_map=sector_map)
+    returns = model.factor_returns()
+    assert returns.loc[empty_days, "sector_C"].isna().all()
+    assert returns.loc[empty_days, ["value", "sector_A", "sector_B"]].notna().all().all()
+    full = returns.dropna()
+    assert len(full) == len(fwd) - len(empty_days)
+    np.testing.assert_allclose(model.factor_cov.to_numpy(), _ewma_cov(full, model.cov_halflife))
+
+    before = model.factor_cov
+    ab = sector_map.index[sector_map != "C"]
+    exposures = factors["value"].iloc[-1][ab].to_frame("value")
+    model.update(pd.Timestamp("2024-06-03").date(), exposures, fwd.iloc[-1][ab])
+    pd.testing.assert_frame_equal(model.factor_cov, before)
+
+
+def test_refit_replaces_previous_state():
+    factors, fwd, sector_map = _inputs()
+    fresh = RiskModel().fit(factors, fwd, sector_map=sector_map)
+    model = RiskModel().fit(*_inputs(seed=1)[:2], sector_map=sector_map)
+    model.fit({"value": factors["value"], "other": factors["value"] ** 2}, fwd)  # different factor set
+    model.fit(factors, fwd, sector_map=sector_map)
+    assert model.n_updates == fresh.n_updates == len(fwd)
+    assert model.last_date == fresh.last_date
+    pd.testing.assert_frame_equal(model.factor_cov, fresh.factor_cov)
+    pd.testing.assert_series_equal(model.specific_var, fresh.specific_var)
+    pd.testing.assert_frame_equal(model.factor_returns(), fresh.factor_returns())
+
+
+def test_update_ignores_unseen_sector_and_survives_reload(tmp_path):
+    model, tickers, sector_map = _fitted()
+    model.sector_map = pd.concat([sector_map, pd.Series({"NEW": "Z"})])
+    model.save(tmp_path)
+    loaded = RiskModel.load(tmp_path)
+    assert loaded.sectors == ["A", "B", "C"]
+    names = tickers + ["NEW"]
+    rng = np.random.default_rng(2)
+    exposures = pd.DataFrame({"value": rng.standard_normal(len(names))}, index=names)
+    f = loaded.update(pd.Timestamp("2024-06-03").date(), exposures, pd.Series(rng.standard_normal(len(names)) * 0.01, index=names))
+    assert list(f.index) == ["value", "sector_A", "sector_B", "sector_C"]
+    assert np.isnan(loaded.specific_var["NEW"])
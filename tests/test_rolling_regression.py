@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from quantlab_factor_library.rolling_regression import rolling_multi_ols
+
+
+def test_rolling_multi_ols_matches_lstsq():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2023-01-02", periods=80)
+    X = pd.DataFrame(rng.standard_normal((80, 3)) * 0.01, index=dates, columns=["mktrf", "smb", "hml"])
+    X.iloc[5] = np.nan
+    beta = rng.standard_normal((3, 7))
+    y = pd.DataFrame(X.fillna(0).to_numpy() @ beta + rng.standard_normal((80, 7)) * 0.005, index=dates)
+    y = y.mask(rng.random(y.shape) < 0.1)
+    window, min_periods = 20, 12
+
+    res = rolling_multi_ols(y, X, window, min_periods=min_periods, return_residuals=True, block_size=3)
+
+    names = ["alpha", "mktrf", "smb", "hml"]
+    design = np.column_stack([np.ones(len(X)), X.to_numpy()])
+    for t in range(len(dates)):
+        rows = slice(max(0, t - window + 1), t + 1)
+        for j in range(y.shape[1]):
+            xs, ys = design[rows], y.iloc[rows, j].to_numpy()
+            ok = np.isfinite(ys) & np.isfinite(xs).all(axis=1)
+            assert res.nobs.iat[t, j] == ok.sum()
+            if ok.sum() < min_periods:
+                assert np.isnan(res.betas["alpha"].iat[t, j])
+                continue
+            coef, *_ = np.linalg.lstsq(xs[ok], ys[ok], rcond=None)
+            np.testing.assert_allclose([res.betas[n].iat[t, j] for n in names], coef, rtol=1e-6, atol=1e-9)
+            ssr = ((ys[ok] - xs[ok] @ coef) ** 2).sum()
+            np.testing.assert_allclose(res.resid_vol.iat[t, j], np.sqrt(ssr / (ok.sum() - 4)), rtol=1e-5, atol=1e-12)
+            if ok[-1]:
+                expected = ys[-1] - xs[-1, 1:] @ coef[1:]  # residual keeps alpha
+                np.testing.assert_allclose(res.residuals.iat[t, j], expected, rtol=1e-6, atol=1e-12)